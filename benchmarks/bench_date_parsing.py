@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for glancerf.date_parsing against the previous inline-regex parsing.
+Payloads are shaped like the NG3K ADXO plain page and WA7BNM RSS summaries.
+
+Usage: python benchmarks/bench_date_parsing.py [rounds]
+"""
+
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from glancerf.date_parsing import (  # noqa: E402
+    clear_date_parse_cache,
+    is_range_line_start,
+    parse_date_range,
+    parse_date_range_in_text,
+)
+
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _ng3k_lines(count: int = 400) -> list[str]:
+    """NG3K ADXO plain text after tag stripping: date line, DXCC, Callsign, QSL, Info."""
+    lines: list[str] = []
+    for i in range(count):
+        sm, em = _MONTHS[i % 12], _MONTHS[(i + 1) % 12]
+        lines.append(f"{sm} {1 + i % 27}-{em} {1 + (i * 7) % 27}, 2026")
+        lines.append(f"DXCC: Island {i}")
+        lines.append(f"Callsign: **[VP{i}X](adxo{i}.html)**")
+        lines.append("QSL: via LoTW")
+        lines.append(f"Info: By OP{i} fm grid {i}; 160-6m; CW SSB FT8; Source: DX-World ({sm} {1 + i % 27}, 2026)")
+    return lines
+
+
+def _wa7bnm_summaries(count: int = 300) -> list[str]:
+    """WA7BNM RSS item descriptions: '1500Z, Dec 27 to 1500Z, Dec 28' style ranges."""
+    out: list[str] = []
+    for i in range(count):
+        sm = _MONTHS[i % 12]
+        out.append(f"{(i % 24):02d}00Z, {sm} {1 + i % 27} to {((i + 6) % 24):02d}00Z, {sm} {2 + i % 27}")
+    return out
+
+
+_LEGACY_TEXT_RANGE = (
+    r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:,\s*(\d{4}))?\s*(?:to|-)\s*"
+    r"(?:(\d{4})Z?,?\s*)?(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:,\s*(\d{4}))?"
+)
+_LEGACY_DASH_RANGE = (
+    r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:,\s*(\d{4}))?\s*-\s*"
+    r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),\s*(\d{4})"
+)
+_LEGACY_LINE_START = r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}(?:,\s*\d{4})?\s*-\s*"
+
+
+def _legacy_dash_range(s: str) -> tuple[str | None, str | None]:
+    m = re.search(_LEGACY_DASH_RANGE, s.strip(), re.I)
+    if not m:
+        return None, None
+    smon, sday, syear, emon, eday, eyear = m.groups()
+    syear = syear or eyear
+    try:
+        sm = _MONTHS.index(smon[:3].capitalize()) + 1
+        em = _MONTHS.index(emon[:3].capitalize()) + 1
+        start_d = datetime(int(syear), sm, int(sday), 0, 0, 0, tzinfo=timezone.utc)
+        end_d = datetime(int(eyear), em, int(eday), 23, 59, 59, tzinfo=timezone.utc)
+        return start_d.isoformat().replace("+00:00", "Z"), end_d.isoformat().replace("+00:00", "Z")
+    except (ValueError, TypeError):
+        return None, None
+
+
+def _legacy_text_range(text: str) -> tuple[str | None, str | None]:
+    m = re.search(_LEGACY_TEXT_RANGE, text.replace("\n", " "), re.I)
+    if not m:
+        return None, None
+    smon, sday, syear, _, emon, eday, eyear = m.groups()
+    syear = syear or eyear or str(datetime.now(timezone.utc).year)
+    eyear = eyear or syear
+    sm = _MONTHS.index(smon[:3].capitalize()) + 1
+    em = _MONTHS.index(emon[:3].capitalize()) + 1
+    return f"{syear}-{sm:02d}-{int(sday):02d}T00:00:00Z", f"{eyear}-{em:02d}-{int(eday):02d}T23:59:59Z"
+
+
+def _legacy(lines: list[str], summaries: list[str]) -> None:
+    for line in lines:
+        _legacy_dash_range(line)
+        re.match(_LEGACY_LINE_START, line, re.I)
+    for s in summaries:
+        _legacy_text_range(s)
+
+
+def _current(lines: list[str], summaries: list[str]) -> None:
+    for line in lines:
+        parse_date_range(line)
+        is_range_line_start(line)
+    for s in summaries:
+        parse_date_range_in_text(s)
+
+
+def _time(fn, rounds: int, before=None) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        if before is not None:
+            before()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    lines = _ng3k_lines()
+    summaries = _wa7bnm_summaries()
+    legacy_ms = _time(lambda: _legacy(lines, summaries), rounds)
+    cold_ms = _time(lambda: _current(lines, summaries), rounds, before=clear_date_parse_cache)
+    _current(lines, summaries)
+    warm_ms = _time(lambda: _current(lines, summaries), rounds)
+    print(f"payload: {len(lines)} NG3K lines, {len(summaries)} WA7BNM summaries, best of {rounds}")
+    print(f"legacy inline regex : {legacy_ms:8.3f} ms")
+    print(f"precompiled (cold)  : {cold_ms:8.3f} ms")
+    print(f"precompiled (memo)  : {warm_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
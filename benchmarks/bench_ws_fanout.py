@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Fan-out benchmark for glancerf.websocket_manager: cost of one desktop state broadcast
+against browser count, encoding per recipient versus once. The per-recipient loop is timed
+twice: with stdlib json (the previous send_json loop) and with the encoder the manager uses
+(orjson when installed), so the encoder change and encoding once are reported separately.
+Sockets are in-memory stubs, so the numbers are encoding + queueing cost only.
+
+Usage: python benchmarks/bench_ws_fanout.py [rounds]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from glancerf.websocket_manager import ConnectionManager, encode_message, orjson  # noqa: E402
+
+_CLIENT_COUNTS = (1, 5, 20, 50, 200)
+
+
+class _StubSocket:
+    """Accepts frames without I/O; send_json encodes like Starlette does."""
+
+    def __init__(self):
+        self.frames = 0
+        self.query_params = {}
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.frames += 1
+
+    async def send_json(self, data):
+        await self.send_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+
+def _state_message(cells: int = 300) -> dict:
+    """Desktop state shaped like main.js sendDesktopState: per-cell form values and scroll."""
+    return {
+        "type": "state",
+        "data": {
+            "url": "http://localhost:8080/",
+            "scroll": {"x": 0, "y": 120},
+            "inputs": [{"id": f"cell_{i}_input", "value": f"value {i} " * 4, "checked": i % 2 == 0} for i in range(cells)],
+            "cells": {f"{i // 10}_{i % 10}": {"scrollTop": i * 3, "text": "x" * 80} for i in range(cells)},
+        },
+    }
+
+
+async def _legacy(clients: list, message: dict) -> None:
+    for conn in clients:
+        await conn.send_json(message)
+
+
+async def _per_client(clients: list, message: dict) -> None:
+    # Same loop with the manager's encoder: isolates encoding once from the encoder change
+    for conn in clients:
+        await conn.send_text(encode_message(message))
+
+
+async def _drain(manager: ConnectionManager) -> None:
+    while any(q._pending for q in manager._queues.values()):
+        await asyncio.sleep(0)
+
+
+async def _current(manager: ConnectionManager, message: dict) -> None:
+    # Full-message fan-out (what a snapshot or update notification costs); identical state is not re-relayed
+    manager._fan_out(list(manager.browser_connections), message)
+    await _drain(manager)
+
+
+async def _time(fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+async def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    message = _state_message()
+    size = len(json.dumps(message, separators=(",", ":")))
+    print(f"state payload {size} bytes, best of {rounds}")
+    encoder = "orjson" if orjson is not None else "json"
+    print(f"{'clients':>8} {'per-client json':>16} {'per-client ' + encoder:>18} {'encode once':>12}")
+    for count in _CLIENT_COUNTS:
+        manager = ConnectionManager()
+        clients = [_StubSocket() for _ in range(count)]
+        for conn in clients:
+            await manager.connect_browser(conn)
+        legacy_ms = await _time(lambda: _legacy(clients, message), rounds)
+        per_client_ms = await _time(lambda: _per_client(clients, message), rounds)
+        current_ms = await _time(lambda: _current(manager, message), rounds)
+        print(f"{count:>8} {legacy_ms:>13.3f} ms {per_client_ms:>15.3f} ms {current_ms:>9.3f} ms")
+        for conn in clients:
+            await manager.disconnect(conn)
+        manager.stop_heartbeat()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
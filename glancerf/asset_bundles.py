@@ -0,0 +1,70 @@
+"""
+Fingerprinted module CSS/JS bundles.
+The CSS and JS of the modules used by a layout are joined into one file each and served from memory
+at /static/bundles/modules.<content hash>.css|js with immutable caching, so pages reference them
+instead of inlining them and browsers download each bundle once.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+from glancerf.compression import CompressedAsset
+from glancerf.logging_config import get_logger
+from glancerf.modules import get_module_assets
+
+_log = get_logger("asset_bundles")
+
+BUNDLE_URL_PREFIX = "/static/bundles/"
+_MEDIA_TYPES = {"css": "text/css", "js": "text/javascript"}
+# Bundles kept in memory (one pair per distinct layout seen); oldest are dropped first
+_MAX_BUNDLES = 32
+_IMMUTABLE = "public, max-age=31536000, immutable"
+
+_bundles: "OrderedDict[str, CompressedAsset]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _store(text: str, ext: str) -> Optional[str]:
+    """Keep text as a bundle file named by its hash; returns its URL (None if text is empty)."""
+    if not text:
+        return None
+    data = text.encode("utf-8")
+    name = "modules.%s.%s" % (hashlib.sha256(data).hexdigest()[:16], ext)
+    with _lock:
+        if name in _bundles:
+            _bundles.move_to_end(name)
+        else:
+            _bundles[name] = CompressedAsset(data)
+            while len(_bundles) > _MAX_BUNDLES:
+                _bundles.popitem(last=False)
+            _log.debug("bundle built: %s (%s bytes)", name, len(data))
+    return BUNDLE_URL_PREFIX + name
+
+
+def get_bundle_urls(layout: List[List[str]]) -> Tuple[Optional[str], Optional[str]]:
+    """Build (or reuse) the CSS and JS bundles for the modules in layout. Returns (css_url, js_url)."""
+    module_css, module_js = get_module_assets(layout)
+    return _store(module_css, "css"), _store(module_js, "js")
+
+
+def get_bundle(name: str) -> Optional[CompressedAsset]:
+    with _lock:
+        return _bundles.get(name)
+
+
+def register_bundle_routes(app: FastAPI) -> None:
+    """Serve bundles. Register before mounting /static, which would otherwise take the path."""
+
+    @app.get(BUNDLE_URL_PREFIX + "{name}", include_in_schema=False)
+    async def module_bundle(name: str, request: Request):
+        asset = get_bundle(name)
+        ext = name.rsplit(".", 1)[-1]
+        if asset is None or ext not in _MEDIA_TYPES:
+            # Unknown or evicted bundle: the page that referenced it is stale and will be reloaded
+            return Response(status_code=404, headers={"Cache-Control": "no-store"})
+        return asset.response(request.headers, _MEDIA_TYPES[ext], {"Cache-Control": _IMMUTABLE})
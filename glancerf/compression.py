@@ -0,0 +1,259 @@
+"""
+Response compression for GlanceRF.
+CompressedAsset holds a body with its gzip and Brotli copies (gzip only if neither Brotli nor brotlicffi is installed)
+and a strong ETag, and picks the encoding per request. PrecompressedStaticFiles serves /static
+through it; JSONGZipMiddleware gzips large dynamic JSON responses.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from glancerf.logging_config import get_logger
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli  # same compress() API, for interpreters without Brotli wheels
+    except ImportError:
+        brotli = None
+
+_log = get_logger("compression")
+
+# Bodies smaller than this are sent as is (compression gains nothing under one packet)
+COMPRESS_MIN_SIZE = 1024
+_GZIP_LEVEL = 6
+_BROTLI_QUALITY = 11
+# /static files are revalidated on every use (cheap with their ETags); fingerprinted bundles are immutable
+_STATIC_CACHE_CONTROL = "no-cache"
+# Media types worth compressing (prefix match)
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def is_compressible(media_type: Optional[str]) -> bool:
+    return bool(media_type) and media_type.lower().startswith(_COMPRESSIBLE_TYPES)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+    """Content codings the client accepts (q > 0) from an Accept-Encoding header."""
+    result: Set[str] = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            result.add(name)
+    return result
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches etag (weak comparison, as RFC 9110 requires for GET)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class CompressedAsset:
+    """A response body with precompressed copies and a strong ETag derived from its content."""
+
+    __slots__ = ("body", "gzip_body", "br_body", "etag")
+
+    def __init__(self, body: bytes, compress: bool = True):
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.gzip_body: Optional[bytes] = None
+        self.br_body: Optional[bytes] = None
+        if compress and len(body) >= COMPRESS_MIN_SIZE:
+            self.gzip_body = gzip.compress(body, compresslevel=_GZIP_LEVEL)
+            if brotli is not None:
+                self.br_body = brotli.compress(body, quality=_BROTLI_QUALITY)
+
+    def encoded(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Best (body, content coding) for the client; coding is None for identity."""
+        if self.gzip_body is None:
+            return self.body, None
+        accepted = accepted_encodings(accept_encoding)
+        if self.br_body is not None and "br" in accepted:
+            return self.br_body, "br"
+        if "gzip" in accepted or "*" in accepted:
+            return self.gzip_body, "gzip"
+        return self.body, None
+
+    def response(
+        self,
+        request_headers: Mapping[str, str],
+        media_type: str,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        """200 with the best encoding, or 304 if the client already has this ETag."""
+        out = dict(headers or {})
+        out["ETag"] = self.etag
+        if self.gzip_body is not None:
+            out["Vary"] = "Accept-Encoding"
+        if etag_matches(request_headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=out)
+        body, coding = self.encoded(request_headers.get("accept-encoding"))
+        if coding is not None:
+            out["Content-Encoding"] = coding
+        return Response(content=body, media_type=media_type, headers=out)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves compressible files from memory, precompressed (Brotli/gzip by
+    Accept-Encoding) with strong content ETags. Entries are rebuilt when a file's mtime or size
+    changes. Other files (images, fonts) are served by StaticFiles as before. Every file is sent
+    with Cache-Control: no-cache, so browsers revalidate with the ETag.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._assets: Dict[str, Tuple[Tuple[int, int], CompressedAsset]] = {}
+        self._assets_lock = threading.Lock()
+
+    def _asset(self, full_path: str, stat_result: os.stat_result) -> CompressedAsset:
+        signature = (stat_result.st_mtime_ns, stat_result.st_size)
+        cached = self._assets.get(full_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with open(full_path, "rb") as f:
+            asset = CompressedAsset(f.read())
+        with self._assets_lock:
+            self._assets[full_path] = (signature, asset)
+        return asset
+
+    def precompress(self) -> int:
+        """Build the compressed copies of every compressible file up front. Returns the file count."""
+        count = 0
+        if self.directory is None:
+            return count
+        for path in Path(self.directory).rglob("*"):
+            if not path.is_file() or not is_compressible(mimetypes.guess_type(path.name)[0]):
+                continue
+            try:
+                self._asset(str(path), path.stat())
+                count += 1
+            except OSError as e:
+                _log.debug("precompress skipped %s: %s", path, e)
+        _log.debug("precompressed %s static files (brotli: %s)", count, brotli is not None)
+        if brotli is None:
+            _log.info("Brotli is not installed; static files are served with gzip only (pip install Brotli)")
+        return count
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304) and "cache-control" not in response.headers:
+            response.headers["Cache-Control"] = _STATIC_CACHE_CONTROL
+        if (
+            not isinstance(response, FileResponse)
+            or response.status_code != 200
+            or response.stat_result is None
+            or not is_compressible(response.media_type)
+        ):
+            return response
+        asset = await run_in_threadpool(self._asset, str(response.path), response.stat_result)
+        headers = {"Cache-Control": _STATIC_CACHE_CONTROL}
+        if "last-modified" in response.headers:
+            headers["Last-Modified"] = response.headers["last-modified"]
+        return asset.response(Headers(scope=scope), response.media_type, headers)
+
+
+class _JSONGZipResponder:
+    """
+    Gzips one JSON response. Other responses (HTML pages, files, images) and already-encoded
+    bodies pass through untouched. The JSON body is collected whole (it is built in memory
+    anyway) so the size check covers the full body however it is chunked.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, compresslevel: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.send: Optional[Send] = None
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.chunks: List[bytes] = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_maybe_gzipped)
+
+    async def send_maybe_gzipped(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            is_json = headers.get("content-type", "").lower().startswith("application/json")
+            if not is_json or "content-encoding" in headers:
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        self.chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+        body = b"".join(self.chunks)
+        self.chunks = []
+        if len(body) >= self.minimum_size:
+            body = gzip.compress(body, compresslevel=self.compresslevel)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = "gzip"
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": body})
+
+
+class JSONGZipMiddleware:
+    """Gzip dynamic JSON responses of at least minimum_size bytes when the client accepts gzip."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESS_MIN_SIZE, compresslevel: int = _GZIP_LEVEL) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] != "HEAD"
+            and "gzip" in accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        ):
+            responder = _JSONGZipResponder(self.app, self.minimum_size, self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -3,16 +3,46 @@ Configuration management for GlanceRF
 Handles loading and saving settings to JSON file
 """
 
+import atexit
+import ipaddress
 import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from copy import deepcopy
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Mapping, Optional, Set
 
 from glancerf.logging_config import get_logger
 
+try:
+    from watchfiles import watch as _watch_files
+except ImportError:
+    _watch_files = None
+
 _log = get_logger("config")
 
 
+_MISSING = object()
+
+# Default write-behind delay used by the server (config_write_delay_sec overrides it)
+DEFAULT_CONFIG_WRITE_DELAY_SEC = 1.0
+
+
+# Poll interval for the config file watcher when watchfiles (inotify etc.) is unavailable
+_WATCH_POLL_INTERVAL_SEC = 2.0
+
+# Change listener: called with (new version, names of the keys that changed)
+ConfigListener = Callable[[int, FrozenSet[str]], None]
+
+# Local UI state (desktop window geometry, written on every move/resize): saved to the file like any
+# other key, but changes to these alone do not bump the version or notify listeners
+_UNVERSIONED_KEYS = frozenset({
+    "desktop_window_width", "desktop_window_height", "desktop_window_x", "desktop_window_y",
+})
+
+
 class ConfigValidationError(ValueError):
     """Raised when config structure or value types are invalid."""
 
@@ -165,10 +195,71 @@ def _validate_config(config: Dict[str, Any]) -> None:
                 f"Config key 'log_level' must be 'default', 'detailed', or 'verbose', got {config['log_level']!r}"
             )
 
+    if "ws_state_max_hz" in config and config["ws_state_max_hz"] is not None:
+        _check_type("ws_state_max_hz", config["ws_state_max_hz"], (int, float))
+        if config["ws_state_max_hz"] < 0:
+            raise ConfigValidationError("Config key 'ws_state_max_hz' must be 0 (no coalescing) or positive")
+
+    if "ws_compression" in config and config["ws_compression"] is not None:
+        _check_type("ws_compression", config["ws_compression"], bool)
+
+    if "config_write_delay_sec" in config and config["config_write_delay_sec"] is not None:
+        _check_type("config_write_delay_sec", config["config_write_delay_sec"], (int, float))
+        if config["config_write_delay_sec"] < 0:
+            raise ConfigValidationError("Config key 'config_write_delay_sec' must be 0 (write immediately) or positive")
+
+    if "config_watch" in config and config["config_watch"] is not None:
+        _check_type("config_watch", config["config_watch"], bool)
+
+    if "rate_limits" in config and config["rate_limits"] is not None:
+        _check_type("rate_limits", config["rate_limits"], dict)
+        for group, spec in config["rate_limits"].items():
+            if not isinstance(spec, dict):
+                raise ConfigValidationError(f"Config key 'rate_limits': value for {group!r} must be object")
+            if "requests" in spec and (not isinstance(spec["requests"], int) or spec["requests"] < 1):
+                raise ConfigValidationError(f"Config key 'rate_limits': {group!r}.requests must be positive integer")
+            if "window_sec" in spec and (not isinstance(spec["window_sec"], (int, float)) or spec["window_sec"] <= 0):
+                raise ConfigValidationError(f"Config key 'rate_limits': {group!r}.window_sec must be positive")
+
+    if "trusted_proxies" in config and config["trusted_proxies"] is not None:
+        _check_type("trusted_proxies", config["trusted_proxies"], list)
+        for entry in config["trusted_proxies"]:
+            try:
+                if not isinstance(entry, str):
+                    raise ValueError(entry)
+                ipaddress.ip_network(entry.strip(), strict=False)
+            except ValueError:
+                raise ConfigValidationError(f"Config key 'trusted_proxies': {entry!r} is not an IP address or CIDR range")
+
     if "log_path" in config and config["log_path"] is not None:
         _check_type("log_path", config["log_path"], str)
 
 
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory entry after a rename (best effort; not supported on Windows)."""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    """(mtime_ns, size) of path, or None if it cannot be read."""
+    try:
+        st = os.stat(str(path))
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 class Config:
     """Manages GlanceRF configuration"""
     
@@ -187,6 +278,20 @@ class Config:
         self.config_dir = Path(config_dir)
         self.config_file = self.config_dir / "glancerf_config.json"
         self._config: Dict[str, Any] = {}
+        # Signature of the file as last read or written; reload() skips the file while it matches
+        self._file_sig: Optional[tuple] = None
+        # Guards _config and the file; re-entrant so nested transactions and set() inside one work
+        self._lock = threading.RLock()
+        self._txn_depth = 0
+        self._txn_changed: Set[str] = set()
+        # Bumped once per committed change; listeners get the version and the changed keys
+        self.version = 0
+        self._listeners: List[ConfigListener] = []
+        # Write-behind: when _write_delay > 0, saves only mark the file dirty and a timer writes it later
+        self._write_delay = 0.0
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_at_exit = False
         self.load()
 
     def load(self) -> None:
@@ -197,6 +302,7 @@ class Config:
             self.save()
             return
         try:
+            self._file_sig = _file_signature(self.config_file)
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 self._config = json.load(f)
             _log.debug("Config loaded from %s", self.config_file)
@@ -204,26 +310,270 @@ class Config:
             raise IOError(f"Error loading config file {self.config_file}: {e}")
         _validate_config(self._config)
 
+    def enable_write_behind(self, delay_sec: float) -> None:
+        """
+        Apply changes in memory immediately and write the file at most once per delay_sec from a
+        background timer (bursts of set() calls become one write). 0 writes on every save again.
+        Pending changes are flushed at interpreter exit; call flush() to force a write.
+        """
+        with self._lock:
+            self._write_delay = max(0.0, float(delay_sec))
+        if self._write_delay > 0:
+            if not self._flush_at_exit:
+                atexit.register(self.flush)
+                self._flush_at_exit = True
+            _log.debug("Config write-behind enabled (%.2fs)", self._write_delay)
+        else:
+            self.flush()
+
     def save(self) -> None:
-        """Save configuration to file"""
-        _validate_config(self._config)
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=2)
-            _log.debug("Config saved to %s", self.config_file)
-        except IOError as e:
-            raise IOError(f"Error saving config file {self.config_file}: {e}")
-    
+        """Validate the config and write it now, or schedule the write in write-behind mode."""
+        with self._lock:
+            _validate_config(self._config)
+            if self._write_delay <= 0:
+                self._write()
+                return
+            self._dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._write_delay, self._flush_from_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Write pending write-behind changes to disk now (no-op if nothing is pending)."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self._write()
+
+    def _flush_from_timer(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+            if not self._dirty:
+                return
+            try:
+                self._write()
+            except IOError as e:
+                _log.warning("Config write-behind flush failed (will retry on next change): %s", e)
+
+    def _write(self) -> None:
+        """
+        Save configuration to file atomically: write a temp file in the same directory, fsync it
+        and rename it over the config file, so readers never see a torn file.
+        """
+        with self._lock:
+            self._dirty = False
+            text = json.dumps(self._config, indent=2)
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=str(self.config_dir), prefix=".glancerf_config.", suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.config_file)
+                tmp_path = None
+                _fsync_dir(self.config_dir)
+                self._file_sig = _file_signature(self.config_file)
+                _log.debug("Config saved to %s", self.config_file)
+            except OSError as e:
+                self._dirty = self._write_delay > 0
+                raise IOError(f"Error saving config file {self.config_file}: {e}")
+            finally:
+                if tmp_path is not None:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+
+    def reload(self) -> FrozenSet[str]:
+        """
+        Re-read the file if it changed on disk since it was last read or written. An invalid file is
+        logged and ignored. Returns the keys whose values changed (empty if the content is the same,
+        or only window geometry changed); listeners are notified as for any other change.
+        """
+        sig = _file_signature(self.config_file)
+        with self._lock:
+            if sig is None or sig == self._file_sig:
+                return frozenset()
+            self._file_sig = sig
+            try:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    new_config = json.load(f)
+                if not isinstance(new_config, dict):
+                    raise ConfigValidationError("Config file must contain a JSON object")
+                _validate_config(new_config)
+            except (OSError, ValueError) as e:
+                _log.warning("Config file changed but was not reloaded: %s", e)
+                return frozenset()
+            changed = frozenset(
+                key for key in set(new_config) | set(self._config)
+                if new_config.get(key, _MISSING) != self._config.get(key, _MISSING)
+            )
+            if not changed:
+                return changed
+            versioned = changed - _UNVERSIONED_KEYS
+            if self._dirty:
+                _log.warning("Config file edited externally; discarding unsaved in-memory changes")
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._dirty = False
+            self._config = new_config
+            if versioned:
+                self.version += 1
+            version = self.version
+        _log.info("Config reloaded from %s (%s)", self.config_file, ", ".join(sorted(changed)))
+        if versioned:
+            self._notify(version, versioned)
+        return versioned
+
     def get(self, key: str) -> Any:
         """Get a configuration value (returns None if key doesn't exist)"""
         return self._config.get(key)
-    
+
     def set(self, key: str, value: Any) -> None:
-        """Set a configuration value"""
-        self._config[key] = value
-        self.save()
-    
+        """Set a configuration value (saved now, or when the enclosing transaction ends)"""
+        with self.transaction():
+            self._assign(key, value)
+
+    def update(self, values: Mapping[str, Any]) -> None:
+        """Set several values, validating and writing the file once."""
+        if not values:
+            return
+        with self.transaction():
+            for key, value in values.items():
+                self._assign(key, value)
+
+    def _assign(self, key: str, value: Any) -> None:
+        """Store value inside a transaction, recording key if it changed."""
+        old = self._config.get(key, _MISSING)
+        # The same object passed back may have been mutated in place, so it counts as a change
+        if old != value or (old is value and isinstance(value, (dict, list))):
+            self._config[key] = value
+            self._txn_changed.add(key)
+
+    @contextmanager
+    def transaction(self) -> Iterator["Config"]:
+        """
+        Batch set()/update() calls: the config is validated and written once when the outermost
+        transaction exits, if anything changed. If the block raises or validation fails, in-memory
+        values are rolled back. Listeners are notified after a successful commit (not for changes
+        to window geometry alone).
+        """
+        changed: FrozenSet[str] = frozenset()
+        with self._lock:
+            outermost = self._txn_depth == 0
+            snapshot = deepcopy(self._config) if outermost else None
+            self._txn_depth += 1
+            try:
+                yield self
+                if outermost and self._txn_changed:
+                    self.save()
+                    changed = frozenset(self._txn_changed - _UNVERSIONED_KEYS)
+                    if changed:
+                        self.version += 1
+            except BaseException:
+                if outermost:
+                    self._config = snapshot
+                raise
+            finally:
+                self._txn_depth -= 1
+                if outermost:
+                    self._txn_changed = set()
+            version = self.version
+        if changed:
+            self._notify(version, changed)
+
+    def add_change_listener(self, listener: ConfigListener) -> None:
+        """Call listener(version, changed_keys) after each committed change (from the changing thread)."""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_change_listener(self, listener: ConfigListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, version: int, changed: FrozenSet[str]) -> None:
+        _log.debug("Config version %s, changed: %s", version, ", ".join(sorted(changed)))
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(version, changed)
+            except Exception as e:
+                _log.warning("Config change listener failed: %s", e)
+
+
+class ConfigWatcher:
+    """
+    Background thread that reloads the config when its file changes on disk. Uses watchfiles
+    (inotify/FSEvents/ReadDirectoryChangesW) when installed, else polls the file's mtime and size.
+    on_reload(changed_keys) is called from the watcher thread after a reload that changed content.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        on_reload: Optional[Callable[[FrozenSet[str]], None]] = None,
+        poll_interval: float = _WATCH_POLL_INTERVAL_SEC,
+    ):
+        self._config = config
+        self._on_reload = on_reload
+        self._poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="glancerf-config-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _check(self) -> None:
+        try:
+            changed = self._config.reload()
+        except Exception as e:
+            _log.warning("Config reload failed: %s", e)
+            return
+        if changed and self._on_reload is not None:
+            try:
+                self._on_reload(changed)
+            except Exception as e:
+                _log.warning("Config reload callback failed: %s", e)
+
+    def _run(self) -> None:
+        config_file = self._config.config_file
+        if _watch_files is not None:
+            name = config_file.name
+            try:
+                _log.debug("Watching %s for changes", config_file)
+                for _ in _watch_files(
+                    str(config_file.parent),
+                    watch_filter=lambda change, path: Path(path).name == name,
+                    stop_event=self._stop,
+                    debounce=300,
+                    recursive=False,
+                    raise_interrupt=False,
+                ):
+                    self._check()
+                return
+            except Exception as e:
+                _log.debug("File watch unavailable (%s), polling %s instead", e, config_file)
+        while not self._stop.wait(self._poll_interval):
+            self._check()
 
 
 # Global config instance
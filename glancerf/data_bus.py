@@ -0,0 +1,226 @@
+"""
+Server-side data bus for module data.
+
+Modules register the GET endpoints whose results may be pushed (register_data_source). Clients
+subscribe over their WebSocket to a URL on one of those endpoints; the bus requests each distinct
+URL in-process once per interval, whatever the number of displays, and publishes the result on the
+module_data topic to that URL's subscribers only when it changed. The URL string is the key, so
+every display running the same module settings shares one feed. A source may restrict the query
+strings it accepts (e.g. to URLs in the configured module settings), and the number of open feeds
+is capped, so the bus cannot be used to make the server fetch arbitrary URLs.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+from fastapi import FastAPI, WebSocket
+
+from glancerf.logging_config import get_logger
+from glancerf.rate_limit import INTERNAL_CLIENT_HOST
+from glancerf.websocket_manager import TOPIC_MODULE_DATA, ConnectionManager
+
+_log = get_logger("data_bus")
+
+# Query check: receives the parsed query string (parse_qs form), returns True if it may be subscribed
+QueryCheck = Callable[[Dict[str, List[str]]], bool]
+
+# Path -> (minimum refresh interval in seconds, query check) (registered by module api_routes)
+_sources: Dict[str, Tuple[float, Optional[QueryCheck]]] = {}
+
+_DEFAULT_MIN_INTERVAL_SEC = 30.0
+_MAX_INTERVAL_SEC = 24 * 3600.0
+_MAX_KEYS_PER_CLIENT = 64
+# Open feeds across all clients; beyond this subscriptions are rejected and clients poll instead
+_MAX_FEEDS = 256
+_MAX_URL_LENGTH = 4096
+_FETCH_TIMEOUT_SEC = 60.0
+
+
+def register_data_source(
+    path: str,
+    min_interval_sec: float = _DEFAULT_MIN_INTERVAL_SEC,
+    allow_query: Optional[QueryCheck] = None,
+) -> None:
+    """
+    Allow clients to subscribe to GET path; refreshes never run more often than min_interval_sec.
+    If allow_query is given, only query strings it accepts may be subscribed.
+    """
+    _sources[path] = (float(min_interval_sec), allow_query)
+    _log.debug("data source registered: %s (min %ss)", path, min_interval_sec)
+
+
+def data_source_paths() -> Dict[str, float]:
+    return {path: interval for path, (interval, _) in _sources.items()}
+
+
+def layout_cell_settings(module_id: str) -> List[Dict[str, Any]]:
+    """Module settings of every layout cell showing module_id (for allow_query checks)."""
+    from glancerf.config import get_config
+
+    config = get_config()
+    layout = config.get("layout") or []
+    module_settings = config.get("module_settings") or {}
+    result = []
+    for r, row in enumerate(layout):
+        for c, cell in enumerate(row or []):
+            if cell == module_id:
+                settings = module_settings.get("%s_%s" % (r, c))
+                result.append(settings if isinstance(settings, dict) else {})
+    return result
+
+
+class _Feed:
+    """One subscribed URL: its subscribers (WebSocket -> requested interval), refresh task and last result."""
+
+    __slots__ = ("url", "min_interval", "subscribers", "task", "last_body", "last_message", "fetched_at")
+
+    def __init__(self, url: str, min_interval: float):
+        self.url = url
+        self.min_interval = min_interval
+        self.subscribers: Dict[WebSocket, float] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.last_body: Optional[bytes] = None
+        self.last_message: Optional[dict] = None
+        self.fetched_at = 0.0
+
+    def interval(self) -> float:
+        requested = min(self.subscribers.values()) if self.subscribers else _MAX_INTERVAL_SEC
+        return min(_MAX_INTERVAL_SEC, max(self.min_interval, requested))
+
+
+class DataBus:
+    """Fetches subscribed module URLs once per interval and pushes changed results to their subscribers."""
+
+    def __init__(self, app: FastAPI, connection_manager: ConnectionManager):
+        self._app = app
+        self._manager = connection_manager
+        self._feeds: Dict[str, _Feed] = {}
+        self._client_keys: Dict[WebSocket, set] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self.fetch_count = 0
+        self.push_count = 0
+        connection_manager.add_disconnect_listener(self.drop_client)
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                # Internal client host: fetches are not limited here, subscriptions are charged to each client
+                transport=httpx.ASGITransport(app=self._app, client=(INTERNAL_CLIENT_HOST, 0)),
+                base_url="http://glancerf.internal",
+                # In-process: compressing the response only to decompress it here would waste CPU
+                headers={"Accept-Encoding": "identity"},
+                timeout=_FETCH_TIMEOUT_SEC,
+            )
+        return self._client
+
+    def subscribe(self, websocket: WebSocket, url: str, interval_sec: Optional[float] = None) -> bool:
+        """Subscribe websocket to url (path + query on a registered source). Returns False if url is not allowed."""
+        url = (url or "").strip()
+        if not url.startswith("/") or len(url) > _MAX_URL_LENGTH:
+            return False
+        parts = urlsplit(url)
+        source = _sources.get(parts.path)
+        if source is None:
+            _log.debug("data subscribe rejected, not a data source: %s", url[:80])
+            return False
+        min_interval, allow_query = source
+        if allow_query is not None:
+            try:
+                allowed = allow_query(parse_qs(parts.query))
+            except Exception as e:
+                _log.debug("data subscribe query check failed for %s: %s", url[:80], e)
+                allowed = False
+            if not allowed:
+                _log.debug("data subscribe rejected, query not allowed: %s", url[:80])
+                return False
+        keys = self._client_keys.get(websocket) or set()
+        if url not in keys and len(keys) >= _MAX_KEYS_PER_CLIENT:
+            return False
+        feed = self._feeds.get(url)
+        if feed is None:
+            if len(self._feeds) >= _MAX_FEEDS:
+                _log.debug("data subscribe rejected, %s feeds open: %s", len(self._feeds), url[:80])
+                return False
+            feed = self._feeds[url] = _Feed(url, min_interval)
+        self._client_keys[websocket] = keys
+        feed.subscribers[websocket] = float(interval_sec) if interval_sec else min_interval
+        keys.add(url)
+        self._manager.subscribe_topic(websocket, TOPIC_MODULE_DATA)
+        if feed.task is None or feed.task.done():
+            feed.task = asyncio.create_task(self._run(feed))
+        elif feed.last_message is not None:
+            self._manager.publish(TOPIC_MODULE_DATA, feed.last_message, recipients=(websocket,))
+        return True
+
+    def is_subscribed(self, websocket: WebSocket, url: str) -> bool:
+        return url in (self._client_keys.get(websocket) or ())
+
+    def unsubscribe(self, websocket: WebSocket, url: str) -> None:
+        keys = self._client_keys.get(websocket)
+        if keys is not None:
+            keys.discard(url)
+            if not keys:
+                self._client_keys.pop(websocket, None)
+                self._manager.unsubscribe_topic(websocket, TOPIC_MODULE_DATA)
+        feed = self._feeds.get(url)
+        if feed is None:
+            return
+        feed.subscribers.pop(websocket, None)
+        if not feed.subscribers:
+            self._close_feed(feed)
+
+    def drop_client(self, websocket: WebSocket) -> None:
+        """Remove every subscription of a disconnected client."""
+        for url in list(self._client_keys.get(websocket) or ()):
+            self.unsubscribe(websocket, url)
+
+    def _close_feed(self, feed: _Feed) -> None:
+        self._feeds.pop(feed.url, None)
+        if feed.task is not None and not feed.task.done():
+            feed.task.cancel()
+        _log.debug("data feed closed: %s", feed.url[:80])
+
+    async def _run(self, feed: _Feed) -> None:
+        """Refresh loop for one URL; runs while it has subscribers."""
+        while feed.subscribers:
+            await self._refresh(feed)
+            await asyncio.sleep(feed.interval())
+
+    async def _refresh(self, feed: _Feed) -> None:
+        try:
+            resp = await self._http().get(feed.url)
+            body = resp.content
+            status = resp.status_code
+            data: Any = resp.json() if body else None
+        except Exception as e:
+            _log.debug("data feed %s failed: %s", feed.url[:80], e)
+            body = None
+            status = 0
+            data = {"error": "Data refresh failed", "detail": str(e)}
+        self.fetch_count += 1
+        feed.fetched_at = time.monotonic()
+        if body is not None and body == feed.last_body:
+            return
+        feed.last_body = body
+        feed.last_message = {"type": "module_data", "key": feed.url, "status": status, "data": data}
+        self.push_count += 1
+        self._manager.publish(TOPIC_MODULE_DATA, feed.last_message, recipients=list(feed.subscribers))
+
+    def metrics(self) -> dict:
+        return {
+            "feeds": len(self._feeds),
+            "subscriptions": sum(len(f.subscribers) for f in self._feeds.values()),
+            "fetches": self.fetch_count,
+            "pushes": self.push_count,
+        }
+
+    async def stop(self) -> None:
+        """Cancel all refresh loops and close the in-process HTTP client (shutdown)."""
+        for feed in list(self._feeds.values()):
+            self._close_feed(feed)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,159 @@
+"""
+Date extraction from free-form contest and DXpedition text (WA7BNM summaries, NG3K ADXO lines).
+Patterns are compiled once; a cheap month-name check runs before any regex, and results are
+memoized (LRU) because the same summary strings come back on every refresh.
+"""
+
+from datetime import datetime, timezone
+from functools import lru_cache
+import re
+
+_MONTH_NAMES = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+                "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
+_MONTH_KEYS = tuple(k.lower() for k in _MONTH_NAMES)
+_MONTH_ALT = "Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec"
+# First letters of the month abbreviations; a range line must start with one of these
+_MONTH_INITIALS = frozenset("JFMASONDjfmasond")
+_MEMO_SIZE = 4096
+_ICS_DATE_STRIP_RE = re.compile(r"[^0-9TZ]")
+
+# "1500Z, Dec 27", "Dec 27", "1500Z, Dec 27, 2025"
+_Z_DATE_RE = re.compile(
+    r"(?:(\d{4})Z?,?\s*)?(" + _MONTH_ALT + r")\s+(\d{1,2})(?:,\s*(\d{4}))?",
+    re.I,
+)
+# "1500Z, Dec 27 to 1500Z, Dec 28" or "Dec 27 - Dec 28" (end year optional)
+_TEXT_RANGE_RE = re.compile(
+    r"(" + _MONTH_ALT + r")\s+(\d{1,2})(?:,\s*(\d{4}))?\s*(?:to|-)\s*"
+    r"(?:(\d{4})Z?,?\s*)?(" + _MONTH_ALT + r")\s+(\d{1,2})(?:,\s*(\d{4}))?",
+    re.I,
+)
+# "Nov 20-Dec 31, 2025" or "Dec 7, 2025-Jan 5, 2026" (end year required)
+_DASH_RANGE_RE = re.compile(
+    r"(" + _MONTH_ALT + r")\s+(\d{1,2})(?:,\s*(\d{4}))?\s*-\s*"
+    r"(" + _MONTH_ALT + r")\s+(\d{1,2}),\s*(\d{4})",
+    re.I,
+)
+# Start of an NG3K block: "Nov 20-" / "Dec 7, 2025 -" at the beginning of a line
+_RANGE_LINE_START_RE = re.compile(
+    r"(?:" + _MONTH_ALT + r")\s+\d{1,2}(?:,\s*\d{4})?\s*-\s*",
+    re.I,
+)
+
+
+def _has_month(s: str) -> bool:
+    """Cheap pre-check: True if s contains a month abbreviation (case-insensitive)."""
+    low = s.lower()
+    return any(m in low for m in _MONTH_KEYS)
+
+
+def _month_number(mon: str) -> int | None:
+    return _MONTH_NAMES.get(mon[:3].capitalize())
+
+
+def _current_year() -> int:
+    return datetime.now(timezone.utc).year
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _parse_z_date_memo(s: str, default_year: int) -> str | None:
+    if not _has_month(s):
+        return None
+    m = _Z_DATE_RE.search(s)
+    if not m:
+        return None
+    _, mon, day, year = m.groups()
+    year = year or str(default_year)
+    try:
+        mo = _month_number(mon)
+        if mo is None:
+            return None
+        return f"{year}-{mo:02d}-{int(day):02d}T00:00:00Z"
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_z_date(s: str) -> str | None:
+    """Parse '1500Z, Dec 27' or 'Dec 27' or '1500Z, Dec 27, 2025' into ISO start_utc date."""
+    return _parse_z_date_memo((s or "").strip(), _current_year())
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _parse_date_range_in_text_memo(text: str, default_year: int) -> tuple[str | None, str | None]:
+    if not _has_month(text):
+        return (None, None)
+    m = _TEXT_RANGE_RE.search(text)
+    if not m:
+        start_utc = _parse_z_date_memo(text.strip(), default_year)
+        return (start_utc, start_utc)
+    smon, sday, syear, _, emon, eday, eyear = m.groups()
+    syear = syear or eyear or str(default_year)
+    eyear = eyear or syear
+    try:
+        sm = _month_number(smon)
+        em = _month_number(emon)
+        if sm is None or em is None:
+            return (_parse_z_date_memo(text.strip(), default_year), None)
+        start_utc = f"{syear}-{sm:02d}-{int(sday):02d}T00:00:00Z"
+        end_utc = f"{eyear}-{em:02d}-{int(eday):02d}T23:59:59Z"
+        return (start_utc, end_utc)
+    except (ValueError, TypeError):
+        return (_parse_z_date_memo(text.strip(), default_year), None)
+
+
+def parse_date_range_in_text(text: str) -> tuple[str | None, str | None]:
+    """
+    Find first date range like '1500Z, Dec 27 to 1500Z, Dec 28' or 'Dec 27 to Dec 28'.
+    Falls back to a single date (start == end). Missing years default to the current UTC year.
+    """
+    return _parse_date_range_in_text_memo(text or "", _current_year())
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def parse_date_range(s: str) -> tuple[str | None, str | None]:
+    """Parse 'Nov 20-Dec 31, 2025' or 'Dec 7, 2025-Jan 5, 2026' into (start_iso, end_iso)."""
+    if not s or not _has_month(s):
+        return None, None
+    m = _DASH_RANGE_RE.search(s)
+    if not m:
+        return None, None
+    smon, sday, syear, emon, eday, eyear = m.groups()
+    syear = syear or eyear
+    try:
+        sm = _month_number(smon)
+        em = _month_number(emon)
+        if sm is None or em is None:
+            return None, None
+        start_d = datetime(int(syear), sm, int(sday), 0, 0, 0, tzinfo=timezone.utc)
+        end_d = datetime(int(eyear), em, int(eday), 23, 59, 59, tzinfo=timezone.utc)
+        return start_d.isoformat().replace("+00:00", "Z"), end_d.isoformat().replace("+00:00", "Z")
+    except (ValueError, TypeError):
+        return None, None
+
+
+def is_range_line_start(line: str) -> bool:
+    """True if line begins with a date range opener like 'Nov 20-' (NG3K block header)."""
+    if not line or line[0] not in _MONTH_INITIALS:
+        return False
+    return _RANGE_LINE_START_RE.match(line) is not None
+
+
+def ics_date_to_iso(value: str, end_of_day: bool = False) -> str:
+    """
+    Convert an iCal DTSTART/DTEND value ('20251227T150000Z' or '20251227') to 'YYYY-MM-DDTHH:MM:SSZ'.
+    Date-only values get 00:00:00 (or 23:59:59 with end_of_day). Returns '' if unparseable.
+    Keeping every source in one ISO form lets start/end strings be compared and sorted directly.
+    """
+    d = _ICS_DATE_STRIP_RE.sub("", value or "")
+    if len(d) >= 15 and d[8:9] == "T":
+        return f"{d[0:4]}-{d[4:6]}-{d[6:8]}T{d[9:11]}:{d[11:13]}:{d[13:15]}Z"
+    if len(d) >= 8:
+        return f"{d[0:4]}-{d[4:6]}-{d[6:8]}" + ("T23:59:59Z" if end_of_day else "T00:00:00Z")
+    return ""
+
+
+def clear_date_parse_cache() -> None:
+    """Drop memoized parse results (e.g. for benchmarks)."""
+    _parse_z_date_memo.cache_clear()
+    _parse_date_range_in_text_memo.cache_clear()
+    parse_date_range.cache_clear()
@@ -17,7 +17,7 @@ _existing = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "")
 if "--disable-gpu-sandbox" not in _existing and "--disable-gpu" not in _existing:
     os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = (_existing + " --disable-gpu-sandbox").strip()
 
-from PyQt5.QtCore import QUrl, QTimer, QPoint, QEvent, Qt
+from PyQt5.QtCore import QUrl, QTimer, QPoint, QEvent, Qt, pyqtSignal
 from PyQt5.QtGui import QKeySequence, QFont
 from PyQt5.QtWidgets import (
     QApplication,
@@ -39,6 +39,9 @@ from glancerf.aspect_ratio import calculate_dimensions, get_closest_aspect_ratio
 class GlanceRFWindow(QMainWindow):
     """Main window for GlanceRF desktop application"""
 
+    # Emitted (possibly from a server thread) with the changed config keys; handled on the GUI thread
+    config_changed = pyqtSignal(object)
+
     def __init__(self, port: int = 8080):
         super().__init__()
         self.port = port
@@ -117,9 +120,8 @@ class GlanceRFWindow(QMainWindow):
         self.setMaximumSize(16777215, 16777215)
         self.browser.setMaximumSize(16777215, 16777215)
 
-        self.config_timer = QTimer()
-        self.config_timer.timeout.connect(self.check_config_changes)
-        self.config_timer.start(2000)
+        self.config_changed.connect(self.on_config_changed)
+        self.config.add_change_listener(self._config_listener)
 
     def _make_loading_widget(self):
         """Build loading overlay so user sees something instead of a white box."""
@@ -177,14 +179,17 @@ class GlanceRFWindow(QMainWindow):
     def _save_window_geometry_and_ratio(self):
         """Save current window size and position; update aspect_ratio to closest match."""
         geo = self.geometry()
-        self.config.set("desktop_window_width", geo.width())
-        self.config.set("desktop_window_height", geo.height())
-        self.config.set("desktop_window_x", geo.x())
-        self.config.set("desktop_window_y", geo.y())
+        values = {
+            "desktop_window_width": geo.width(),
+            "desktop_window_height": geo.height(),
+            "desktop_window_x": geo.x(),
+            "desktop_window_y": geo.y(),
+        }
         closest = get_closest_aspect_ratio(geo.width(), geo.height())
         if closest != self.aspect_ratio:
             self.aspect_ratio = closest
-            self.config.set("aspect_ratio", closest)
+            values["aspect_ratio"] = closest
+        self.config.update(values)
 
     def resizeEvent(self, event):
         """On resize, schedule save of size and closest aspect ratio."""
@@ -206,34 +211,19 @@ class GlanceRFWindow(QMainWindow):
         self._resize_save_timer.timeout.connect(self._save_window_geometry_and_ratio)
         self._resize_save_timer.start(500)
     
-    def check_config_changes(self):
-        """Check for config changes and reload if any settings changed"""
-        try:
-            new_config = get_config()
-            new_aspect_ratio = new_config.get("aspect_ratio") or "16:9"
-            new_grid_columns = new_config.get("grid_columns")
-            new_grid_rows = new_config.get("grid_rows")
-
-            if new_grid_columns is None or new_grid_rows is None:
-                return
-
-            config_changed = False
+    def _config_listener(self, version, changed_keys):
+        """Config change listener; forwards to the GUI thread."""
+        self.config_changed.emit(changed_keys)
+
+    def on_config_changed(self, changed_keys):
+        """Resize for a new aspect ratio and reload the page when the grid size changed."""
+        if "aspect_ratio" in changed_keys:
+            new_aspect_ratio = self.config.get("aspect_ratio") or "16:9"
             if new_aspect_ratio != self.aspect_ratio:
                 self.aspect_ratio = new_aspect_ratio
                 self._resize_to_aspect_ratio()
-                config_changed = True
-
-            current_grid_columns = self.config.get("grid_columns")
-            current_grid_rows = self.config.get("grid_rows")
-            if current_grid_columns is not None and current_grid_rows is not None:
-                if new_grid_columns != current_grid_columns or new_grid_rows != current_grid_rows:
-                    config_changed = True
-
-            if config_changed:
-                self.config = new_config
-                self.browser.reload()
-        except Exception:
-            pass
+        if "grid_columns" in changed_keys or "grid_rows" in changed_keys:
+            self.browser.reload()
 
     def _resize_to_aspect_ratio(self):
         """Resize window to match current aspect ratio; save new size to config."""
@@ -267,6 +257,9 @@ class GlanceRFWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event"""
+        self.config.remove_change_listener(self._config_listener)
+        # Write any pending window geometry before the app exits
+        self.config.flush()
         # Allow normal close
         event.accept()
 
@@ -0,0 +1,242 @@
+"""
+Incremental merge/dedup index for dated event lists (contests, DXpeditions).
+
+Each source's latest items are kept separately. When a source refreshes, only keys whose
+contribution changed are re-merged; the start-sorted order is maintained with bisect and
+past events are expired from a min-heap on end time, so a refresh or a query never rescans
+the whole list.
+"""
+
+import bisect
+import heapq
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Sequence
+
+EventKey = tuple[str, str]
+
+
+class EventMergeIndex:
+    """
+    Persistent merge index keyed by (normalized name, start date).
+
+    name_of: returns the normalized name used in the key (e.g. upper-cased title or call).
+    merge_into: merges a later source's record into the existing merged record (url/info policy).
+    tiebreak_field: field used after start_utc for ordering (e.g. "title" or "call").
+    source_order: source labels in merge precedence order, whatever order they are first applied in
+    (labels not listed merge after them, in order of arrival).
+    """
+
+    def __init__(
+        self,
+        name_of: Callable[[dict[str, Any]], str],
+        merge_into: Callable[[dict[str, Any], dict[str, Any]], None],
+        tiebreak_field: str,
+        source_order: Iterable[str] = (),
+    ):
+        self._name_of = name_of
+        self._merge_into = merge_into
+        self._tiebreak_field = tiebreak_field
+        self._rank = {label: i for i, label in enumerate(source_order)}
+        self._lock = threading.Lock()
+        self._sources: dict[str, dict[EventKey, dict[str, Any]]] = {}
+        self._merged: dict[EventKey, dict[str, Any]] = {}
+        self._order: list[tuple[str, str, EventKey]] = []
+        self._order_entry: dict[EventKey, tuple[str, str, EventKey]] = {}
+        self._expiry: list[tuple[str, EventKey]] = []
+        self._snapshot: tuple[dict[str, Any], ...] | None = None
+
+    def key_of(self, d: dict[str, Any]) -> EventKey | None:
+        """Dedup key for an item, or None if it has no name or start date."""
+        name = self._name_of(d)
+        start = (d.get("start_utc") or "")[:10]
+        if not name or not start:
+            return None
+        return (name, start)
+
+    def merge_record(self, existing: dict[str, Any], d: dict[str, Any], source_label: str) -> None:
+        """Add source_label to existing's source list and apply the merge policy for d."""
+        existing_sources = (existing.get("source") or "").split("; ")
+        if source_label not in existing_sources:
+            existing_sources.append(source_label)
+        existing["source"] = "; ".join(existing_sources)
+        self._merge_into(existing, d)
+
+    def _fold(self, source_label: str, items: list[dict[str, Any]]) -> dict[EventKey, dict[str, Any]]:
+        """Collapse one source's items to a single record per key."""
+        by_key: dict[EventKey, dict[str, Any]] = {}
+        for d in items:
+            key = self.key_of(d)
+            if key is None:
+                continue
+            existing = by_key.get(key)
+            if existing is None:
+                rec = dict(d)
+                rec["source"] = source_label
+                by_key[key] = rec
+            else:
+                self.merge_record(existing, d, source_label)
+        return by_key
+
+    def _remerge(self, key: EventKey) -> None:
+        """Rebuild the merged record for one key from every source, in source order."""
+        rec: dict[str, Any] | None = None
+        for label, contrib in self._sources.items():
+            d = contrib.get(key)
+            if d is None:
+                continue
+            if rec is None:
+                rec = dict(d)
+            else:
+                self.merge_record(rec, d, label)
+        old_entry = self._order_entry.pop(key, None)
+        if old_entry is not None:
+            i = bisect.bisect_left(self._order, old_entry)
+            if i < len(self._order) and self._order[i] == old_entry:
+                del self._order[i]
+        if rec is None:
+            self._merged.pop(key, None)
+            return
+        self._merged[key] = rec
+        entry = (rec.get("start_utc") or "", rec.get(self._tiebreak_field) or "", key)
+        bisect.insort(self._order, entry)
+        self._order_entry[key] = entry
+        heapq.heappush(self._expiry, (rec.get("end_utc") or "", key))
+
+    def apply_source(self, source_label: str, items: list[dict[str, Any]]) -> int:
+        """Replace one source's items. Only keys whose contribution changed are re-merged. Returns that count."""
+        new_contrib = self._fold(source_label, items)
+        with self._lock:
+            old_contrib = self._sources.get(source_label, {})
+            is_new = source_label not in self._sources
+            self._sources[source_label] = new_contrib
+            if is_new:
+                # Keep sources in precedence order so _remerge folds them as a full merge would
+                unranked = len(self._rank)
+                self._sources = dict(sorted(self._sources.items(), key=lambda kv: self._rank.get(kv[0], unranked)))
+            changed = [k for k in old_contrib if k not in new_contrib]
+            changed.extend(k for k, rec in new_contrib.items() if old_contrib.get(k) != rec)
+            for key in changed:
+                self._remerge(key)
+            if changed:
+                self._snapshot = None
+            if len(self._expiry) > 2 * len(self._merged):
+                self._rebuild_expiry()
+        return len(changed)
+
+    def _rebuild_expiry(self) -> None:
+        """Drop superseded heap entries (each remerge pushes a new one) by rebuilding from the merged records."""
+        self._expiry = [(rec.get("end_utc") or "", key) for key, rec in self._merged.items()]
+        heapq.heapify(self._expiry)
+
+    def expire(self, cutoff: str) -> int:
+        """Drop merged events whose end_utc is before cutoff (ISO UTC string). Returns count removed."""
+        removed = 0
+        with self._lock:
+            while self._expiry and self._expiry[0][0] < cutoff:
+                end, key = heapq.heappop(self._expiry)
+                rec = self._merged.get(key)
+                if rec is None or (rec.get("end_utc") or "") != end:
+                    continue  # stale heap entry; record was replaced or already removed
+                del self._merged[key]
+                entry = self._order_entry.pop(key)
+                i = bisect.bisect_left(self._order, entry)
+                if i < len(self._order) and self._order[i] == entry:
+                    del self._order[i]
+                removed += 1
+            if removed:
+                self._snapshot = None
+        return removed
+
+    def entries(self) -> tuple[dict[str, Any], ...]:
+        """Merged events sorted by (start_utc, tiebreak), as an immutable tuple. Records are shared; copy before changing one."""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = tuple(self._merged[k] for _, _, k in self._order)
+            return self._snapshot
+
+    def overlay(
+        self,
+        entries: Sequence[dict[str, Any]],
+        sourced_lists: list[tuple[str, list[dict[str, Any]]]],
+        cutoff: str,
+    ) -> list[dict[str, Any]]:
+        """
+        Merge extra sources (e.g. per-request custom feeds) onto an already merged, sorted entries list
+        without touching the index. Records that change are copied; new events ending before cutoff are skipped.
+        """
+        by_key = {self.key_of(d): d for d in entries}
+        copied: set[EventKey] = set()
+        added: list[dict[str, Any]] = []
+        for source_label, items in sourced_lists:
+            for d in items:
+                key = self.key_of(d)
+                if key is None:
+                    continue
+                existing = by_key.get(key)
+                if existing is None:
+                    if (d.get("end_utc") or "") < cutoff:
+                        continue
+                    rec = dict(d)
+                    rec["source"] = source_label
+                    by_key[key] = rec
+                    copied.add(key)
+                    added.append(rec)
+                    continue
+                if key not in copied:
+                    existing = dict(existing)
+                    by_key[key] = existing
+                    copied.add(key)
+                self.merge_record(existing, d, source_label)
+        if not copied:
+            return list(entries)
+        result = [by_key[self.key_of(d)] for d in entries]
+        tb = self._tiebreak_field
+        for rec in added:
+            bisect.insort(result, rec, key=lambda r: (r.get("start_utc") or "", r.get(tb) or ""))
+        return result
+
+
+def _start_of(d: dict[str, Any]) -> str:
+    return d.get("start_utc") or ""
+
+
+def query_events(
+    entries: Sequence[dict[str, Any]],
+    within_days: float | None = None,
+    active_only: bool = False,
+    offset: int = 0,
+    limit: int | None = None,
+    fields: Iterable[str] | None = None,
+    info_chars: int | None = None,
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Window, page and project a start-sorted event list (as returned by EventMergeIndex.entries()).
+
+    within_days: keep events already running or starting within that many days from now.
+    active_only: keep only events that have already started (end time is handled by expiry).
+    The window is found with a binary search on start_utc; offset/limit then page it.
+    fields: keys to keep in each item (None = all; names are stripped, so "title, url" works). info_chars: truncate "info" to that length, adding "...".
+    Returns (items, total) where total is the number of events in the window before paging.
+    """
+    now = datetime.now(timezone.utc)
+    upper: str | None = None
+    if active_only:
+        upper = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    elif within_days is not None:
+        upper = (now + timedelta(days=within_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    hi = len(entries) if upper is None else bisect.bisect_right(entries, upper, key=_start_of)
+    start = min(max(offset, 0), hi)
+    stop = hi if limit is None else min(hi, start + max(limit, 0))
+    page = list(entries[start:stop])
+    keep = None if fields is None else tuple(f.strip() for f in fields if f.strip())
+    if keep is None and info_chars is None:
+        return page, hi
+    items: list[dict[str, Any]] = []
+    for d in page:
+        item = dict(d) if keep is None else {k: d[k] for k in keep if k in d}
+        info = item.get("info")
+        if info_chars is not None and isinstance(info, str) and len(info) > info_chars:
+            item["info"] = info[:info_chars] + "..."
+        items.append(item)
+    return items, hi
@@ -0,0 +1,89 @@
+"""
+Deferred imports for module API routes.
+A module's api_routes.py declares its heavy service modules with lazy_import(); the import (and
+its third-party dependencies such as Skyfield or feedparser) happens on first attribute access,
+or earlier when the module is placed in the layout (preload). Import times are recorded for the
+startup report.
+"""
+
+import importlib
+import importlib.util
+import threading
+import time
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+from glancerf.logging_config import get_logger
+
+_log = get_logger("lazy_import")
+
+# Module name -> proxy, for preloading by package
+_proxies: Dict[str, "LazyModule"] = {}
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["import_seconds"] = None
+
+    def load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self._name)
+            elapsed = time.perf_counter() - start
+            self.__dict__["_module"] = module
+            self.__dict__["import_seconds"] = elapsed
+            _log.debug("lazy import %s: %.1f ms", self._name, elapsed * 1000)
+        return module
+
+    def deferred(self, attr: str) -> Callable:
+        """Function that calls attr on the module, importing it in the caller's thread on first use.
+        Pass this to asyncio.to_thread so a first import never runs on the event loop."""
+
+        def call(*args, **kwargs):
+            return getattr(self.load(), attr)(*args, **kwargs)
+
+        return call
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return "<lazy module %r%s>" % (self._name, "" if self.loaded else " (not loaded)")
+
+
+def lazy_import(name: str, package: Optional[str] = None) -> LazyModule:
+    """Return a LazyModule for name (relative names like '.satellite_service' need package)."""
+    if name.startswith("."):
+        name = importlib.util.resolve_name(name, package)
+    with _lock:
+        proxy = _proxies.get(name)
+        if proxy is None:
+            proxy = _proxies[name] = LazyModule(name)
+    return proxy
+
+
+def lazy_modules(package: str) -> List[LazyModule]:
+    """LazyModules declared under package (e.g. glancerf.modules.satellite_pass)."""
+    prefix = package + "."
+    with _lock:
+        return [p for name, p in _proxies.items() if name.startswith(prefix)]
+
+
+def preload(package: str) -> float:
+    """Import every lazy module under package now. Returns the seconds spent (0 if already loaded)."""
+    total = 0.0
+    for proxy in lazy_modules(package):
+        if not proxy.loaded:
+            proxy.load()
+            total += proxy.import_seconds or 0.0
+    return total
@@ -3,18 +3,21 @@ FastAPI application for GlanceRF
 Main web server and API endpoints
 """
 
+import asyncio
 import logging
 import time
 from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
 
-from glancerf.config import get_config
+from glancerf.asset_bundles import register_bundle_routes
+from glancerf.compression import JSONGZipMiddleware, PrecompressedStaticFiles
+from glancerf.config import DEFAULT_CONFIG_WRITE_DELAY_SEC, ConfigWatcher, get_config
+from glancerf.data_bus import DataBus
 from glancerf.logging_config import DETAILED_LEVEL, get_logger, setup_logging
 from glancerf.rate_limit import RateLimitExceeded, rate_limit_exceeded_handler
-from glancerf.websocket_manager import ConnectionManager
+from glancerf.websocket_manager import DEFAULT_STATE_MAX_HZ, TOPIC_CONFIG, ConnectionManager
 from glancerf import __version__
 from glancerf.update_checker import UpdateChecker, check_for_updates, get_latest_release_info, compare_versions
 from glancerf.telemetry import TelemetrySender
@@ -42,10 +45,19 @@ async def _request_logging(request: Request, call_next):
         return response
     return await call_next(request)
 
+# Module CSS/JS bundles live under /static/bundles/, so their route goes before the /static mount
+register_bundle_routes(app)
+
 # Serve static assets (CSS, JS) from glancerf/web/static
 _web_static = Path(__file__).resolve().parent / "web" / "static"
 if _web_static.is_dir():
-    app.mount("/static", StaticFiles(directory=str(_web_static)), name="static")
+    _static_files = PrecompressedStaticFiles(directory=str(_web_static))
+    app.mount("/static", _static_files, name="static")
+else:
+    _static_files = None
+
+# Gzip large JSON API responses (pages and static files carry their own precompressed copies)
+app.add_middleware(JSONGZipMiddleware)
 
 
 @app.on_event("startup")
@@ -78,9 +90,47 @@ def _set_connection_reset_handler():
 # Config is loaded on first get_config(); if file is missing, default config is used and saved
 config = get_config()
 setup_logging(config)
+# Write-behind: settings changes hit memory at once and are written to disk in coalesced batches
+_write_delay = config.get("config_write_delay_sec")
+config.enable_write_behind(DEFAULT_CONFIG_WRITE_DELAY_SEC if _write_delay is None else _write_delay)
+
+# Global connection manager (state/update relays coalesced to ws_state_max_hz per source)
+_state_max_hz = config.get("ws_state_max_hz")
+connection_manager = ConnectionManager(
+    state_max_hz=DEFAULT_STATE_MAX_HZ if _state_max_hz is None else _state_max_hz
+)
+
+# Config change events go to config-topic subscribers as {"type": "config_changed"}. Changes can
+# come from any thread (desktop window, threadpool handlers), so the publish hops onto the server loop.
+_server_loop = None
+
+
+def _publish_config_change(version, changed_keys):
+    loop = _server_loop
+    if loop is None or loop.is_closed():
+        return
+    message = {"type": "config_changed", "data": {"version": version, "keys": sorted(changed_keys)}}
+    loop.call_soon_threadsafe(connection_manager.publish, TOPIC_CONFIG, message)
+
+
+config.add_change_listener(_publish_config_change)
+
+
+def _broadcast_external_config_change(changed_keys):
+    """The config file was edited on disk and its content changed: tell every client to reload."""
+    loop = _server_loop
+    if loop is None or loop.is_closed():
+        return
+    _log.debug("config file changed on disk (%s), broadcasting config_update", ", ".join(sorted(changed_keys)))
+    message = {"type": "config_update", "data": {"reload": True}}
+    loop.call_soon_threadsafe(connection_manager.publish, TOPIC_CONFIG, message)
+
+
+# Hot reload of glancerf_config.json when it is edited outside the app (config_watch: false disables)
+config_watcher = ConfigWatcher(config, on_reload=_broadcast_external_config_change)
 
-# Global connection manager
-connection_manager = ConnectionManager()
+# Module data bus: one in-process fetch per subscribed module URL, pushed over WebSocket
+data_bus = DataBus(app, connection_manager)
 
 # Global update checker
 update_checker = UpdateChecker(connection_manager)
@@ -94,7 +144,7 @@ layout_routes.register_layout_routes(app, connection_manager)
 setup_routes.register_setup_routes(app, connection_manager)
 register_modules_routes(app, connection_manager)
 api.register_api_routes(app)
-websocket.register_websocket_routes(app, connection_manager)
+websocket.register_websocket_routes(app, connection_manager, data_bus)
 
 _UPDATES_TEMPLATE_PATH = Path(__file__).resolve().parent / "web" / "templates" / "updates" / "index.html"
 _updates_template_cache = None
@@ -172,6 +222,12 @@ async def trigger_apply_update():
 @app.on_event("startup")
 async def _start_background_tasks():
     """Start background tasks."""
+    global _server_loop
+    _server_loop = asyncio.get_running_loop()
+    if config.get("config_watch") is not False:
+        config_watcher.start()
+    if _static_files is not None:
+        asyncio.get_running_loop().run_in_executor(None, _static_files.precompress)
     update_checker.start()
     telemetry_sender.start()
     start_aprs_cache()
@@ -182,15 +238,21 @@ async def _stop_background_tasks():
     """Stop background tasks."""
     update_checker.stop()
     telemetry_sender.stop()
+    connection_manager.stop_heartbeat()
+    await data_bus.stop()
+    config_watcher.stop()
+    config.remove_change_listener(_publish_config_change)
+    config.flush()
 
 
 def run_server(host: str = "0.0.0.0", port: int = 8080, quiet: bool = False):
-    """Run the FastAPI server"""
+    """Run the FastAPI server. /ws/* negotiate permessage-deflate unless ws_compression is false in config."""
     import uvicorn
     uvicorn.run(
         app,
         host=host,
         port=port,
         log_level="error",
-        access_log=False
+        access_log=False,
+        ws_per_message_deflate=config.get("ws_compression") is not False,
     )
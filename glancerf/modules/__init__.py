@@ -1,17 +1,25 @@
 """
 Cell modules for GlanceRF.
 Each module is a folder (e.g. clock/) containing:
-  - module.py   -> defines MODULE = {"id", "name", "color", "settings"?, ...}
+  - module.py   -> defines MODULE = {"id", "name", "color", "settings"?, ...}; its docstring is the description
   - index.html  -> inner HTML for the cell (optional; can be empty)
   - style.css   -> CSS injected once per page (optional)
   - script.js   -> JS injected once per page (optional)
 
 Folders whose names start with _ are skipped and not loaded as modules.
+
+Discovered modules are recorded in a manifest (cache/module_manifest.json in the config directory)
+keyed by the mtime and size of those files; a module whose files are unchanged is loaded from it
+without running module.py.
 """
 
+import hashlib
 import importlib
 import importlib.util
+import json
+import os
 import sys
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -21,6 +29,29 @@ _CUSTOM_MODULES_DIR = _MODULES_DIR / "_custom"
 _loaded: Optional[List[Dict[str, Any]]] = None
 _by_id: Optional[Dict[str, Dict[str, Any]]] = None
 _folder_by_id: Optional[Dict[str, Path]] = None
+_version: Optional[str] = None
+
+# Manifest location under the config directory (the package directory may be read-only)
+_MANIFEST_DIR = "cache"
+_MANIFEST_FILENAME = "module_manifest.json"
+_MANIFEST_FORMAT = 2
+# Files whose (mtime, size) decide whether a manifest entry is still valid
+_SIGNATURE_FILES = ("module.py", "__init__.py", "index.html", "style.css", "script.js")
+# Folder path -> {"signature": ..., "module": ...}; read from disk on first discovery
+_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+
+_NO_DESCRIPTION = "No description available"
+_MAX_DESCRIPTION_LENGTH = 200
+
+
+def _description_from_doc(doc: Optional[str]) -> str:
+    """First paragraph of a module docstring, shortened for the Modules page."""
+    if not doc or not doc.strip():
+        return _NO_DESCRIPTION
+    desc = doc.strip().split("\n\n")[0].strip()
+    if len(desc) > _MAX_DESCRIPTION_LENGTH:
+        desc = desc[:_MAX_DESCRIPTION_LENGTH] + "..."
+    return desc
 
 # Built-in "empty" option for unset cells (no folder)
 EMPTY_MODULE: Dict[str, Any] = {
@@ -33,7 +64,96 @@ EMPTY_MODULE: Dict[str, Any] = {
 }
 
 
-def _load_module_from_folder(folder: Path, spec_prefix: str = "glancerf.modules") -> Optional[Dict[str, Any]]:
+def _folder_signature(folder: Path) -> Dict[str, Optional[List[int]]]:
+    """(mtime_ns, size) of each file that makes up a module; None for missing files."""
+    sig: Dict[str, Optional[List[int]]] = {}
+    for name in _SIGNATURE_FILES:
+        try:
+            st = os.stat(str(folder / name))
+            sig[name] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            sig[name] = None
+    return sig
+
+
+def _manifest_path() -> Optional[Path]:
+    """Manifest file under config_dir/cache, or None if the config is unavailable."""
+    try:
+        from glancerf.config import get_config
+
+        return get_config().config_dir / _MANIFEST_DIR / _MANIFEST_FILENAME
+    except Exception:
+        return None
+
+
+def _read_manifest() -> Dict[str, Dict[str, Any]]:
+    path = _manifest_path()
+    if path is None:
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != _MANIFEST_FORMAT or not isinstance(data.get("modules"), dict):
+        return {}
+    return data["modules"]
+
+
+def _write_manifest(entries: Dict[str, Dict[str, Any]]) -> None:
+    """Atomically replace the manifest file (best effort: if it cannot be written it is skipped)."""
+    path = _manifest_path()
+    if path is None:
+        return
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=".module_manifest.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"format": _MANIFEST_FORMAT, "modules": entries}, f)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    except (OSError, TypeError, ValueError):
+        pass
+    finally:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _load_module_from_folder(
+    folder: Path,
+    spec_prefix: str = "glancerf.modules",
+    entries: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return the module dict for folder: from the manifest if its files are unchanged, else by
+    importing it. The result is recorded in entries (the manifest being built)."""
+    global _manifest
+    if _manifest is None:
+        _manifest = _read_manifest()
+    key = str(folder)
+    sig = _folder_signature(folder)
+    cached = _manifest.get(key)
+    if cached is not None and cached.get("signature") == sig and isinstance(cached.get("module"), dict):
+        m = cached["module"]
+    else:
+        m = _import_module_folder(folder, spec_prefix)
+        if m is None:
+            return None
+        try:
+            # Only JSON-clean MODULE dicts can be served from the manifest next time
+            m = json.loads(json.dumps(m))
+            cached = {"signature": sig, "module": m}
+        except (TypeError, ValueError):
+            cached = None
+    if entries is not None and cached is not None:
+        entries[key] = cached
+    return m
+
+
+def _import_module_folder(folder: Path, spec_prefix: str = "glancerf.modules") -> Optional[Dict[str, Any]]:
     """Load MODULE from folder/module.py and inject inner_html, css, js from files.
     If folder has __init__.py, load it as a package first so api_routes can be imported as a submodule."""
     module_py = folder / "module.py"
@@ -43,12 +163,14 @@ def _load_module_from_folder(folder: Path, spec_prefix: str = "glancerf.modules"
     try:
         if (folder / "__init__.py").is_file():
             # Load as package so pkg.api_routes is importable
-            spec_pkg = importlib.util.spec_from_file_location(pkg_name, folder / "__init__.py")
-            if spec_pkg is None or spec_pkg.loader is None:
-                return None
-            pkg = importlib.util.module_from_spec(spec_pkg)
-            sys.modules[pkg_name] = pkg
-            spec_pkg.loader.exec_module(pkg)
+            # (an already imported package is kept: api_routes and its services hold references to it)
+            if pkg_name not in sys.modules:
+                spec_pkg = importlib.util.spec_from_file_location(pkg_name, folder / "__init__.py")
+                if spec_pkg is None or spec_pkg.loader is None:
+                    return None
+                pkg = importlib.util.module_from_spec(spec_pkg)
+                sys.modules[pkg_name] = pkg
+                spec_pkg.loader.exec_module(pkg)
             spec_mod = importlib.util.spec_from_file_location(pkg_name + ".module", module_py)
             if spec_mod is None or spec_mod.loader is None:
                 return None
@@ -70,6 +192,8 @@ def _load_module_from_folder(folder: Path, spec_prefix: str = "glancerf.modules"
             m = dict(mod.MODULE)
         if not isinstance(m, dict) or "id" not in m or "name" not in m or "color" not in m:
             return None
+        if not m.get("description"):
+            m["description"] = _description_from_doc(mod.__doc__)
         # Override with file contents if present (so module.py can omit inner_html/css/js)
         for key, filename in [("inner_html", "index.html"), ("css", "style.css"), ("js", "script.js")]:
             path = folder / filename
@@ -77,10 +201,6 @@ def _load_module_from_folder(folder: Path, spec_prefix: str = "glancerf.modules"
                 m[key] = path.read_text(encoding="utf-8").strip()
             elif key not in m:
                 m[key] = ""
-        global _folder_by_id
-        if _folder_by_id is None:
-            _folder_by_id = {}
-        _folder_by_id[m["id"]] = folder
         return m
     except Exception:
         return None
@@ -93,14 +213,17 @@ def _discover_modules() -> List[Dict[str, Any]]:
         return _loaded
 
     result: List[Dict[str, Any]] = [dict(EMPTY_MODULE)]
+    entries: Dict[str, Dict[str, Any]] = {}
+    folders: Dict[str, Path] = {}
     seen_ids: set = {""}
     by_id_temp: Dict[str, int] = {}  # id -> index in result (for override)
 
     for folder in sorted(_MODULES_DIR.iterdir()):
         if not folder.is_dir() or folder.name.startswith("_"):
             continue
-        m = _load_module_from_folder(folder)
+        m = _load_module_from_folder(folder, entries=entries)
         if m:
+            folders[m["id"]] = folder
             if m["id"] in seen_ids:
                 idx = by_id_temp[m["id"]]
                 result[idx] = m
@@ -113,8 +236,9 @@ def _discover_modules() -> List[Dict[str, Any]]:
         for folder in sorted(_CUSTOM_MODULES_DIR.iterdir()):
             if not folder.is_dir() or folder.name.startswith("_"):
                 continue
-            m = _load_module_from_folder(folder, spec_prefix="glancerf.custom")
+            m = _load_module_from_folder(folder, spec_prefix="glancerf.custom", entries=entries)
             if m:
+                folders[m["id"]] = folder
                 if m["id"] in seen_ids:
                     idx = by_id_temp[m["id"]]
                     result[idx] = m
@@ -123,12 +247,16 @@ def _discover_modules() -> List[Dict[str, Any]]:
                     seen_ids.add(m["id"])
                     by_id_temp[m["id"]] = len(result) - 1
 
+    global _by_id, _folder_by_id, _manifest
+    if entries != _manifest:
+        _write_manifest(entries)
+        _manifest = entries
+
     result.sort(key=lambda m: (m["id"] != "", m["id"]))
-    global _by_id, _folder_by_id
     _loaded = result
     _by_id = {m["id"]: m for m in result}
-    if _folder_by_id is None:
-        _folder_by_id = {}
+    # Rebuilt on every discovery so modules deleted from disk no longer resolve
+    _folder_by_id = folders
     return result
 
 
@@ -139,13 +267,19 @@ def get_module_by_id(module_id: str) -> Optional[Dict[str, Any]]:
     return (_by_id or {}).get(module_id)
 
 
-def get_module_assets(layout: List[List[str]]) -> Tuple[str, str]:
-    """Collect css and js from all modules that appear in layout. Returns (css, js)."""
-    ids_in_layout: set = set()
+def module_ids_in_layout(layout: Optional[List[List[str]]]) -> List[str]:
+    """Ids of the modules placed in layout, in order of first appearance (empty cells skipped)."""
+    ids_in_layout: List[str] = []
     for row in layout or []:
         for cell_value in row:
-            if cell_value:
-                ids_in_layout.add(cell_value)
+            if cell_value and cell_value not in ids_in_layout:
+                ids_in_layout.append(cell_value)
+    return ids_in_layout
+
+
+def get_module_assets(layout: List[List[str]]) -> Tuple[str, str]:
+    """Collect css and js from all modules that appear in layout, in layout order. Returns (css, js)."""
+    ids_in_layout = module_ids_in_layout(layout)
     css_parts: List[str] = []
     js_parts: List[str] = []
     done_css: set = set()
@@ -163,11 +297,42 @@ def get_module_assets(layout: List[List[str]]) -> Tuple[str, str]:
     return ("\n".join(css_parts), "\n".join(js_parts))
 
 
+def get_modules_version() -> str:
+    """Hash of every module's id, name, color, inner HTML, CSS and JS. Changes only when module content does."""
+    global _version
+    if _version is None:
+        h = hashlib.sha1()
+        for m in _discover_modules():
+            for key in ("id", "name", "color", "inner_html", "css", "js"):
+                h.update(str(m.get(key) or "").encode("utf-8"))
+                h.update(b"\0")
+        _version = h.hexdigest()[:16]
+    return _version
+
+
+def reload_modules() -> List[str]:
+    """
+    Rediscover modules, re-importing only folders whose files changed since they were last loaded
+    (unchanged ones come from the manifest). Returns the ids of modules that were added, removed
+    or changed.
+    """
+    before = {m["id"]: m for m in (_loaded or [])}
+    clear_module_cache()
+    after = {m["id"]: m for m in _discover_modules()}
+    changed = sorted(
+        mid for mid in set(before) | set(after)
+        if mid and before.get(mid) != after.get(mid)
+    )
+    return changed
+
+
 def clear_module_cache() -> None:
     """Clear the in-memory module list so next get_modules() reloads from disk. Use after editing module.py."""
-    global _loaded, _by_id
+    global _loaded, _by_id, _folder_by_id, _version
     _loaded = None
     _by_id = None
+    _folder_by_id = None
+    _version = None
 
 
 def get_modules() -> List[Dict[str, Any]]:
@@ -192,36 +357,47 @@ def get_module_dir(module_id: str) -> Optional[Path]:
     return (_folder_by_id or {}).get(module_id)
 
 
-def get_module_api_packages() -> List[str]:
-    """
-    Return package names for modules that provide api_routes.py (e.g. glancerf.modules.satellite_pass).
-    Core uses this to register each module's API routes at startup.
-    """
+def get_module_api_package_map() -> Dict[str, str]:
+    """Module id -> package name (e.g. glancerf.modules.satellite_pass) for modules that provide api_routes.py."""
     _discover_modules()
-    packages: List[str] = []
+    packages: Dict[str, str] = {}
     parent = _MODULES_DIR.parent
-    for folder in (_folder_by_id or {}).values():
+    for module_id, folder in (_folder_by_id or {}).items():
         if (folder / "api_routes.py").is_file():
             try:
                 rel = folder.relative_to(parent)
                 pkg = parent.name + "." + rel.as_posix().replace("/", ".").replace("\\", ".")
-                packages.append(pkg)
+                packages[module_id] = pkg
             except ValueError:
                 pass
     return packages
 
 
-def validate_module_dependencies() -> List[Tuple[str, str]]:
+def get_module_api_packages() -> List[str]:
     """
-    Try to import each module that provides api_routes.py. Returns a list of
-    (module_name, error_message) for any that fail. Used at startup to fail fast
-    if a module's dependencies (e.g. skyfield for satellite_pass) are missing.
+    Return package names for modules that provide api_routes.py (e.g. glancerf.modules.satellite_pass).
+    Core uses this to register each module's API routes at startup.
+    """
+    return list(get_module_api_package_map().values())
+
+
+def validate_module_dependencies(layout: Optional[List[List[str]]] = None) -> List[Tuple[str, str]]:
+    """
+    Try to import each module that provides api_routes.py, plus the deferred (lazy_import) service
+    modules of those used in layout. Returns a list of (module_name, error_message) for any that
+    fail. Used at startup to fail fast if a used module's dependencies (e.g. skyfield for
+    satellite_pass) are missing; modules not in the layout load their dependencies on first use.
     """
+    from glancerf.lazy_import import preload
+
+    used = set(module_ids_in_layout(layout))
     failures: List[Tuple[str, str]] = []
-    for pkg in get_module_api_packages():
+    for module_id, pkg in get_module_api_package_map().items():
         module_name = pkg.split(".")[-1] if "." in pkg else pkg
         try:
             importlib.import_module(pkg + ".api_routes")
+            if module_id in used:
+                preload(pkg)
         except ModuleNotFoundError as e:
             missing = e.name or "unknown"
             failures.append((module_name, "Missing dependency '%s'. Install with: pip install %s" % (missing, missing)))
@@ -5,23 +5,65 @@ Register contests API routes. Called by core at startup if this module is presen
 import json
 import asyncio
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.responses import JSONResponse
 
+from glancerf.data_bus import layout_cell_settings, register_data_source
+from glancerf.event_index import query_events
+from glancerf.lazy_import import lazy_import
 from glancerf.logging_config import get_logger
-from .contest_service import get_contests_cached
+
+contest_service = lazy_import(".contest_service", __package__)
 
 _log = get_logger("contests.api_routes")
 
 _DEFAULT_CREDITS = "WA7BNM; SSA (SE); RSGB (UK)"
 
 
+def _custom_source_urls(value) -> set:
+    """URLs in a custom_sources value (JSON string or list of {url, type, label})."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value) if value.strip() else []
+        except ValueError:
+            return set()
+    if not isinstance(value, list):
+        return set()
+    return {str(c.get("url") or c.get("URL") or "").strip() for c in value if isinstance(c, dict)} - {""}
+
+
+def _custom_sources_in_layout(query: dict) -> bool:
+    """Data bus check: custom source URLs must be configured in a contests cell of the layout."""
+    requested = query.get("custom_sources")
+    if not requested:
+        return True
+    configured = set()
+    for ms in layout_cell_settings("contests"):
+        configured |= _custom_source_urls(ms.get("custom_sources"))
+    return len(requested) == 1 and _custom_source_urls(requested[0]) <= configured
+
+
 def register_routes(app: FastAPI) -> None:
     """Register GET /api/contests/list."""
+    register_data_source("/api/contests/list", min_interval_sec=60, allow_query=_custom_sources_in_layout)
 
     @app.get("/api/contests/list")
-    async def get_contests_list(sources: str | None = None, custom_sources: str | None = None):
-        """Return list of contests. sources: comma-separated built-in source IDs. custom_sources: JSON array of {url, type, label}."""
+    async def get_contests_list(
+        sources: str | None = None,
+        custom_sources: str | None = None,
+        within_days: float | None = Query(None, ge=0, le=3660),
+        active: bool = False,
+        offset: int = Query(0, ge=0),
+        limit: int | None = Query(None, ge=1, le=1000),
+        fields: str | None = None,
+        info_chars: int | None = Query(None, ge=0, le=1000),
+    ):
+        """
+        Return list of contests. sources: comma-separated built-in source IDs. custom_sources: JSON array of {url, type, label}.
+        within_days: only contests running now or starting within N days. active: only contests running now.
+        offset/limit: page the (start-sorted) list; total is the count before paging.
+        fields: comma-separated keys to return per contest. info_chars: truncate info to N characters.
+        """
         _log.debug("API: GET /api/contests/list")
         if sources is None:
             enabled = None
@@ -45,10 +87,20 @@ def register_routes(app: FastAPI) -> None:
                 credits = credits + "; " + "; ".join(custom_labels) if credits else "; ".join(custom_labels)
         try:
             result = await asyncio.to_thread(
-                get_contests_cached, enabled_sources=enabled, custom_sources=custom
+                contest_service.deferred("get_contests_cached"), enabled_sources=enabled, custom_sources=custom
+            )
+            items, total = query_events(
+                result,
+                within_days=within_days,
+                active_only=active,
+                offset=offset,
+                limit=limit,
+                fields=fields.split(",") if fields else None,
+                info_chars=info_chars,
             )
             return {
-                "contests": result,
+                "contests": items,
+                "total": total,
                 "credits": credits,
             }
         except Exception as e:
@@ -15,6 +15,8 @@ from typing import Any
 import feedparser
 import httpx
 
+from glancerf.date_parsing import ics_date_to_iso, parse_date_range_in_text
+from glancerf.event_index import EventMergeIndex
 from glancerf.logging_config import get_logger
 
 _log = get_logger("contests.contest_service")
@@ -28,61 +30,10 @@ _FETCH_TIMEOUT = 25
 _CACHE_MAX_AGE_SEC = 3600  # 1 hour
 _CUSTOM_SOURCE_TIMEOUT = 15
 _ALLOWED_URL_SCHEMES = ("http://", "https://")
-_MONTH_NAMES = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
-                "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
-
-_cached_result: list[dict[str, Any]] | None = None
-_cached_time: float = 0
-
-
-def _parse_z_date(s: str) -> str | None:
-    """Parse '1500Z, Dec 27' or 'Dec 27' or '1500Z, Dec 27, 2025' into ISO start_utc date."""
-    s = (s or "").strip()
-    # Try "HHMMZ, Mon DD, YYYY" or "HHMMZ, Mon DD"
-    m = re.search(
-        r"(?:(\d{4})Z?,?\s*)?(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:,\s*(\d{4}))?",
-        s,
-        re.I,
-    )
-    if not m:
-        return None
-    _, mon, day, year = m.groups()
-    year = year or str(datetime.now(timezone.utc).year)
-    try:
-        mo = _MONTH_NAMES.get(mon[:3].capitalize())
-        if mo is None:
-            return None
-        return f"{year}-{mo:02d}-{int(day):02d}T00:00:00Z"
-    except (ValueError, TypeError):
-        return None
-
-
-def _parse_date_range_in_text(text: str) -> tuple[str | None, str | None]:
-    """Find first date range like '1500Z, Dec 27 to 1500Z, Dec 28' or 'Dec 27 to Dec 28'."""
-    text = (text or "").replace("\n", " ")
-    # "to" or "-" between two dates
-    m = re.search(
-        r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:,\s*(\d{4}))?\s*(?:to|-)\s*"
-        r"(?:(\d{4})Z?,?\s*)?(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:,\s*(\d{4}))?",
-        text,
-        re.I,
-    )
-    if not m:
-        start_utc = _parse_z_date(text)
-        return (start_utc, start_utc)
-    smon, sday, syear, _, emon, eday, eyear = m.groups()
-    syear = syear or eyear or str(datetime.now(timezone.utc).year)
-    eyear = eyear or syear
-    try:
-        sm = _MONTH_NAMES.get(smon[:3].capitalize())
-        em = _MONTH_NAMES.get(emon[:3].capitalize())
-        if sm is None or em is None:
-            return (_parse_z_date(text), None)
-        start_utc = f"{syear}-{sm:02d}-{int(sday):02d}T00:00:00Z"
-        end_utc = f"{eyear}-{em:02d}-{int(eday):02d}T23:59:59Z"
-        return (start_utc, end_utc)
-    except (ValueError, TypeError):
-        return (_parse_z_date(text), None)
+_VEVENT_SPLIT_RE = re.compile(r"BEGIN:VEVENT\s*", re.I)
+_VEVENT_END_RE = re.compile(r"\s*END:VEVENT", re.I)
+
+_index_time: float = 0
 
 
 def _fetch_wa7bnm_rss() -> list[dict[str, Any]]:
@@ -109,7 +60,7 @@ def _fetch_wa7bnm_rss() -> list[dict[str, Any]]:
                 published = ""
         if not title:
             continue
-        start_utc, end_utc = _parse_date_range_in_text(summary)
+        start_utc, end_utc = parse_date_range_in_text(summary)
         if not start_utc and published:
             start_utc = published[:10] + "T00:00:00Z" if len(published) >= 10 else ""
         if not end_utc:
@@ -128,9 +79,9 @@ def _fetch_wa7bnm_rss() -> list[dict[str, Any]]:
 def _parse_ics_events(ics_text: str, source_label: str) -> list[dict[str, Any]]:
     """Parse iCalendar text for VEVENTs; return list of contest dicts (title, start_utc, end_utc, url, source)."""
     result: list[dict[str, Any]] = []
-    event_blocks = re.split(r"BEGIN:VEVENT\s*", ics_text, flags=re.I)
+    event_blocks = _VEVENT_SPLIT_RE.split(ics_text)
     for block in event_blocks[1:]:
-        end_m = re.search(r"\s*END:VEVENT", block, re.I)
+        end_m = _VEVENT_END_RE.search(block)
         if end_m:
             block = block[:end_m.start()]
         lines = block.replace("\r\n", "\n").replace("\r", "\n").split("\n")
@@ -159,18 +110,8 @@ def _parse_ics_events(ics_text: str, source_label: str) -> list[dict[str, Any]]:
                 desc = value[:200]
         if not summary:
             continue
-        start_utc = ""
-        end_utc = ""
-        dtstart = re.sub(r"[^0-9TZ]", "", dtstart)
-        dtend = re.sub(r"[^0-9TZ]", "", dtend)
-        if len(dtstart) >= 15 and "T" in dtstart:
-            start_utc = dtstart if dtstart.endswith("Z") else dtstart + "Z"
-        elif len(dtstart) >= 8:
-            start_utc = dtstart[:4] + "-" + dtstart[4:6] + "-" + dtstart[6:8] + "T00:00:00Z"
-        if len(dtend) >= 15 and "T" in dtend:
-            end_utc = dtend if dtend.endswith("Z") else dtend + "Z"
-        elif len(dtend) >= 8:
-            end_utc = dtend[:4] + "-" + dtend[4:6] + "-" + dtend[6:8] + "T23:59:59Z"
+        start_utc = ics_date_to_iso(dtstart)
+        end_utc = ics_date_to_iso(dtend, end_of_day=True)
         if not end_utc and start_utc:
             end_utc = start_utc
         result.append({
@@ -219,7 +160,7 @@ def _fetch_rss_generic(url: str, source_label: str) -> list[dict[str, Any]]:
                 published = ""
         if not title:
             continue
-        start_utc, end_utc = _parse_date_range_in_text(summary)
+        start_utc, end_utc = parse_date_range_in_text(summary)
         if not start_utc and published:
             start_utc = published[:10] + "T00:00:00Z" if len(published) >= 10 else ""
         if not end_utc:
@@ -304,31 +245,42 @@ def _normalize_title(title: str) -> str:
     return (title or "").strip().upper()[:80]
 
 
-def _deduplicate_and_merge(sourced_lists: list[tuple[str, list[dict[str, Any]]]]) -> list[dict[str, Any]]:
-    """Merge contest lists. Deduplicate by (normalized_title, start_date). Combine source labels."""
-    by_key: dict[tuple[str, str], dict[str, Any]] = {}
-    for source_label, items in sourced_lists:
-        for d in items:
-            title_n = _normalize_title(d.get("title") or "")
-            start = (d.get("start_utc") or "")[:10]
-            if not title_n or not start:
-                continue
-            key = (title_n, start)
-            if key in by_key:
-                existing = by_key[key]
-                existing_sources = (existing.get("source") or "").split("; ")
-                if source_label not in existing_sources:
-                    existing_sources.append(source_label)
-                existing["source"] = "; ".join(existing_sources)
-                if d.get("url") and not existing.get("url"):
-                    existing["url"] = d["url"]
-                if d.get("info") and len(d.get("info") or "") > len(existing.get("info") or ""):
-                    existing["info"] = d["info"]
-            else:
-                rec = dict(d)
-                rec["source"] = source_label
-                by_key[key] = rec
-    return list(by_key.values())
+def _merge_contest_fields(existing: dict[str, Any], d: dict[str, Any]) -> None:
+    """Duplicate policy: fill a missing url, keep the longer info."""
+    if d.get("url") and not existing.get("url"):
+        existing["url"] = d["url"]
+    if d.get("info") and len(d.get("info") or "") > len(existing.get("info") or ""):
+        existing["info"] = d["info"]
+
+
+# Built-in sources in merge order; labels are the source IDs used by enabled_sources.
+_BUILTIN_SOURCES = (
+    ("WA7BNM", _fetch_wa7bnm_rss),
+    ("WA7BNM iCal", _fetch_wa7bnm_ical),
+    ("SSA (SE)", _fetch_ssa_rss),
+    ("SSA (SE) iCal", _fetch_ssa_ical),
+    ("RSGB (UK)", _fetch_rsgb_ical),
+)
+
+# Deduplicated by (normalized_title, start_date); survives refreshes so only changed entries are re-merged.
+_index = EventMergeIndex(
+    lambda d: _normalize_title(d.get("title") or ""),
+    _merge_contest_fields,
+    "title",
+    source_order=[label for label, _ in _BUILTIN_SOURCES],
+)
+
+
+def _refresh_builtin_sources() -> None:
+    """Fetch every built-in source and apply it to the index. A failed source keeps its last good items."""
+    for label, fetch in _BUILTIN_SOURCES:
+        try:
+            items = fetch()
+        except Exception as e:
+            _log.debug("Contests %s failed: %s", label, e)
+            continue
+        changed = _index.apply_source(label, items)
+        _log.debug("Contests: %s %d (%d changed)", label, len(items), changed)
 
 
 def get_contests_cached(
@@ -341,53 +293,16 @@ def get_contests_cached(
     custom_sources: list of { "url", "type" ("rss"|"ical"), "label" (optional) }. Only http/https URLs are fetched.
     Each item: title, start_utc, end_utc, url, info, source. Deduplicated by title + start date.
     """
-    global _cached_result, _cached_time
+    global _index_time
     now = time.time()
-    if _cached_result is not None and (now - _cached_time) < _CACHE_MAX_AGE_SEC:
-        result = list(_cached_result)
-    else:
-        sourced: list[tuple[str, list[dict[str, Any]]]] = []
-        try:
-            rss_list = _fetch_wa7bnm_rss()
-            sourced.append(("WA7BNM", rss_list))
-            _log.debug("Contests: WA7BNM RSS %d", len(rss_list))
-        except Exception as e:
-            _log.debug("Contests WA7BNM RSS failed: %s", e)
-        try:
-            ical_list = _fetch_wa7bnm_ical()
-            if ical_list:
-                sourced.append(("WA7BNM iCal", ical_list))
-                _log.debug("Contests: WA7BNM iCal %d", len(ical_list))
-        except Exception as e:
-            _log.debug("Contests WA7BNM iCal failed: %s", e)
-        try:
-            ssa_rss = _fetch_ssa_rss()
-            if ssa_rss:
-                sourced.append(("SSA (SE)", ssa_rss))
-                _log.debug("Contests: SSA RSS %d", len(ssa_rss))
-        except Exception as e:
-            _log.debug("Contests SSA RSS failed: %s", e)
-        try:
-            ssa_ical = _fetch_ssa_ical()
-            if ssa_ical:
-                sourced.append(("SSA (SE) iCal", ssa_ical))
-                _log.debug("Contests: SSA iCal %d", len(ssa_ical))
-        except Exception as e:
-            _log.debug("Contests SSA iCal failed: %s", e)
-        try:
-            rsgb_ical = _fetch_rsgb_ical()
-            if rsgb_ical:
-                sourced.append(("RSGB (UK)", rsgb_ical))
-                _log.debug("Contests: RSGB iCal %d", len(rsgb_ical))
-        except Exception as e:
-            _log.debug("Contests RSGB iCal failed: %s", e)
-        merged = _deduplicate_and_merge(sourced)
-        cutoff = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-        _cached_result = [d for d in merged if (d.get("end_utc") or "") >= cutoff]
-        _cached_result.sort(key=lambda d: (d.get("start_utc") or "", d.get("title") or ""))
-        _cached_time = now
-        _log.debug("Contests: merged %d after dedup, %d future/active", len(merged), len(_cached_result))
-        result = list(_cached_result)
+    if _index_time == 0 or (now - _index_time) >= _CACHE_MAX_AGE_SEC:
+        _refresh_builtin_sources()
+        _index_time = now
+    cutoff = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    expired = _index.expire(cutoff)
+    result = _index.entries()
+    if expired:
+        _log.debug("Contests: expired %d past, %d future/active", expired, len(result))
     if enabled_sources is not None:
         allowed = set(enabled_sources)
         result = [
@@ -409,10 +324,6 @@ def get_contests_cached(
                 lab = (label or "").strip() or _label_from_url(url)
                 custom_sourced.append((lab, items))
         if custom_sourced:
-            # Present built-in result as single-source pairs so dedup can merge with custom
-            builtin_pairs = [((d.get("source") or "?").split(";")[0].strip() or "Built-in", [d]) for d in result]
-            result = _deduplicate_and_merge(builtin_pairs + custom_sourced)
-            cutoff = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-            result = [d for d in result if (d.get("end_utc") or "") >= cutoff]
-            result.sort(key=lambda d: (d.get("start_utc") or "", d.get("title") or ""))
-    return result
+            # Overlay onto the merged built-in list without re-merging or re-sorting it
+            return _index.overlay(result, custom_sourced, cutoff)
+    return list(result)
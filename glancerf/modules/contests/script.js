@@ -28,6 +28,10 @@
         return (cellKey && allSettings[cellKey]) ? allSettings[cellKey] : {};
     }
 
+    function cellId(cell) {
+        return cell.getAttribute('data-row') + '_' + cell.getAttribute('data-col');
+    }
+
     function setState(cell, state) {
         cell.classList.remove('contests_state_empty', 'contests_state_loading', 'contests_state_error');
         if (state) cell.classList.add('contests_state_' + state);
@@ -67,53 +71,57 @@
             customList = customList.filter(function(c) { return c && (c.url || c.URL); });
             if (customList.length) params.push('custom_sources=' + encodeURIComponent(JSON.stringify(customList)));
         }
-        var query = params.length ? '?' + params.join('&') : '';
-        fetch('/api/contests/list' + query)
-            .then(function(r) { return r.json(); })
-            .then(function(data) {
-                setState(cell, '');
-                if (errorEl) errorEl.textContent = '';
-                if (data.error) {
-                    if (errorEl) errorEl.textContent = data.error;
-                    setState(cell, 'error');
-                    return;
-                }
-                var contests = (data.contests && Array.isArray(data.contests)) ? data.contests : [];
-                var credits = data.credits || '';
-
-                if (creditsEl) creditsEl.textContent = credits;
-
-                if (contests.length === 0) {
-                    if (emptyEl) emptyEl.textContent = 'No contests listed.';
-                    setState(cell, 'empty');
-                    listEl.innerHTML = '';
-                    return;
-                }
-
-                listEl.innerHTML = '';
-                var slice = contests.slice(0, maxEntries);
-                slice.forEach(function(d) {
-                    var item = document.createElement('div');
-                    item.className = 'contests_item';
-                    var title = (d.title || '').trim();
-                    var url = (d.url || '').trim();
-                    var dates = formatDateRange(d.start_utc, d.end_utc);
-                    var info = (d.info || '').trim();
-                    var source = (d.source || '').trim();
-                    var titleHtml = url ? '<a href="' + url.replace(/"/g, '&quot;') + '" target="_blank" rel="noopener">' + title + '</a>' : title;
-                    item.innerHTML =
-                        '<span class="contests_name">' + titleHtml + '</span>' +
-                        (source ? ' <span class="contests_source" title="Source">[' + source + ']</span>' : '') +
-                        '<br><span class="contests_dates">' + dates + '</span>' +
-                        (info ? '<br><span class="contests_info">' + info.substring(0, 80) + (info.length > 80 ? '...' : '') + '</span>' : '');
-                    listEl.appendChild(item);
-                });
-            })
-            .catch(function() {
+        // Server pages and trims the list so the cell only downloads what it shows
+        params.push('limit=' + maxEntries);
+        params.push('info_chars=80');
+        var query = '?' + params.join('&');
+        // Pushed by the server data bus (shared by every display); falls back to polling
+        GlanceRFData.watch('contests_' + cellId(cell), '/api/contests/list' + query, UPDATE_MS, function(result) {
+            var data = result.data || {};
+            if (result.status === 0) {
                 setState(cell, 'error');
                 if (errorEl) errorEl.textContent = 'Failed to load contests.';
                 listEl.innerHTML = '';
+                return;
+            }
+            setState(cell, '');
+            if (errorEl) errorEl.textContent = '';
+            if (data.error) {
+                if (errorEl) errorEl.textContent = data.error;
+                setState(cell, 'error');
+                return;
+            }
+            var contests = (data.contests && Array.isArray(data.contests)) ? data.contests : [];
+            var credits = data.credits || '';
+
+            if (creditsEl) creditsEl.textContent = credits;
+
+            if (contests.length === 0) {
+                if (emptyEl) emptyEl.textContent = 'No contests listed.';
+                setState(cell, 'empty');
+                listEl.innerHTML = '';
+                return;
+            }
+
+            listEl.innerHTML = '';
+            var slice = contests.slice(0, maxEntries);
+            slice.forEach(function(d) {
+                var item = document.createElement('div');
+                item.className = 'contests_item';
+                var title = (d.title || '').trim();
+                var url = (d.url || '').trim();
+                var dates = formatDateRange(d.start_utc, d.end_utc);
+                var info = (d.info || '').trim();
+                var source = (d.source || '').trim();
+                var titleHtml = url ? '<a href="' + url.replace(/"/g, '&quot;') + '" target="_blank" rel="noopener">' + title + '</a>' : title;
+                item.innerHTML =
+                    '<span class="contests_name">' + titleHtml + '</span>' +
+                    (source ? ' <span class="contests_source" title="Source">[' + source + ']</span>' : '') +
+                    '<br><span class="contests_dates">' + dates + '</span>' +
+                    (info ? '<br><span class="contests_info">' + info.substring(0, 80) + (info.length > 80 ? '...' : '') + '</span>' : '');
+                listEl.appendChild(item);
             });
+        });
     }
 
     function run() {
@@ -123,5 +131,4 @@
     }
 
     run();
-    setInterval(run, UPDATE_MS);
 })();
@@ -4,11 +4,15 @@ Register dxpeditions API routes. Called by core at startup if this module is pre
 
 import asyncio
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.responses import JSONResponse
 
+from glancerf.data_bus import register_data_source
+from glancerf.event_index import query_events
+from glancerf.lazy_import import lazy_import
 from glancerf.logging_config import get_logger
-from .dxpedition_service import get_dxpeditions_cached
+
+dxpedition_service = lazy_import(".dxpedition_service", __package__)
 
 _log = get_logger("dxpeditions.api_routes")
 
@@ -17,10 +21,24 @@ _DEFAULT_CREDITS = "NG3K ADXO; NG3K RSS; DXCAL (danplanet.com)"
 
 def register_routes(app: FastAPI) -> None:
     """Register GET /api/dxpeditions/list."""
+    register_data_source("/api/dxpeditions/list", min_interval_sec=60)
 
     @app.get("/api/dxpeditions/list")
-    async def get_dxpeditions_list(sources: str | None = None):
-        """Return list of DXpeditions. Optional query param sources: comma-separated source IDs to enable."""
+    async def get_dxpeditions_list(
+        sources: str | None = None,
+        within_days: float | None = Query(None, ge=0, le=3660),
+        active: bool = False,
+        offset: int = Query(0, ge=0),
+        limit: int | None = Query(None, ge=1, le=1000),
+        fields: str | None = None,
+        info_chars: int | None = Query(None, ge=0, le=1000),
+    ):
+        """
+        Return list of DXpeditions. Optional query param sources: comma-separated source IDs to enable.
+        within_days: only DXpeditions running now or starting within N days. active: only those running now.
+        offset/limit: page the (start-sorted) list; total is the count before paging.
+        fields: comma-separated keys to return per entry. info_chars: truncate info to N characters.
+        """
         _log.debug("API: GET /api/dxpeditions/list")
         if sources is None:
             enabled = None
@@ -28,9 +46,19 @@ def register_routes(app: FastAPI) -> None:
             enabled = [s.strip() for s in sources.split(",") if s.strip()]
         credits = "; ".join(enabled) if enabled else _DEFAULT_CREDITS
         try:
-            result = await asyncio.to_thread(get_dxpeditions_cached, enabled_sources=enabled)
+            result = await asyncio.to_thread(dxpedition_service.deferred("get_dxpeditions_cached"), enabled_sources=enabled)
+            items, total = query_events(
+                result,
+                within_days=within_days,
+                active_only=active,
+                offset=offset,
+                limit=limit,
+                fields=fields.split(",") if fields else None,
+                info_chars=info_chars,
+            )
             return {
-                "dxpeditions": result,
+                "dxpeditions": items,
+                "total": total,
                 "credits": credits,
             }
         except Exception as e:
@@ -12,6 +12,8 @@ from typing import Any
 import feedparser
 import httpx
 
+from glancerf.date_parsing import ics_date_to_iso, is_range_line_start, parse_date_range
+from glancerf.event_index import EventMergeIndex
 from glancerf.logging_config import get_logger
 
 _log = get_logger("dxpeditions.dxpedition_service")
@@ -21,11 +23,14 @@ _NG3K_RSS_URL = "http://www.ng3k.com/adxo.xml"
 _DXCAL_ICS_URL = "https://www.danplanet.com/dxcal.ics"
 _FETCH_TIMEOUT = 20
 _CACHE_MAX_AGE_SEC = 21600  # 6 hours
-_MONTH_NAMES = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
-                "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
+_VEVENT_SPLIT_RE = re.compile(r"BEGIN:VEVENT\s*", re.I)
+_VEVENT_END_RE = re.compile(r"\s*END:VEVENT", re.I)
+_CONTEST_LINK_RE = re.compile(r"^\[.*\]\s*\(.*Contest", re.I)
+_CALL_LINK_RE = re.compile(r"\[([^\]]*)\]\(([^)]+)\)")
+_NEW_TAG_RE = re.compile(r"!?\[NEW[^\]]*\]")
+_SOURCE_RE = re.compile(r"Source:\s*[^\s].{0,80}", re.I)
 
-_cached_result: list[dict[str, Any]] | None = None
-_cached_time: float = 0
+_index_time: float = 0
 
 
 def _strip_html(raw: str) -> str:
@@ -39,31 +44,6 @@ def _strip_html(raw: str) -> str:
     return text.strip()
 
 
-def _parse_date_range(s: str) -> tuple[str | None, str | None]:
-    """Parse 'Nov 20-Dec 31, 2025' or 'Dec 7, 2025-Jan 5, 2026' into (start_iso, end_iso)."""
-    s = s.strip()
-    m = re.search(
-        r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:,\s*(\d{4}))?\s*-\s*"
-        r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),\s*(\d{4})",
-        s,
-        re.I,
-    )
-    if not m:
-        return None, None
-    smon, sday, syear, emon, eday, eyear = m.groups()
-    syear = syear or eyear
-    try:
-        sm = _MONTH_NAMES.get(smon[:3].capitalize())
-        em = _MONTH_NAMES.get(emon[:3].capitalize())
-        if sm is None or em is None:
-            return None, None
-        start_d = datetime(int(syear), sm, int(sday), 0, 0, 0, tzinfo=timezone.utc)
-        end_d = datetime(int(eyear), em, int(eday), 23, 59, 59, tzinfo=timezone.utc)
-        return start_d.isoformat().replace("+00:00", "Z"), end_d.isoformat().replace("+00:00", "Z")
-    except (ValueError, TypeError):
-        return None, None
-
-
 def _parse_blocks(plain: str, source: str) -> list[dict[str, Any]]:
     """Parse NG3K plain text into list of expedition dicts with source tag."""
     lines = [ln.strip() for ln in plain.splitlines() if ln.strip()]
@@ -74,10 +54,10 @@ def _parse_blocks(plain: str, source: str) -> list[dict[str, Any]]:
         if "Contest" in line and "Check here" in line:
             i += 1
             continue
-        if re.match(r"^\[.*\]\s*\(.*Contest", line, re.I):
+        if line[:1] == "[" and _CONTEST_LINK_RE.match(line):
             i += 1
             continue
-        start_utc, end_utc = _parse_date_range(line)
+        start_utc, end_utc = parse_date_range(line)
         if start_utc is None:
             i += 1
             continue
@@ -88,25 +68,21 @@ def _parse_blocks(plain: str, source: str) -> list[dict[str, Any]]:
         i += 1
         while i < len(lines):
             cur = lines[i]
-            if re.match(
-                r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}(?:,\s*\d{4})?\s*-\s*",
-                cur,
-                re.I,
-            ):
+            if is_range_line_start(cur):
                 break
             if cur.startswith("DXCC:"):
                 location = cur.replace("DXCC:", "").strip()
             elif cur.startswith("Callsign:"):
                 call_part = cur.replace("Callsign:", "").strip()
-                call_part = re.sub(r"\*\*", "", call_part)
-                link = re.search(r"\[([^\]]*)\]\(([^)]+)\)", call_part)
+                call_part = call_part.replace("**", "")
+                link = _CALL_LINK_RE.search(call_part)
                 if link:
                     call = (link.group(1) or "").strip()
                     url = (link.group(2) or "").strip()
                     if url and not url.startswith("http"):
                         url = "https://www.ng3k.com/Misc/" + url.lstrip("/")
                 else:
-                    call = re.sub(r"!?\[NEW[^\]]*\]", "", call_part).strip()
+                    call = _NEW_TAG_RE.sub("", call_part).strip()
             elif cur.startswith("Info:"):
                 info = cur.replace("Info:", "").strip()[:200]
             i += 1
@@ -158,16 +134,10 @@ def _fetch_ng3k_rss() -> list[dict[str, Any]]:
             continue
         start_utc = published[:10] + "T00:00:00Z" if len(published) >= 10 else ""
         end_utc = published[:10] + "T23:59:59Z" if len(published) >= 10 else ""
-        date_m = re.search(
-            r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:,\s*(\d{4}))?\s*-\s*"
-            r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),\s*(\d{4})",
-            summary,
-            re.I,
-        )
-        if date_m:
-            start_utc, end_utc = _parse_date_range(date_m.group(0))
-            start_utc = start_utc or ""
-            end_utc = end_utc or ""
+        range_start, range_end = parse_date_range(summary)
+        if range_start:
+            start_utc = range_start
+            end_utc = range_end or ""
         call = title
         location = ""
         info_bits: list[str] = []
@@ -181,7 +151,7 @@ def _fetch_ng3k_rss() -> list[dict[str, Any]]:
             if len(segments) >= 3:
                 info_bits.append(segments[2])
         summary_clean = _strip_html(summary) if summary else ""
-        source_m = re.search(r"Source:\s*[^\s].{0,80}", summary_clean, re.I) if summary_clean else None
+        source_m = _SOURCE_RE.search(summary_clean) if summary_clean else None
         if source_m:
             info_bits.append(source_m.group(0).strip())
         info = " -- ".join(info_bits)[:120] if info_bits else ""
@@ -200,9 +170,9 @@ def _fetch_ng3k_rss() -> list[dict[str, Any]]:
 def _parse_ics_events(ics_text: str) -> list[dict[str, Any]]:
     """Parse iCalendar text for VEVENTs; return list of expedition dicts with source DXCAL."""
     result: list[dict[str, Any]] = []
-    event_blocks = re.split(r"BEGIN:VEVENT\s*", ics_text, flags=re.I)
+    event_blocks = _VEVENT_SPLIT_RE.split(ics_text)
     for block in event_blocks[1:]:
-        end_m = re.search(r"\s*END:VEVENT", block, re.I)
+        end_m = _VEVENT_END_RE.search(block)
         if end_m:
             block = block[:end_m.start()]
         lines = block.replace("\r\n", "\n").replace("\r", "\n").split("\n")
@@ -231,18 +201,8 @@ def _parse_ics_events(ics_text: str) -> list[dict[str, Any]]:
                 desc = value[:200]
         if not summary:
             continue
-        start_utc = ""
-        end_utc = ""
-        dtstart = re.sub(r"[^0-9TZ]", "", dtstart)
-        dtend = re.sub(r"[^0-9TZ]", "", dtend)
-        if len(dtstart) >= 15 and "T" in dtstart:
-            start_utc = dtstart if dtstart.endswith("Z") else dtstart + "Z"
-        elif len(dtstart) >= 8:
-            start_utc = dtstart[:4] + "-" + dtstart[4:6] + "-" + dtstart[6:8] + "T00:00:00Z"
-        if len(dtend) >= 15 and "T" in dtend:
-            end_utc = dtend if dtend.endswith("Z") else dtend + "Z"
-        elif len(dtend) >= 8:
-            end_utc = dtend[:4] + "-" + dtend[4:6] + "-" + dtend[6:8] + "T23:59:59Z"
+        start_utc = ics_date_to_iso(dtstart)
+        end_utc = ics_date_to_iso(dtend, end_of_day=True)
         if not end_utc and start_utc:
             end_utc = start_utc
         call = summary
@@ -278,35 +238,42 @@ def _normalize_call(call: str) -> str:
     return (call or "").upper().strip()
 
 
-def _deduplicate_and_merge(sourced_lists: list[tuple[str, list[dict[str, Any]]]]) -> list[dict[str, Any]]:
-    """
-    Merge lists from multiple sources. Deduplicate by (normalized_call, start_date).
-    When duplicate: keep entry with more info (url, info), combine source labels.
-    """
-    by_key: dict[tuple[str, str], dict[str, Any]] = {}
-    for source_label, items in sourced_lists:
-        for d in items:
-            call_n = _normalize_call(d.get("call") or "")
-            start = (d.get("start_utc") or "")[:10]
-            if not call_n or not start:
-                continue
-            key = (call_n, start)
-            if key in by_key:
-                existing = by_key[key]
-                existing_sources = (existing.get("source") or "").split("; ")
-                if source_label not in existing_sources:
-                    existing_sources.append(source_label)
-                existing["source"] = "; ".join(existing_sources)
-                if (d.get("url") and not existing.get("url")) or (d.get("info") and len(d.get("info") or "") > len(existing.get("info") or "")):
-                    if d.get("url"):
-                        existing["url"] = d["url"]
-                    if d.get("info") and len(d.get("info") or "") > len(existing.get("info") or ""):
-                        existing["info"] = d["info"]
-            else:
-                rec = dict(d)
-                rec["source"] = source_label
-                by_key[key] = rec
-    return list(by_key.values())
+def _merge_dxpedition_fields(existing: dict[str, Any], d: dict[str, Any]) -> None:
+    """Duplicate policy: keep entry with more info (url, info)."""
+    longer_info = bool(d.get("info")) and len(d.get("info") or "") > len(existing.get("info") or "")
+    if (d.get("url") and not existing.get("url")) or longer_info:
+        if d.get("url"):
+            existing["url"] = d["url"]
+        if longer_info:
+            existing["info"] = d["info"]
+
+
+# Sources in merge order; labels are the source IDs used by enabled_sources.
+_SOURCES = (
+    ("NG3K", _fetch_ng3k_plain),
+    ("NG3K RSS", _fetch_ng3k_rss),
+    ("DXCAL", _fetch_dxcal_ics),
+)
+
+# Deduplicated by (normalized_call, start_date); survives refreshes so only changed entries are re-merged.
+_index = EventMergeIndex(
+    lambda d: _normalize_call(d.get("call") or ""),
+    _merge_dxpedition_fields,
+    "call",
+    source_order=[label for label, _ in _SOURCES],
+)
+
+
+def _refresh_sources() -> None:
+    """Fetch every source and apply it to the index. A failed source keeps its last good items."""
+    for label, fetch in _SOURCES:
+        try:
+            items = fetch()
+        except Exception as e:
+            _log.debug("DXpeditions %s failed: %s", label, e)
+            continue
+        changed = _index.apply_source(label, items)
+        _log.debug("DXpeditions: %s %d (%d changed)", label, len(items), changed)
 
 
 def get_dxpeditions_cached(
@@ -318,40 +285,18 @@ def get_dxpeditions_cached(
     Each item: start_utc, end_utc, location, call, url, info, source.
     Deduplicated by call + start date; source field lists which sources reported it.
     """
-    global _cached_result, _cached_time
+    global _index_time
     now = time.time()
-    if _cached_result is not None and (now - _cached_time) < _CACHE_MAX_AGE_SEC:
-        result = _cached_result
-    else:
-        sourced: list[tuple[str, list[dict[str, Any]]]] = []
-        try:
-            ng3k = _fetch_ng3k_plain()
-            sourced.append(("NG3K", ng3k))
-            _log.debug("DXpeditions: NG3K plain %d", len(ng3k))
-        except Exception as e:
-            _log.debug("DXpeditions NG3K plain failed: %s", e)
-        try:
-            ng3k_rss = _fetch_ng3k_rss()
-            sourced.append(("NG3K RSS", ng3k_rss))
-            _log.debug("DXpeditions: NG3K RSS %d", len(ng3k_rss))
-        except Exception as e:
-            _log.debug("DXpeditions NG3K RSS failed: %s", e)
-        try:
-            dxcal = _fetch_dxcal_ics()
-            sourced.append(("DXCAL", dxcal))
-            _log.debug("DXpeditions: DXCAL %d", len(dxcal))
-        except Exception as e:
-            _log.debug("DXpeditions DXCAL failed: %s", e)
-        merged = _deduplicate_and_merge(sourced)
-        cutoff = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-        _cached_result = [d for d in merged if (d.get("end_utc") or "") >= cutoff]
-        _cached_result.sort(key=lambda d: (d.get("start_utc") or "", d.get("call") or ""))
-        _cached_time = now
-        result = _cached_result
+    if _index_time == 0 or (now - _index_time) >= _CACHE_MAX_AGE_SEC:
+        _refresh_sources()
+        _index_time = now
+    cutoff = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    _index.expire(cutoff)
+    result = _index.entries()
     if enabled_sources is not None:
         allowed = set(enabled_sources)
         result = [
             d for d in result
             if allowed.intersection((s.strip() for s in (d.get("source") or "").split(";")))
         ]
-    return result
+    return list(result)
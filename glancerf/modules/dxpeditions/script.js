@@ -37,6 +37,10 @@
         return (cellKey && allSettings[cellKey]) ? allSettings[cellKey] : {};
     }
 
+    function cellId(cell) {
+        return cell.getAttribute('data-row') + '_' + cell.getAttribute('data-col');
+    }
+
     function setState(cell, state) {
         cell.classList.remove('dxpeditions_state_empty', 'dxpeditions_state_loading', 'dxpeditions_state_error');
         if (state) cell.classList.add('dxpeditions_state_' + state);
@@ -61,7 +65,7 @@
             var n = parseInt(settings.max_entries, 10);
             if (n > 0 && n <= 50) maxEntries = n;
         } catch (e) {}
-        var sourcesParam = '';
+        var query = '?limit=' + maxEntries;
         var validDxSources = ['NG3K', 'NG3K RSS', 'DXCAL'];
         var enabledSources = settings.enabled_sources;
         if (enabledSources !== undefined && enabledSources !== null && enabledSources !== '') {
@@ -70,58 +74,59 @@
             }()) : (Array.isArray(enabledSources) ? enabledSources : []);
             var allowed = ids.filter(function(id) { return validDxSources.indexOf(id) >= 0; });
             if (allowed.length > 0) {
-                sourcesParam = '?sources=' + encodeURIComponent(allowed.join(','));
+                query += '&sources=' + encodeURIComponent(allowed.join(','));
             }
         }
-        fetch('/api/dxpeditions/list' + sourcesParam)
-            .then(function(r) { return r.json(); })
-            .then(function(data) {
-                setState(cell, '');
-                if (errorEl) errorEl.textContent = '';
-                if (data.error) {
-                    if (errorEl) errorEl.textContent = data.error;
-                    setState(cell, 'error');
-                    if (emptyEl) emptyEl.style.display = 'none';
-                    return;
-                }
-                var dxpeds = (data.dxpeditions && Array.isArray(data.dxpeditions)) ? data.dxpeditions : [];
-                var credits = data.credits || '';
-
-                if (creditsEl) creditsEl.textContent = credits;
-
-                if (dxpeds.length === 0) {
-                    if (emptyEl) emptyEl.textContent = 'No DXpeditions listed.';
-                    setState(cell, 'empty');
-                    listEl.innerHTML = '';
-                    return;
-                }
-
-                listEl.innerHTML = '';
-                var slice = dxpeds.slice(0, maxEntries);
-                slice.forEach(function(d) {
-                    var item = document.createElement('div');
-                    item.className = 'dxpeditions_item';
-                    var call = (d.call || '').trim();
-                    var url = (d.url || '').trim();
-                    var loc = (d.location || '').trim();
-                    var dates = formatDateRange(d.start_utc, d.end_utc);
-                    var info = (d.info || '').trim();
-                    var source = (d.source || '').trim();
-                    var callHtml = url ? '<a href="' + url.replace(/"/g, '&quot;') + '" target="_blank" rel="noopener">' + call + '</a>' : call;
-                    item.innerHTML =
-                        '<span class="dxpeditions_call">' + callHtml + '</span>' +
-                        (loc ? ' <span class="dxpeditions_location">' + loc + '</span>' : '') +
-                        (source ? ' <span class="dxpeditions_source" title="Source">[' + source + ']</span>' : '') +
-                        '<br><span class="dxpeditions_dates">' + dates + '</span>' +
-                        (info ? '<br><span class="dxpeditions_info">' + escapeHtml(info) + '</span>' : '');
-                    listEl.appendChild(item);
-                });
-            })
-            .catch(function() {
+        // Pushed by the server data bus (shared by every display); falls back to polling
+        GlanceRFData.watch('dxpeditions_' + cellId(cell), '/api/dxpeditions/list' + query, UPDATE_MS, function(result) {
+            var data = result.data || {};
+            if (result.status === 0) {
                 setState(cell, 'error');
                 if (errorEl) errorEl.textContent = 'Failed to load DXpeditions.';
                 listEl.innerHTML = '';
+                return;
+            }
+            setState(cell, '');
+            if (errorEl) errorEl.textContent = '';
+            if (data.error) {
+                if (errorEl) errorEl.textContent = data.error;
+                setState(cell, 'error');
+                if (emptyEl) emptyEl.style.display = 'none';
+                return;
+            }
+            var dxpeds = (data.dxpeditions && Array.isArray(data.dxpeditions)) ? data.dxpeditions : [];
+            var credits = data.credits || '';
+
+            if (creditsEl) creditsEl.textContent = credits;
+
+            if (dxpeds.length === 0) {
+                if (emptyEl) emptyEl.textContent = 'No DXpeditions listed.';
+                setState(cell, 'empty');
+                listEl.innerHTML = '';
+                return;
+            }
+
+            listEl.innerHTML = '';
+            var slice = dxpeds.slice(0, maxEntries);
+            slice.forEach(function(d) {
+                var item = document.createElement('div');
+                item.className = 'dxpeditions_item';
+                var call = (d.call || '').trim();
+                var url = (d.url || '').trim();
+                var loc = (d.location || '').trim();
+                var dates = formatDateRange(d.start_utc, d.end_utc);
+                var info = (d.info || '').trim();
+                var source = (d.source || '').trim();
+                var callHtml = url ? '<a href="' + url.replace(/"/g, '&quot;') + '" target="_blank" rel="noopener">' + call + '</a>' : call;
+                item.innerHTML =
+                    '<span class="dxpeditions_call">' + callHtml + '</span>' +
+                    (loc ? ' <span class="dxpeditions_location">' + loc + '</span>' : '') +
+                    (source ? ' <span class="dxpeditions_source" title="Source">[' + source + ']</span>' : '') +
+                    '<br><span class="dxpeditions_dates">' + dates + '</span>' +
+                    (info ? '<br><span class="dxpeditions_info">' + escapeHtml(info) + '</span>' : '');
+                listEl.appendChild(item);
             });
+        });
     }
 
     function run() {
@@ -131,5 +136,4 @@
     }
 
     run();
-    setInterval(run, UPDATE_MS);
 })();
@@ -2,12 +2,15 @@
 
 import asyncio
 
-from fastapi import FastAPI, Query
+from fastapi import Depends, FastAPI, Query
 from fastapi.responses import JSONResponse
 
+from glancerf.lazy_import import lazy_import
 from glancerf.logging_config import get_logger
-from .aprs_client import get_aprs_locations_from_cache
-from .propagation_service import get_propagation_coordinates
+from glancerf.rate_limit import rate_limit
+
+aprs_client = lazy_import(".aprs_client", __package__)
+propagation_service = lazy_import(".propagation_service", __package__)
 
 _log = get_logger("map.api_routes")
 
@@ -15,7 +18,7 @@ _log = get_logger("map.api_routes")
 def register_routes(app: FastAPI) -> None:
     """Register GET /api/map/propagation-data."""
 
-    @app.get("/api/map/propagation-data")
+    @app.get("/api/map/propagation-data", dependencies=[Depends(rate_limit("api"))])
     async def propagation_data(source: str | None = None, hours: float | None = Query(None)):
         """Return propagation coordinates for data-driven overlay. source: kc2g_muf, kc2g_fof2, tropo, or vhf_aprs. For vhf_aprs uses local cache only (no live APRS-IS)."""
         _log.debug("API: GET /api/map/propagation-data source=%s hours=%s", source, hours)
@@ -25,7 +28,7 @@ def register_routes(app: FastAPI) -> None:
                 status_code=400,
             )
         try:
-            result = await asyncio.to_thread(get_propagation_coordinates, source, hours=hours)
+            result = await asyncio.to_thread(propagation_service.deferred("get_propagation_coordinates"), source, hours=hours)
             return result
         except Exception as e:
             _log.debug("Propagation data failed: %s", e)
@@ -39,7 +42,7 @@ def register_routes(app: FastAPI) -> None:
         """Return APRS station locations from local cache only (no live APRS-IS). Data from config_dir/cache/aprs.db."""
         _log.debug("API: GET /api/map/aprs-locations hours=%s (cache only)", hours)
         try:
-            result = await asyncio.to_thread(get_aprs_locations_from_cache, hours=hours)
+            result = await asyncio.to_thread(aprs_client.deferred("get_aprs_locations_from_cache"), hours=hours)
             return result
         except Exception as e:
             _log.debug("APRS locations failed: %s", e)
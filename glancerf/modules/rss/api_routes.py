@@ -2,28 +2,51 @@
 Register RSS API routes. Called by core at startup if this module is present.
 """
 
-import time
+import asyncio
 from urllib.parse import urlparse
 
-import feedparser
 import httpx
-from fastapi import FastAPI, Query
+from fastapi import Depends, FastAPI, Query
 from fastapi.responses import JSONResponse
 
+from glancerf.data_bus import layout_cell_settings, register_data_source
+from glancerf.lazy_import import lazy_import
 from glancerf.logging_config import get_logger
+from glancerf.rate_limit import rate_limit
+
+# feedparser is only imported when a feed is first requested (or rss is in the layout)
+rss_service = lazy_import(".rss_service", __package__)
 
 _log = get_logger("rss.api_routes")
 
-_RSS_MAX_ITEMS = 50
-_RSS_TIMEOUT_SEC = 15
+
+def _start_refresh_if_loaded() -> None:
+    """Startup: refresh layout feeds in the background if rss_service was preloaded for the layout."""
+    if rss_service.loaded:
+        rss_service.start_background_refresh()
+
+
+def _stop_refresh() -> None:
+    if rss_service.loaded:
+        rss_service.stop_background_refresh()
+
+
+def _is_layout_feed(query: dict) -> bool:
+    """Data bus check: only feeds configured in an RSS cell of the layout are pushed."""
+    urls = query.get("url") or [""]
+    configured = {str(ms.get("rss_url") or "").strip() for ms in layout_cell_settings("rss")}
+    return len(urls) == 1 and urls[0].strip() in configured - {""}
 
 
 def register_routes(app: FastAPI) -> None:
-    """Register GET /api/rss."""
+    """Register GET /api/rss (also pushed over the data bus) and the background refresh of feeds used in the layout."""
+    register_data_source("/api/rss", min_interval_sec=60, allow_query=_is_layout_feed)
+    app.add_event_handler("startup", _start_refresh_if_loaded)
+    app.add_event_handler("shutdown", _stop_refresh)
 
-    @app.get("/api/rss")
+    @app.get("/api/rss", dependencies=[Depends(rate_limit("api"))])
     async def get_rss(url: str = Query(..., description="RSS feed URL")):
-        """Fetch and parse an RSS feed, return JSON. Proxies the request to avoid CORS."""
+        """Return a parsed RSS feed as JSON from the shared feed cache. Proxies the request to avoid CORS."""
         _log.debug("API: GET /api/rss url=%s", url[:80] if url else "")
         url = (url or "").strip()
         if not url:
@@ -35,53 +58,21 @@ def register_routes(app: FastAPI) -> None:
             return JSONResponse(
                 {"error": "URL must be http or https"}, status_code=400
             )
+        if not rss_service.loaded:
+            # First use: import feedparser in a worker thread, not on the event loop
+            await asyncio.to_thread(rss_service.load)
         try:
-            async with httpx.AsyncClient(timeout=_RSS_TIMEOUT_SEC) as client:
-                resp = await client.get(url)
-                resp.raise_for_status()
-                body = resp.text
-        except httpx.HTTPError as e:
+            rss_service.start_background_refresh()
+            return await rss_service.get_feed(url)
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
             _log.debug("RSS fetch failed: %s", e)
             return JSONResponse(
                 {"error": "Failed to fetch feed", "detail": str(e)},
                 status_code=502,
             )
-        try:
-            feed = feedparser.parse(body)
-        except Exception as e:
+        except rss_service.FeedParseError as e:
             _log.debug("RSS parse failed: %s", e)
             return JSONResponse(
                 {"error": "Failed to parse feed", "detail": str(e)},
                 status_code=502,
             )
-        title = (feed.feed.get("title") or "").strip() or None
-        link = (feed.feed.get("link") or "").strip() or None
-        items = []
-        for entry in feed.entries[: _RSS_MAX_ITEMS]:
-            entry_title = (entry.get("title") or "").strip() or ""
-            entry_link = (entry.get("link") or "").strip() or ""
-            entry_published = entry.get("published") or entry.get("updated") or ""
-            if not isinstance(entry_published, str):
-                parsed_time = entry.get("published_parsed") or entry.get("updated_parsed")
-                if parsed_time:
-                    entry_published = time.strftime(
-                        "%Y-%m-%dT%H:%M:%S", parsed_time
-                    )
-                else:
-                    entry_published = ""
-            summary = entry.get("summary") or entry.get("description") or ""
-            if hasattr(summary, "strip"):
-                summary = summary.strip()
-            else:
-                summary = str(summary)[:500]
-            items.append({
-                "title": entry_title,
-                "link": entry_link,
-                "published": entry_published,
-                "description": summary[:500] if summary else "",
-            })
-        return {
-            "title": title,
-            "link": link,
-            "items": items,
-        }
@@ -0,0 +1,308 @@
+"""
+RSS/Atom feed cache for the RSS module.
+One cache entry per feed URL (bounded LRU). Concurrent requests for the same URL share one
+upstream fetch, refetches use conditional GET (ETag / Last-Modified), and feeds used by
+cells in the current layout are refreshed in the background so cell requests are served
+from memory. Feed bodies are streamed with a hard byte cap and scanned incrementally, so
+the download stops as soon as the item limit is reached. Module-owned; core is used only
+for config and logging.
+"""
+
+import asyncio
+import time
+import xml.parsers.expat
+from collections import OrderedDict
+from typing import Any
+
+import feedparser
+import httpx
+
+from glancerf.config import get_config
+from glancerf.logging_config import DETAILED_LEVEL, get_logger
+
+_log = get_logger("rss.rss_service")
+
+_MODULE_ID_RSS = "rss"
+_RSS_MAX_ITEMS = 50
+_RSS_TIMEOUT_SEC = 15
+_RSS_MAX_BYTES = 2 * 1024 * 1024
+_CACHE_MAX_FEEDS = 32
+_DEFAULT_MAX_AGE_SEC = 15 * 60  # matches the module's default refresh_min
+_MIN_MAX_AGE_SEC = 60
+_BACKGROUND_INTERVAL_SEC = 60
+
+
+class FeedParseError(Exception):
+    """Raised when a fetched body cannot be parsed as a feed."""
+
+    pass
+
+
+class _FeedEntry:
+    """Cached parsed feed plus the validators needed for a conditional GET."""
+
+    __slots__ = ("data", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, data: dict[str, Any], etag: str | None, last_modified: str | None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+
+
+_cache: "OrderedDict[str, _FeedEntry]" = OrderedDict()
+_inflight: dict[str, asyncio.Task] = {}
+_background_task: asyncio.Task | None = None
+
+
+class _FeedScanner:
+    """
+    Incremental expat scan of a feed body. Records where each <item>/<entry> ends and which
+    elements are still open there, so the body can be cut after the Nth item and closed into a
+    well-formed document. Malformed XML (e.g. HTML entities) just marks the scan unusable.
+    """
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self.buf = bytearray()
+        self.items = 0
+        self.ok = True
+        self.done = False
+        self._cut_index: int | None = None
+        self._closing = b""
+        self._stack: list[str] = []
+        self._parser = xml.parsers.expat.ParserCreate()
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+
+    def feed(self, chunk: bytes) -> None:
+        self.buf += chunk
+        if not self.ok or self.done:
+            return
+        try:
+            self._parser.Parse(chunk, False)
+        except xml.parsers.expat.ExpatError:
+            self.ok = False
+
+    def _start(self, name: str, attrs: dict) -> None:
+        self._stack.append(name)
+
+    def _end(self, name: str) -> None:
+        if self._stack:
+            self._stack.pop()
+        if self.done or name.rsplit(":", 1)[-1] not in ("item", "entry"):
+            return
+        end = self.buf.find(b">", self._parser.CurrentByteIndex)
+        if end < 0:
+            return
+        self.items += 1
+        self._cut_index = end + 1
+        self._closing = "".join(f"</{n}>" for n in reversed(self._stack)).encode("utf-8")
+        if self.items >= self.max_items:
+            self.done = True
+
+    def body(self) -> bytes:
+        """Body for feedparser: cut after the last complete item when the scan allows it, else everything read."""
+        utf16 = self.buf.startswith((b"\xff\xfe", b"\xfe\xff"))
+        if self.ok and self._cut_index is not None and not utf16:
+            return bytes(self.buf[: self._cut_index]) + self._closing
+        return bytes(self.buf)
+
+
+async def _read_feed_body(resp: httpx.Response, url: str) -> bytes:
+    """Stream the response body up to _RSS_MAX_BYTES, stopping once _RSS_MAX_ITEMS items have been seen."""
+    scanner = _FeedScanner(_RSS_MAX_ITEMS)
+    truncated = False
+    async for chunk in resp.aiter_bytes():
+        scanner.feed(chunk)
+        if scanner.done:
+            truncated = True
+            break
+        if len(scanner.buf) >= _RSS_MAX_BYTES:
+            truncated = True
+            break
+    if not truncated:
+        return bytes(scanner.buf)
+    # Content-Length and num_bytes_downloaded both count bytes on the wire (compressed, if encoded)
+    length = resp.headers.get("content-length")
+    transferred = resp.num_bytes_downloaded
+    if length and length.isdigit():
+        saved = "%d bytes" % max(0, int(length) - transferred)
+    else:
+        saved = "unknown (stopped after %d bytes)" % transferred
+    _log.log(
+        DETAILED_LEVEL, "RSS %s: stopped at %s, saved %s",
+        url[:80], "item limit" if scanner.done else "size cap", saved,
+    )
+    return scanner.body()
+
+
+def _parse_feed(body: bytes, content_type: str | None = None) -> dict[str, Any]:
+    """
+    Parse a feed body into {title, link, items[]} (at most _RSS_MAX_ITEMS items). content_type is
+    the HTTP Content-Type, whose charset feedparser uses when the document does not declare one.
+    """
+    try:
+        feed = feedparser.parse(body, response_headers={"content-type": content_type} if content_type else None)
+    except Exception as e:
+        raise FeedParseError(str(e)) from e
+    title = (feed.feed.get("title") or "").strip() or None
+    link = (feed.feed.get("link") or "").strip() or None
+    items = []
+    for entry in feed.entries[: _RSS_MAX_ITEMS]:
+        entry_title = (entry.get("title") or "").strip() or ""
+        entry_link = (entry.get("link") or "").strip() or ""
+        entry_published = entry.get("published") or entry.get("updated") or ""
+        if not isinstance(entry_published, str):
+            parsed_time = entry.get("published_parsed") or entry.get("updated_parsed")
+            if parsed_time:
+                entry_published = time.strftime(
+                    "%Y-%m-%dT%H:%M:%S", parsed_time
+                )
+            else:
+                entry_published = ""
+        summary = entry.get("summary") or entry.get("description") or ""
+        if hasattr(summary, "strip"):
+            summary = summary.strip()
+        else:
+            summary = str(summary)[:500]
+        items.append({
+            "title": entry_title,
+            "link": entry_link,
+            "published": entry_published,
+            "description": summary[:500] if summary else "",
+        })
+    return {
+        "title": title,
+        "link": link,
+        "items": items,
+    }
+
+
+def _store(url: str, entry: _FeedEntry) -> None:
+    """Insert or refresh url in the LRU, evicting the least recently used feeds past the limit."""
+    _cache[url] = entry
+    _cache.move_to_end(url)
+    while len(_cache) > _CACHE_MAX_FEEDS:
+        evicted, _ = _cache.popitem(last=False)
+        _log.debug("RSS cache: evicted %s", evicted[:80])
+
+
+async def _get_body(client: httpx.AsyncClient, url: str, headers: dict[str, str]) -> tuple[httpx.Response, bytes]:
+    """GET url and read the feed body. A 304 is returned with an empty body; other errors raise."""
+    async with client.stream("GET", url, headers=headers) as resp:
+        if resp.status_code == 304:
+            return resp, b""
+        resp.raise_for_status()
+        return resp, await _read_feed_body(resp, url)
+
+
+async def _fetch(url: str) -> dict[str, Any]:
+    """Fetch url (conditionally if cached) and update the cache. Serves stale data if the refetch fails."""
+    cached = _cache.get(url)
+    headers: dict[str, str] = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    try:
+        async with httpx.AsyncClient(timeout=_RSS_TIMEOUT_SEC) as client:
+            resp, body = await _get_body(client, url, headers)
+            if resp.status_code == 304:
+                if cached is not None:
+                    cached.fetched_at = time.monotonic()
+                    _cache.move_to_end(url)
+                    _log.debug("RSS %s not modified", url[:80])
+                    return cached.data
+                # Nothing cached to revalidate: fetch the whole feed without validators
+                resp, body = await _get_body(client, url, {})
+                if resp.status_code == 304:
+                    resp.raise_for_status()
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        if cached is not None:
+            _log.debug("RSS refetch failed, serving cached copy: %s", e)
+            return cached.data
+        raise
+    data = _parse_feed(body, resp.headers.get("content-type"))
+    _store(url, _FeedEntry(data, resp.headers.get("etag"), resp.headers.get("last-modified")))
+    _log.debug("RSS %s fetched, %d items", url[:80], len(data["items"]))
+    return data
+
+
+async def _fetch_once(url: str) -> dict[str, Any]:
+    """Single-flight: concurrent callers for the same url await one upstream fetch."""
+    task = _inflight.get(url)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(url))
+        _inflight[url] = task
+        task.add_done_callback(lambda _t: _inflight.pop(url, None))
+    return await asyncio.shield(task)
+
+
+def _layout_feed_max_ages() -> dict[str, float]:
+    """Feed URLs used by rss cells in the current layout -> cache max age (shortest refresh_min among cells)."""
+    config = get_config()
+    layout = config.get("layout") or []
+    module_settings = config.get("module_settings") or {}
+    result: dict[str, float] = {}
+    for r, row in enumerate(layout):
+        for c, module_id in enumerate(row):
+            if module_id != _MODULE_ID_RSS:
+                continue
+            settings = module_settings.get(f"{r}_{c}") or {}
+            url = str(settings.get("rss_url") or "").strip()
+            if not url:
+                continue
+            try:
+                max_age = max(_MIN_MAX_AGE_SEC, int(settings.get("refresh_min")) * 60)
+            except (TypeError, ValueError):
+                max_age = _DEFAULT_MAX_AGE_SEC
+            result[url] = min(max_age, result.get(url, max_age))
+    return result
+
+
+async def get_feed(url: str) -> dict[str, Any]:
+    """
+    Return parsed feed for url from cache if fresh, else fetch it (one upstream request per url at a time).
+    Raises httpx.HTTPError (or httpx.InvalidURL for a malformed url) if the fetch fails with nothing
+    cached, FeedParseError if the body is not a feed.
+    """
+    cached = _cache.get(url)
+    if cached is not None:
+        max_age = _layout_feed_max_ages().get(url, _DEFAULT_MAX_AGE_SEC)
+        if time.monotonic() - cached.fetched_at < max_age:
+            _cache.move_to_end(url)
+            return cached.data
+    return await _fetch_once(url)
+
+
+async def _refresh_layout_feeds() -> None:
+    """Background loop: keep feeds used in the layout fresh so cell requests never wait on the publisher."""
+    while True:
+        try:
+            for url, max_age in _layout_feed_max_ages().items():
+                cached = _cache.get(url)
+                if cached is not None and time.monotonic() - cached.fetched_at < max_age:
+                    continue
+                try:
+                    await _fetch_once(url)
+                except Exception as e:
+                    _log.debug("RSS background refresh %s failed: %s", url[:80], e)
+        except Exception as e:
+            _log.debug("RSS background refresh failed: %s", e)
+        await asyncio.sleep(_BACKGROUND_INTERVAL_SEC)
+
+
+def start_background_refresh() -> None:
+    """Start the background refresh task (call from the app's event loop)."""
+    global _background_task
+    if _background_task is None or _background_task.done():
+        _background_task = asyncio.create_task(_refresh_layout_feeds())
+        _log.debug("RSS background refresh started")
+
+
+def stop_background_refresh() -> None:
+    """Cancel the background refresh task."""
+    if _background_task is not None and not _background_task.done():
+        _background_task.cancel()
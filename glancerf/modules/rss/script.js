@@ -68,7 +68,7 @@
                     listEl.appendChild(li);
                 });
             }
-            function updateCell(cell, cellKey, ms, forceRefresh) {
+            function updateCell(cell, cellKey, ms) {
                 var url = (ms.rss_url || '').toString().trim();
                 if (!url) {
                     showError(cell, 'Set RSS feed URL');
@@ -77,29 +77,18 @@
                 var maxItems = parseNum(ms.max_items, 10, 1, 50);
                 var refreshMin = parseNum(ms.refresh_min, 15, 1, 120);
                 var refreshMs = refreshMin * 60 * 1000;
-                var tsKey = 'rss_ts_' + cellKey;
-                if (!forceRefresh && window[tsKey]) {
-                    if (Date.now() - window[tsKey] < refreshMs) return;
-                }
                 showLoading(cell, true);
                 var apiUrl = '/api/rss?url=' + encodeURIComponent(url);
-                fetch(apiUrl).then(function(r) {
-                    return r.json().then(function(data) {
-                        return { ok: r.ok, status: r.status, data: data };
-                    });
-                }).then(function(result) {
+                // Pushed by the server data bus (shared by every display); falls back to polling
+                GlanceRFData.watch('rss_' + cellKey, apiUrl, refreshMs, function(result) {
                     showLoading(cell, false);
                     if (result.ok && result.data && !result.data.error) {
                         showFeed(cell, result.data, maxItems);
-                        try { window[tsKey] = Date.now(); } catch (e) {}
                     } else {
                         var msg = (result.data && result.data.error) ? result.data.error : 'Feed unavailable';
                         if (result.data && result.data.detail) msg += ' (' + result.data.detail + ')';
                         showError(cell, msg);
                     }
-                }).catch(function(err) {
-                    showLoading(cell, false);
-                    showError(cell, (err && err.message) ? err.message : 'Network error');
                 });
             }
             function runAll() {
@@ -109,9 +98,8 @@
                     var c = cell.getAttribute('data-col');
                     var cellKey = (r != null && c != null) ? r + '_' + c : '';
                     var ms = (cellKey && allSettings[cellKey]) ? allSettings[cellKey] : {};
-                    updateCell(cell, cellKey, ms, false);
+                    updateCell(cell, cellKey, ms);
                 });
             }
             runAll();
-            setInterval(runAll, 60 * 1000);
         })();
@@ -3,25 +3,48 @@ Register satellite_pass API routes. Called by core at startup if this module is
 """
 
 import asyncio
+import json
 
-from fastapi import FastAPI, Query
+from fastapi import Depends, FastAPI, Query
 from fastapi.responses import JSONResponse
 
+from glancerf.data_bus import layout_cell_settings, register_data_source
+from glancerf.lazy_import import lazy_import
 from glancerf.logging_config import get_logger
-from .satellite_service import get_satellite_list_cached, compute_passes
+from glancerf.rate_limit import rate_limit
+
+# Skyfield is only imported when passes are first needed (or the module is in the layout)
+satellite_service = lazy_import(".satellite_service", __package__)
 
 _log = get_logger("satellite_pass.api_routes")
 
 
+def _selected_in_layout(query: dict) -> bool:
+    """Data bus check: only satellites selected in a satellite_pass cell of the layout are pushed."""
+    configured = set()
+    for ms in layout_cell_settings("satellite_pass"):
+        selected = ms.get("selected_satellites") or "[]"
+        try:
+            selected = json.loads(selected) if isinstance(selected, str) else selected
+        except ValueError:
+            continue
+        if isinstance(selected, list):
+            configured |= {str(x).strip() for x in selected}
+    requested = (query.get("norad_ids") or [""])[0]
+    ids = {x.strip() for x in requested.split(",") if x.strip()}
+    return bool(ids) and ids <= configured
+
+
 def register_routes(app: FastAPI) -> None:
     """Register /api/satellite/list and /api/satellite/passes."""
+    register_data_source("/api/satellite/passes", min_interval_sec=30, allow_query=_selected_in_layout)
 
     @app.get("/api/satellite/list")
     async def get_satellite_list():
         """Return list of trackable satellites from satellite_list.json (refreshed from CelesTrak if missing or older than ~24h)."""
         _log.debug("API: GET /api/satellite/list")
         try:
-            result = await asyncio.to_thread(get_satellite_list_cached)
+            result = await asyncio.to_thread(satellite_service.deferred("get_satellite_list_cached"))
             return {"satellites": result}
         except Exception as e:
             _log.debug("Satellite list failed: %s", e)
@@ -30,7 +53,7 @@ def register_routes(app: FastAPI) -> None:
                 status_code=502,
             )
 
-    @app.get("/api/satellite/passes")
+    @app.get("/api/satellite/passes", dependencies=[Depends(rate_limit("api"))])
     async def get_satellite_passes(
         norad_ids: str = Query(..., description="Comma-separated NORAD IDs"),
         lat: float = Query(..., ge=-90, le=90),
@@ -57,9 +80,9 @@ def register_routes(app: FastAPI) -> None:
                 status_code=400,
             )
         try:
-            sat_list = await asyncio.to_thread(get_satellite_list_cached)
+            sat_list = await asyncio.to_thread(satellite_service.deferred("get_satellite_list_cached"))
             name_by_norad = {s["norad_id"]: s["name"] for s in (sat_list or []) if s.get("name")}
-            result = await asyncio.to_thread(compute_passes, ids, lat, lng, alt, name_by_norad)
+            result = await asyncio.to_thread(satellite_service.deferred("compute_passes"), ids, lat, lng, alt, name_by_norad)
             return {"passes": result}
         except Exception as e:
             _log.debug("Satellite passes failed: %s", e)
@@ -252,7 +252,13 @@
         setState(cell, 'loading');
         var noradIds = selected.slice(0, 20).join(',');
         var url = '/api/satellite/passes?norad_ids=' + encodeURIComponent(noradIds) + '&lat=' + loc.lat + '&lng=' + loc.lng + '&alt=0';
-        fetch(url).then(function(r) { return r.json(); }).then(function(data) {
+        // Pushed by the server data bus (shared by every display); falls back to polling
+        GlanceRFData.watch('satellite_pass_' + cellKey, url, UPDATE_MS, function(result) {
+            if (result.status === 0) {
+                showFailed();
+                return;
+            }
+            var data = result.data;
             setState(cell, '');
             var passes = (data && data.passes) ? data.passes : [];
             if (passes.length === 0) {
@@ -319,7 +325,9 @@
                 }
                 drawSkyDome(canvas, sat, cur.az, cur.el);
             }
-        }).catch(function() {
+        });
+
+        function showFailed() {
             setState(cell, 'error');
             var errEl = cell.querySelector('.satellite_pass_error');
             if (errEl) errEl.textContent = 'Failed to load pass data.';
@@ -327,7 +335,7 @@
             if (eventsEl) eventsEl.textContent = '';
             if (infoEl) infoEl.textContent = '';
             if (azelEl) azelEl.textContent = '';
-        });
+        }
     }
 
     function run() {
@@ -337,5 +345,4 @@
     }
 
     run();
-    setInterval(run, UPDATE_MS);
 })();
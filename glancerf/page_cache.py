@@ -0,0 +1,63 @@
+"""
+Rendered-page cache for the main and read-only dashboards.
+Each page is rendered once per key (config version + module asset version) and kept as UTF-8
+bytes plus precompressed copies and an ETag. Requests with a matching If-None-Match get 304.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from glancerf.compression import CompressedAsset
+from glancerf.logging_config import get_logger
+
+_log = get_logger("page_cache")
+
+
+class _RenderedPage:
+    __slots__ = ("key", "asset")
+
+    def __init__(self, key: Hashable, html: str):
+        self.key = key
+        self.asset = CompressedAsset(html.encode("utf-8"))
+
+
+class PageCache:
+    """Latest rendering of each named page; a new key replaces the old entry."""
+
+    def __init__(self):
+        self._pages: Dict[str, _RenderedPage] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, key: Hashable, render: Callable[[], str]) -> _RenderedPage:
+        """Return the cached page for (name, key), calling render() to build it on a miss."""
+        page = self._pages.get(name)
+        if page is not None and page.key == key:
+            self.hits += 1
+            return page
+        page = _RenderedPage(key, render())
+        with self._lock:
+            self._pages[name] = page
+            self.misses += 1
+        _log.debug("page cache: rendered %s (%s bytes) for key %s", name, len(page.asset.body), key)
+        return page
+
+    def respond(self, request: Request, name: str, key: Hashable, render: Callable[[], str]) -> Response:
+        """HTML response for the page: 304 if the client has it, compressed if accepted."""
+        page = self.get(name, key, render)
+        return page.asset.response(request.headers, "text/html", {"Cache-Control": "no-cache"})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"pages": len(self._pages), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by the main and read-only servers (they run in one process)
+page_cache = PageCache()
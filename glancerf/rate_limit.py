@@ -1,68 +1,219 @@
 """
-In-memory rate limiter for sensitive POST endpoints.
-Limits by client IP: 10 requests per minute per IP.
+In-memory rate limiter for sensitive POST endpoints and expensive GET endpoints.
+Each client IP gets a token bucket per route group (O(1) state); buckets live in a bounded LRU and
+idle ones are evicted once they would have refilled anyway. X-Forwarded-For is honored only when the
+direct peer is a trusted proxy (config key trusted_proxies).
 """
 
+import ipaddress
+import math
+import threading
 import time
-from collections import defaultdict
-from typing import List
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from starlette.requests import HTTPConnection
 
 from glancerf.logging_config import get_logger
 
 _log = get_logger("rate_limit")
 
-# (max_requests, window_seconds)
+# Default (max_requests, window_seconds) per route group; overridable with the rate_limits config key.
+# "settings": setup/layout/module saves. "api": expensive GET endpoints (propagation, satellite passes, RSS).
 RATE_LIMIT_REQUESTS = 10
 RATE_LIMIT_WINDOW = 60
-
-_store: defaultdict = defaultdict(list)
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "settings": (RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW),
+    "api": (120, 60),
+}
+# Proxies whose X-Forwarded-For is believed when trusted_proxies is not set (a reverse proxy on this host)
+DEFAULT_TRUSTED_PROXIES = ["127.0.0.1", "::1"]
+# Client host the in-process data bus uses; its fetches are not limited (subscriptions are charged instead)
+INTERNAL_CLIENT_HOST = "glancerf.internal"
+# Buckets kept at most (all groups); least recently used are dropped first
+_MAX_BUCKETS = 10000
+
+
+class _TokenBucket:
+    """Holds up to capacity tokens, refilled at rate tokens per second; a request takes one."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated = now
+
+
+class RateLimiter:
+    """Token buckets keyed by (group, client), in an LRU bounded to max_buckets."""
+
+    def __init__(self, limits: Dict[str, Tuple[int, float]], max_buckets: int = _MAX_BUCKETS):
+        self._buckets: "OrderedDict[Tuple[str, str], _TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._limits: Dict[str, Tuple[int, float]] = {}
+        self.max_buckets = max_buckets
+        self.evicted = 0
+        self.set_limits(limits)
+
+    def set_limits(self, limits: Dict[str, Tuple[int, float]]) -> None:
+        with self._lock:
+            self._limits = dict(limits)
+
+    def _limit(self, group: str) -> Tuple[int, float]:
+        return self._limits.get(group) or self._limits.get("settings") or DEFAULT_RATE_LIMITS["settings"]
+
+    def acquire(self, group: str, client: str) -> float:
+        """Take a token for client in group. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        capacity, window = self._limit(group)
+        rate = capacity / window
+        key = (group, client)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _TokenBucket(capacity, now)
+                self._evict(now)
+            else:
+                self._buckets.move_to_end(key)
+                bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated) * rate)
+                bucket.updated = now
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / rate
+
+    def _evict(self, now: float) -> None:
+        """Drop idle buckets from the LRU end (a bucket idle for its whole window is full, so forgetting
+        it changes nothing), then the least recently used ones while over max_buckets."""
+        while self._buckets:
+            (group, _), oldest = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_buckets and now - oldest.updated < self._limit(group)[1]:
+                break
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"buckets": len(self._buckets), "evicted": self.evicted}
+
+
+_limiter = RateLimiter(DEFAULT_RATE_LIMITS)
+_trusted_proxies: List[Any] = [ipaddress.ip_network(p) for p in DEFAULT_TRUSTED_PROXIES]
+_settings_version: Optional[int] = None
+
+
+def parse_rate_limits(value: Any) -> Dict[str, Tuple[int, float]]:
+    """Merge a rate_limits config value ({group: {"requests": n, "window_sec": s}}) over the defaults."""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for group, spec in (value or {}).items():
+        default_requests, default_window = limits.get(group, DEFAULT_RATE_LIMITS["settings"])
+        limits[group] = (int(spec.get("requests", default_requests)), float(spec.get("window_sec", default_window)))
+    return limits
+
+
+def parse_trusted_proxies(value: Any) -> List[Any]:
+    """ip_network objects for a trusted_proxies config value (IP addresses or CIDR ranges)."""
+    if value is None:
+        value = DEFAULT_TRUSTED_PROXIES
+    return [ipaddress.ip_network(p.strip(), strict=False) for p in value]
+
+
+def _refresh_settings() -> None:
+    """Apply rate_limits and trusted_proxies from config when the config version has changed."""
+    global _trusted_proxies, _settings_version
+    try:
+        from glancerf.config import get_config
+
+        config = get_config()
+    except Exception:
+        return
+    if config.version == _settings_version:
+        return
+    _settings_version = config.version
+    try:
+        _limiter.set_limits(parse_rate_limits(config.get("rate_limits")))
+        _trusted_proxies = parse_trusted_proxies(config.get("trusted_proxies"))
+    except (AttributeError, TypeError, ValueError) as e:
+        _log.debug("Rate limit settings ignored: %s", e)
+
+
+def _is_trusted(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_proxies)
 
 
-def _get_client_ip(request: Request) -> str:
-    """Prefer X-Forwarded-For when behind a proxy, else client host."""
+def _get_client_ip(request: HTTPConnection) -> str:
+    """
+    Client host, or the X-Forwarded-For address when the peer is a trusted proxy. The header is
+    read right to left, skipping trusted hops, so entries a client prepends itself are ignored.
+    """
+    host = request.client.host if request.client else "unknown"
     forwarded = request.headers.get("x-forwarded-for")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+    if not forwarded or not _is_trusted(host):
+        return host
+    for hop in reversed(forwarded.split(",")):
+        hop = hop.strip()
+        if hop and not _is_trusted(hop):
+            return hop
+    return host
 
 
-def _prune(timestamps: List[float], window: int) -> None:
-    """Drop timestamps older than window seconds."""
-    cutoff = time.monotonic() - window
-    while timestamps and timestamps[0] < cutoff:
-        timestamps.pop(0)
-
-
-def _check_rate_limit(ip: str) -> bool:
+def _check_rate_limit(ip: str, group: str = "settings") -> bool:
     """Return True if request is allowed, False if rate limited."""
-    now = time.monotonic()
-    timestamps = _store[ip]
-    _prune(timestamps, RATE_LIMIT_WINDOW)
-    if len(timestamps) >= RATE_LIMIT_REQUESTS:
-        return False
-    timestamps.append(now)
-    return True
+    return _limiter.acquire(group, ip) == 0
 
 
-async def rate_limit_dependency(request: Request) -> None:
+def charge(connection: HTTPConnection, group: str) -> float:
     """
-    FastAPI dependency for POST /layout, /setup, /modules/save-settings.
-    Raises 429 JSONResponse if the client has exceeded the limit.
+    Take one request from the connection's client in group. Returns 0 if allowed, else seconds to wait.
+    Used by the dependency below and for data bus subscriptions (charged to the subscribing client,
+    since the bus's own in-process fetches are not limited).
     """
-    ip = _get_client_ip(request)
-    if not _check_rate_limit(ip):
-        _log.debug("Rate limit exceeded for IP %s", ip)
-        raise RateLimitExceeded()
-    _log.debug("Rate limit OK for IP %s", ip)
+    if connection.client is not None and connection.client.host == INTERNAL_CLIENT_HOST:
+        return 0.0
+    _refresh_settings()
+    ip = _get_client_ip(connection)
+    retry_after = _limiter.acquire(group, ip)
+    if retry_after:
+        _log.debug("Rate limit exceeded for IP %s (%s)", ip, group)
+    else:
+        _log.debug("Rate limit OK for IP %s (%s)", ip, group)
+    return retry_after
+
+
+def rate_limit(group: str) -> Callable:
+    """FastAPI dependency limiting each client to the group's requests per window. Raises RateLimitExceeded."""
+
+    async def dependency(request: Request) -> None:
+        retry_after = charge(request, group)
+        if retry_after:
+            raise RateLimitExceeded(retry_after)
+
+    return dependency
+
+
+# POST /layout, /setup, /modules/save-settings, /modules/reload
+rate_limit_dependency = rate_limit("settings")
+
+
+def get_rate_limit_metrics() -> Dict[str, Any]:
+    return _limiter.metrics()
 
 
 class RateLimitExceeded(Exception):
     """Raised when client exceeds rate limit."""
 
-    pass
+    def __init__(self, retry_after: float = RATE_LIMIT_WINDOW):
+        super().__init__()
+        self.retry_after = retry_after
 
 
 def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
@@ -70,5 +221,5 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSO
     return JSONResponse(
         status_code=429,
         content={"detail": "Too many requests. Please try again later."},
-        headers={"Retry-After": str(RATE_LIMIT_WINDOW)},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
     )
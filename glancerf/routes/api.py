@@ -3,20 +3,81 @@ API routes for GlanceRF. Core routes only; module-owned API routes are registere
 """
 
 import importlib
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
+from glancerf.config import get_config
+from glancerf.lazy_import import lazy_modules, preload
 from glancerf.logging_config import DETAILED_LEVEL, get_logger
-from glancerf.modules import get_module_api_packages
+from glancerf.modules import get_module_api_package_map, module_ids_in_layout
 from glancerf.telemetry import send_telemetry
 from glancerf.time_utils import get_current_time
 
 _log = get_logger("api")
 
 
+# Module id -> (package, ms spent importing api_routes and registering its routes at startup)
+_routes_import_ms: Dict[str, Tuple[str, float]] = {}
+
+
+def _preload_layout_modules(layout) -> None:
+    """Import the deferred dependencies of the API modules used in layout."""
+    packages = get_module_api_package_map()
+    for module_id in module_ids_in_layout(layout):
+        pkg = packages.get(module_id)
+        if pkg is None or not any(not p.loaded for p in lazy_modules(pkg)):
+            continue
+        try:
+            seconds = preload(pkg)
+        except Exception as e:
+            _log.warning("Module '%s' dependencies could not be loaded: %s", module_id, e)
+            continue
+        _log.debug("Preloaded %s for layout in %.1f ms", pkg, seconds * 1000)
+
+
+def _on_config_change(version, changed_keys) -> None:
+    """A module newly placed in the layout gets its dependencies imported in the background."""
+    if "layout" in changed_keys:
+        layout = get_config().get("layout")
+        threading.Thread(target=_preload_layout_modules, args=(layout,), name="glancerf-preload", daemon=True).start()
+
+
+def get_module_import_report() -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Per-module import cost in ms: routes_ms (api_routes at startup) and deps_ms (deferred
+    dependencies; None while none of them has been imported).
+    """
+    report: Dict[str, Dict[str, Optional[float]]] = {}
+    for module_id, (pkg, routes_ms) in _routes_import_ms.items():
+        loaded = [p.import_seconds for p in lazy_modules(pkg) if p.loaded]
+        deps_ms = sum(loaded) * 1000 if loaded else None
+        report[module_id] = {"routes_ms": routes_ms, "deps_ms": deps_ms}
+    return report
+
+
+def _log_import_report() -> None:
+    parts = []
+    for module_id, entry in sorted(get_module_import_report().items()):
+        if entry["deps_ms"] is None:
+            parts.append("%s %.0f ms (dependencies deferred)" % (module_id, entry["routes_ms"]))
+        else:
+            parts.append("%s %.0f ms + %.0f ms dependencies" % (module_id, entry["routes_ms"], entry["deps_ms"]))
+    if parts:
+        _log.info("Module API import cost: %s", "; ".join(parts))
+
+
 def register_module_api_routes(app: FastAPI) -> None:
-    """Register API routes provided by modules (e.g. satellite_pass). Each module's api_routes.register_routes(app) is called."""
-    for pkg in get_module_api_packages():
+    """
+    Register API routes provided by modules (e.g. satellite_pass). Each module's api_routes.register_routes(app)
+    is called. Heavy dependencies declared with lazy_import are only imported for modules in the layout;
+    the rest load on first request, or in the background when the module is added to the layout.
+    """
+    for module_id, pkg in get_module_api_package_map().items():
+        start = time.perf_counter()
         try:
             mod = importlib.import_module(pkg + ".api_routes")
             register_routes = getattr(mod, "register_routes", None)
@@ -25,6 +86,12 @@ def register_module_api_routes(app: FastAPI) -> None:
                 _log.debug("Registered API routes for module package: %s", pkg)
         except Exception as e:
             _log.warning("Failed to register API routes for %s: %s", pkg, e)
+            continue
+        _routes_import_ms[module_id] = (pkg, (time.perf_counter() - start) * 1000)
+    config = get_config()
+    _preload_layout_modules(config.get("layout"))
+    config.add_change_listener(_on_config_change)
+    _log_import_report()
 
 
 def register_api_routes(app: FastAPI):
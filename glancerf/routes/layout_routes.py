@@ -15,7 +15,7 @@ from glancerf.config import get_config
 from glancerf.view_utils import build_merged_cells_from_spans
 from glancerf.modules import get_modules, get_module_by_id, get_module_dir, get_module_ids
 from glancerf.rate_limit import rate_limit_dependency
-from glancerf.websocket_manager import ConnectionManager
+from glancerf.websocket_manager import TOPIC_CONFIG, ConnectionManager
 from glancerf.logging_config import get_logger
 
 _log = get_logger("layout_routes")
@@ -63,13 +63,13 @@ def register_layout_routes(app: FastAPI, connection_manager: ConnectionManager):
         # Get grid dimensions from config (with fallback defaults)
         grid_columns = current_config.get("grid_columns")
         grid_rows = current_config.get("grid_rows")
-        # Fallback to 3x3 if not configured
+        # Fallback to 3x3 if not configured (persisted in one write)
+        defaults = {}
         if grid_columns is None:
-            grid_columns = 3
-            current_config.set("grid_columns", 3)
+            grid_columns = defaults["grid_columns"] = 3
         if grid_rows is None:
-            grid_rows = 3
-            current_config.set("grid_rows", 3)
+            grid_rows = defaults["grid_rows"] = 3
+        current_config.update(defaults)
 
         # Get existing layout or create empty one
         layout = current_config.get("layout")
@@ -346,9 +346,6 @@ def register_layout_routes(app: FastAPI, connection_manager: ConnectionManager):
                             status_code=400,
                         )
 
-            current_config.set("layout", layout)
-            current_config.set("cell_spans", spans or {})
-
             # Merge in-cell module settings from layout form so changes in the layout editor are saved
             if module_settings is not None and isinstance(module_settings, dict):
                 for cell_key, settings in module_settings.items():
@@ -366,28 +363,11 @@ def register_layout_routes(app: FastAPI, connection_manager: ConnectionManager):
                         del current[cell_key]
                 except ValueError:
                     del current[cell_key]
-            current_config.set("module_settings", current)
+            # layout, cell_spans and module_settings are validated and written together
+            current_config.update({"layout": layout, "cell_spans": spans or {}, "module_settings": current})
 
             # Notify all clients (desktop, browsers, readonly portal) so they reload with new layout
-            try:
-                msg = {"type": "config_update", "data": {"reload": True}}
-                if connection_manager.desktop_connection:
-                    try:
-                        await connection_manager.desktop_connection.send_json(msg)
-                    except Exception:
-                        connection_manager.desktop_connection = None
-                for conn in list(connection_manager.browser_connections):
-                    try:
-                        await conn.send_json(msg)
-                    except Exception:
-                        pass
-                for conn in list(connection_manager.readonly_connections):
-                    try:
-                        await conn.send_json(msg)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+            connection_manager.publish(TOPIC_CONFIG, {"type": "config_update", "data": {"reload": True}})
             _log.debug("layout save: success; broadcast config_update to desktop, browser, readonly")
             return JSONResponse({"success": True})
         except Exception as e:
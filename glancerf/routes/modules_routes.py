@@ -4,61 +4,28 @@ Shows installed modules and whether each is active (used in the current layout).
 """
 
 import html as html_module
-import importlib.util
-import sys
-from pathlib import Path
+from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
 
 from glancerf.config import get_config
-from glancerf.modules import clear_module_cache, get_modules, get_module_dir
+from glancerf.modules import get_modules, reload_modules
+from glancerf.rate_limit import rate_limit_dependency
+from glancerf.websocket_manager import TOPIC_CONFIG
 from glancerf.logging_config import get_logger
 
 _log = get_logger("modules_routes")
-_MODULES_DIR = Path(__file__).parent.parent / "modules"
-
-
-def _get_module_description(module_id: str) -> str:
-    """Get module description from docstring (folder module.py or legacy .py)."""
-    module_file = None
-    folder = get_module_dir(module_id)
-    if folder and (folder / "module.py").is_file():
-        module_file = folder / "module.py"
-    if module_file is None:
-        module_file = _MODULES_DIR / f"{module_id}.py"
-    if not module_file.exists():
-        return "No description available"
-    try:
-        spec = importlib.util.spec_from_file_location(
-            f"glancerf.modules.{module_id}", module_file
-        )
-        if spec is None or spec.loader is None:
-            return "No description available"
-        mod = importlib.util.module_from_spec(spec)
-        sys.modules[spec.name] = mod
-        spec.loader.exec_module(mod)
-        if mod.__doc__:
-            doc = mod.__doc__.strip()
-            lines = doc.split("\n\n")
-            if lines:
-                desc = lines[0].strip()
-                if len(desc) > 200:
-                    desc = desc[:200] + "..."
-                return desc
-        return "No description available"
-    except Exception:
-        return "No description available"
 
 
 def register_modules_routes(app: FastAPI, connection_manager=None):
     """Register modules management routes."""
 
     @app.get("/modules")
-    async def modules_page():
+    async def modules_page(reloaded: Optional[int] = None):
         """Modules page - lists installed modules and whether each is active in the layout."""
         _log.debug("GET /modules")
-        clear_module_cache()
         try:
             current_config = get_config()
         except (FileNotFoundError, IOError):
@@ -83,7 +50,7 @@ def register_modules_routes(app: FastAPI, connection_manager=None):
             is_enabled = module_id in enabled_module_ids
             status = "Enabled" if is_enabled else "Disabled"
             status_class = "status-enabled" if is_enabled else "status-disabled"
-            description = _get_module_description(module_id)
+            description = module.get("description") or "No description available"
             modules_html += f"""
             <div class="module-item">
                 <div class="module-header">
@@ -98,6 +65,13 @@ def register_modules_routes(app: FastAPI, connection_manager=None):
             </div>
             """
 
+        if reloaded is None:
+            reload_status = ""
+        elif reloaded == 0:
+            reload_status = '<span class="reload-status">No module changes found.</span>'
+        else:
+            reload_status = f'<span class="reload-status">Reloaded {reloaded} changed module(s).</span>'
+
         menu_list_no_config = """
                 <li><a href="/setup">Setup</a></li>
                 <li><a href="/layout">Layout editor</a></li>
@@ -131,6 +105,10 @@ def register_modules_routes(app: FastAPI, connection_manager=None):
         .status-enabled {{ background-color: #0f0; color: #000; }}
         .status-disabled {{ background-color: #333; color: #aaa; }}
         .module-description {{ color: #aaa; font-size: 14px; line-height: 1.6; padding: 0 20px 15px 20px; }}
+        .reload-form {{ display: flex; align-items: center; gap: 15px; margin-bottom: 20px; }}
+        .reload-form button {{ font-family: inherit; font-size: 14px; padding: 8px 16px; background-color: #111; color: #0f0; border: 2px solid #333; border-radius: 5px; cursor: pointer; }}
+        .reload-form button:hover {{ border-color: #0f0; }}
+        .reload-status {{ color: #aaa; font-size: 14px; }}
     </style>
 </head>
 <body>
@@ -146,6 +124,10 @@ def register_modules_routes(app: FastAPI, connection_manager=None):
     <div class="container">
         <a href="/" class="back-link">← Back to Main</a>
         <h1>Modules</h1>
+        <form class="reload-form" method="post" action="/modules/reload">
+            <button type="submit">Reload modules</button>
+            {reload_status}
+        </form>
         <div class="modules-list">
             {modules_html}
         </div>
@@ -172,3 +154,12 @@ def register_modules_routes(app: FastAPI, connection_manager=None):
         """
 
         return HTMLResponse(content=html_content)
+
+    @app.post("/modules/reload")
+    async def modules_reload(_: None = Depends(rate_limit_dependency)):
+        """Re-import modules whose files changed on disk; open displays reload if any did."""
+        changed = await run_in_threadpool(reload_modules)
+        _log.debug("modules reload: changed=%s", changed)
+        if changed and connection_manager is not None:
+            connection_manager.publish(TOPIC_CONFIG, {"type": "config_update", "data": {"reload": True}})
+        return RedirectResponse(url=f"/modules?reloaded={len(changed)}", status_code=303)
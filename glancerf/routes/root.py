@@ -5,13 +5,15 @@ Root (main clock) page route for GlanceRF
 import json
 
 from fastapi import Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 
 from glancerf.config import get_config
 from glancerf.aspect_ratio import get_aspect_ratio_css
 from glancerf.view_utils import build_merged_cells_from_spans, build_grid_html
 from glancerf.views import render_main_page
-from glancerf.modules import get_module_assets
+from glancerf.asset_bundles import get_bundle_urls
+from glancerf.modules import get_modules_version
+from glancerf.page_cache import page_cache
 from glancerf.logging_config import get_logger
 
 _log = get_logger("root")
@@ -43,37 +45,40 @@ def register_root(app):
         grid_columns = current_config.get("grid_columns")
         grid_rows = current_config.get("grid_rows")
 
-        # Fallback to 3x3 if not configured
+        # Fallback to 3x3 if not configured (persisted in one write)
+        defaults = {}
         if grid_columns is None:
-            grid_columns = 3
-            current_config.set("grid_columns", 3)
+            grid_columns = defaults["grid_columns"] = 3
         if grid_rows is None:
-            grid_rows = 3
-            current_config.set("grid_rows", 3)
-        aspect_ratio_css = get_aspect_ratio_css(aspect_ratio)
+            grid_rows = defaults["grid_rows"] = 3
+        current_config.update(defaults)
 
-        cell_spans = current_config.get("cell_spans") or {}
-        merged_cells, _ = build_merged_cells_from_spans(cell_spans)
-        grid_html = build_grid_html(
-            layout, cell_spans, merged_cells, grid_columns, grid_rows
-        )
-        grid_css = f"grid-template-columns: repeat({grid_columns}, minmax(0, 1fr)); grid-template-rows: repeat({grid_rows}, minmax(0, 1fr));"
-        module_css, module_js = get_module_assets(layout)
-        module_settings = current_config.get("module_settings") or {}
-        module_settings_json = json.dumps(module_settings)
-        setup_callsign_json = json.dumps(current_config.get("setup_callsign") or "")
-        setup_location_json = json.dumps(current_config.get("setup_location") or "")
+        def render() -> str:
+            aspect_ratio_css = get_aspect_ratio_css(aspect_ratio)
+            cell_spans = current_config.get("cell_spans") or {}
+            merged_cells, _ = build_merged_cells_from_spans(cell_spans)
+            grid_html = build_grid_html(
+                layout, cell_spans, merged_cells, grid_columns, grid_rows
+            )
+            grid_css = f"grid-template-columns: repeat({grid_columns}, minmax(0, 1fr)); grid-template-rows: repeat({grid_rows}, minmax(0, 1fr));"
+            module_css_url, module_js_url = get_bundle_urls(layout)
+            module_settings = current_config.get("module_settings") or {}
+            module_settings_json = json.dumps(module_settings)
+            setup_callsign_json = json.dumps(current_config.get("setup_callsign") or "")
+            setup_location_json = json.dumps(current_config.get("setup_location") or "")
 
-        _log.debug("root: rendering main page grid=%sx%s", grid_columns, grid_rows)
-        html_content = render_main_page(
-            aspect_ratio_css=aspect_ratio_css,
-            grid_css=grid_css,
-            grid_html=grid_html,
-            aspect_ratio=aspect_ratio,
-            module_css=module_css,
-            module_js=module_js,
-            module_settings_json=module_settings_json,
-            setup_callsign_json=setup_callsign_json,
-            setup_location_json=setup_location_json,
-        )
-        return HTMLResponse(content=html_content)
+            _log.debug("root: rendering main page grid=%sx%s", grid_columns, grid_rows)
+            return render_main_page(
+                aspect_ratio_css=aspect_ratio_css,
+                grid_css=grid_css,
+                grid_html=grid_html,
+                aspect_ratio=aspect_ratio,
+                module_css_url=module_css_url,
+                module_js_url=module_js_url,
+                module_settings_json=module_settings_json,
+                setup_callsign_json=setup_callsign_json,
+                setup_location_json=setup_location_json,
+            )
+
+        # Rendered once per config version / module content; reloads get the cached page or a 304
+        return page_cache.respond(request, "main", (current_config.version, get_modules_version()), render)
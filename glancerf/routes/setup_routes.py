@@ -18,7 +18,7 @@ from glancerf.rate_limit import rate_limit_dependency
 
 _log = get_logger("setup_routes")
 from glancerf.aspect_ratio import get_aspect_ratio_list
-from glancerf.websocket_manager import ConnectionManager
+from glancerf.websocket_manager import TOPIC_CONFIG, ConnectionManager
 
 _WEB_DIR = Path(__file__).resolve().parent.parent / "web"
 _SETUP_TEMPLATE_PATH = _WEB_DIR / "templates" / "setup" / "index.html"
@@ -73,17 +73,17 @@ def register_setup_routes(app: FastAPI, connection_manager: ConnectionManager):
         current_ssid_esc = html_module.escape(current_ssid)
         current_location_esc = html_module.escape(current_location)
 
-        # Fallback to 3x3 if not configured; clamp to max_grid_scale
+        # Fallback to 3x3 if not configured (persisted in one write); clamp to max_grid_scale
+        defaults = {}
         if current_columns is None:
-            current_columns = 3
-            current_config.set("grid_columns", 3)
+            current_columns = defaults["grid_columns"] = 3
         else:
             current_columns = max(1, min(max_grid_scale, int(current_columns)))
         if current_rows is None:
-            current_rows = 3
-            current_config.set("grid_rows", 3)
+            current_rows = defaults["grid_rows"] = 3
         else:
             current_rows = max(1, min(max_grid_scale, int(current_rows)))
+        current_config.update(defaults)
     
         # Build ratio options HTML
         ratio_options = ""
@@ -187,58 +187,48 @@ def register_setup_routes(app: FastAPI, connection_manager: ConnectionManager):
         # Store old values to detect changes
         old_aspect_ratio = config_instance.get("aspect_ratio")
     
-        config_instance.set("aspect_ratio", aspect_ratio)
-        config_instance.set("orientation", orientation)
-        config_instance.set("grid_columns", grid_columns)
-        config_instance.set("grid_rows", grid_rows)
-        # Ensure layout dimensions match grid (fix mismatch after first-run setup or grid size change)
-        current_layout = config_instance.get("layout") or []
-        rows_ok = len(current_layout) == grid_rows
-        cols_ok = (current_layout and len(current_layout[0]) == grid_columns) if current_layout else False
-        if not (rows_ok and cols_ok):
-            config_instance.set("layout", resize_layout_to_grid(current_layout, grid_columns, grid_rows))
-        config_instance.set("setup_callsign", (setup_callsign or "").strip())
-        ssid = (setup_ssid or "01").strip()
-        if not ssid:
-            ssid = "01"
-        config_instance.set("setup_ssid", ssid)
-        config_instance.set("setup_location", (setup_location or "").strip())
-        config_instance.set("update_mode", update_mode)
-        config_instance.set("update_check_time", (update_check_time or "03:00").strip())
-        
-        # Handle telemetry_enabled (convert "1"/"0" string to boolean)
-        telemetry_enabled_bool = telemetry_enabled == "1" if telemetry_enabled else True
-        config_instance.set("telemetry_enabled", telemetry_enabled_bool)
-    
-        # Only set first_run to False if it was True (don't change it if user is just updating settings)
-        if is_first_run:
-            config_instance.set("first_run", False)
+        # All setup fields are validated and written to the config file once
+        with config_instance.transaction():
+            config_instance.set("aspect_ratio", aspect_ratio)
+            config_instance.set("orientation", orientation)
+            config_instance.set("grid_columns", grid_columns)
+            config_instance.set("grid_rows", grid_rows)
+            # Ensure layout dimensions match grid (fix mismatch after first-run setup or grid size change)
+            current_layout = config_instance.get("layout") or []
+            rows_ok = len(current_layout) == grid_rows
+            cols_ok = (current_layout and len(current_layout[0]) == grid_columns) if current_layout else False
+            if not (rows_ok and cols_ok):
+                config_instance.set("layout", resize_layout_to_grid(current_layout, grid_columns, grid_rows))
+            config_instance.set("setup_callsign", (setup_callsign or "").strip())
+            ssid = (setup_ssid or "01").strip()
+            if not ssid:
+                ssid = "01"
+            config_instance.set("setup_ssid", ssid)
+            config_instance.set("setup_location", (setup_location or "").strip())
+            config_instance.set("update_mode", update_mode)
+            config_instance.set("update_check_time", (update_check_time or "03:00").strip())
+
+            # Handle telemetry_enabled (convert "1"/"0" string to boolean)
+            telemetry_enabled_bool = telemetry_enabled == "1" if telemetry_enabled else True
+            config_instance.set("telemetry_enabled", telemetry_enabled_bool)
+
+            # Only set first_run to False if it was True (don't change it if user is just updating settings)
+            if is_first_run:
+                config_instance.set("first_run", False)
     
         # Broadcast config_update to browser and readonly clients (not desktop)
         _log.debug("setup: saved, broadcasting config_update to browsers + readonly")
-        try:
-            msg = {
-                "type": "config_update",
-                "data": {
-                    "aspect_ratio": aspect_ratio,
-                    "orientation": orientation,
-                    "grid_columns": grid_columns,
-                    "grid_rows": grid_rows,
-                    "reload": True
-                }
+        msg = {
+            "type": "config_update",
+            "data": {
+                "aspect_ratio": aspect_ratio,
+                "orientation": orientation,
+                "grid_columns": grid_columns,
+                "grid_rows": grid_rows,
+                "reload": True
             }
-            for connection in connection_manager.browser_connections:
-                try:
-                    await connection.send_json(msg)
-                except Exception as e:
-                    _log.debug("WebSocket send failed: %s", e)
-            for connection in list(connection_manager.readonly_connections):
-                try:
-                    await connection.send_json(msg)
-                except Exception as e:
-                    _log.debug("WebSocket send failed (readonly): %s", e)
-        except Exception as e:
-            _log.debug("WebSocket broadcast failed: %s", e)
+        }
+        connection_manager.publish(TOPIC_CONFIG, msg, exclude=(connection_manager.desktop_connection,))
     
         # After setup, always go to layout page so user can assign modules to cells
         return RedirectResponse(url="/layout", status_code=303)
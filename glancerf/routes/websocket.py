@@ -2,16 +2,52 @@
 WebSocket routes for GlanceRF
 """
 
+import json
+from typing import Optional
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from glancerf.websocket_manager import ConnectionManager
+from glancerf.data_bus import DataBus
+from glancerf.rate_limit import charge
+from glancerf.websocket_manager import MIRROR_MESSAGE_TYPES, ConnectionManager
 from glancerf.logging_config import DETAILED_LEVEL, get_logger
 
 _log = get_logger("websocket")
 
+DATA_MESSAGE_TYPES = ("data_subscribe", "data_unsubscribe")
+
 
-def register_websocket_routes(app: FastAPI, connection_manager: ConnectionManager):
+def register_websocket_routes(app: FastAPI, connection_manager: ConnectionManager, data_bus: Optional[DataBus] = None):
     """Register WebSocket routes"""
 
+    def handle_data_message(websocket: WebSocket, data: dict) -> None:
+        """Module data bus subscription: {type: data_subscribe, url, interval_ms} or {type: data_unsubscribe, url}."""
+        url = str(data.get("url") or "")
+        if data_bus is None:
+            if data.get("type") == "data_subscribe":
+                connection_manager.send(websocket, {"type": "data_rejected", "key": url})
+            return
+        if data.get("type") == "data_unsubscribe":
+            data_bus.unsubscribe(websocket, url)
+            return
+        if not data_bus.is_subscribed(websocket, url) and charge(websocket, "api"):
+            # Same limit as fetching the endpoint directly; the page falls back to (limited) polling
+            connection_manager.send(websocket, {"type": "data_rejected", "key": url})
+            return
+        try:
+            interval_sec = float(data.get("interval_ms")) / 1000.0
+        except (TypeError, ValueError):
+            interval_sec = None
+        if not data_bus.subscribe(websocket, url, interval_sec):
+            connection_manager.send(websocket, {"type": "data_rejected", "key": url})
+
+    @app.get("/api/ws/metrics")
+    async def websocket_metrics():
+        """Connection counts, queue/drop counters, per-topic publish metrics and data bus counters."""
+        result = connection_manager.metrics()
+        if data_bus is not None:
+            result["data_bus"] = data_bus.metrics()
+        return result
+
     @app.websocket("/ws/desktop")
     async def websocket_desktop(websocket: WebSocket):
         """WebSocket endpoint for desktop app (source of truth)"""
@@ -20,13 +56,21 @@ def register_websocket_routes(app: FastAPI, connection_manager: ConnectionManage
         try:
             while True:
                 data = await websocket.receive_json()
+                connection_manager.touch(websocket)
                 msg_type = data.get("type")
                 _log.debug("WebSocket desktop received type=%s", msg_type)
+                if msg_type == "pong":
+                    continue
                 if msg_type in ["state", "update"]:
-                    await connection_manager.broadcast_from_desktop(data)
-                    connection_manager.desktop_state = data.get("data", {})
-                elif msg_type == "dom":
-                    pass
+                    connection_manager.queue_from_desktop(data)
+                elif msg_type == "state_resync":
+                    connection_manager.send_state_snapshot(websocket)
+                elif msg_type == "subscribe":
+                    connection_manager.subscribe(websocket, data.get("types") or [])
+                elif msg_type in MIRROR_MESSAGE_TYPES:
+                    connection_manager.relay_mirror(data, websocket)
+                elif msg_type in DATA_MESSAGE_TYPES:
+                    handle_data_message(websocket, data)
         except WebSocketDisconnect:
             _log.log(DETAILED_LEVEL, "WebSocket: desktop disconnected")
             await connection_manager.disconnect(websocket)
@@ -43,10 +87,21 @@ def register_websocket_routes(app: FastAPI, connection_manager: ConnectionManage
             while True:
                 try:
                     data = await websocket.receive_json()
+                    connection_manager.touch(websocket)
                     msg_type = data.get("type")
                     _log.debug("WebSocket browser received type=%s", msg_type)
-                    if data.get("type") in ["state", "update"]:
-                        await connection_manager.broadcast_from_browser(data, websocket)
+                    if msg_type == "pong":
+                        continue
+                    if msg_type in ["state", "update"]:
+                        connection_manager.queue_from_browser(data, websocket)
+                    elif msg_type == "state_resync":
+                        connection_manager.send_state_snapshot(websocket)
+                    elif msg_type == "subscribe":
+                        connection_manager.subscribe(websocket, data.get("types") or [])
+                    elif msg_type in MIRROR_MESSAGE_TYPES:
+                        connection_manager.relay_mirror(data, websocket)
+                    elif msg_type in DATA_MESSAGE_TYPES:
+                        handle_data_message(websocket, data)
                 except ValueError:
                     await websocket.receive_text()
         except WebSocketDisconnect:
@@ -58,12 +113,20 @@ def register_websocket_routes(app: FastAPI, connection_manager: ConnectionManage
 
     @app.websocket("/ws/readonly")
     async def websocket_readonly(websocket: WebSocket):
-        """WebSocket endpoint for read-only portal (receives config_update only)."""
+        """WebSocket endpoint for read-only portal (config_update and heartbeat pings; module data is polled)."""
         _log.log(DETAILED_LEVEL, "WebSocket: readonly connected")
         await connection_manager.connect_readonly(websocket)
         try:
             while True:
-                await websocket.receive_text()
+                text = await websocket.receive_text()
+                connection_manager.touch(websocket)
+                try:
+                    data = json.loads(text)
+                except ValueError:
+                    continue
+                if isinstance(data, dict) and data.get("type") == "data_subscribe":
+                    # The read-only portal is unauthenticated: no server-side fetches, the page polls instead
+                    connection_manager.send(websocket, {"type": "data_rejected", "key": str(data.get("url") or "")})
         except WebSocketDisconnect:
             _log.log(DETAILED_LEVEL, "WebSocket: readonly disconnected")
             await connection_manager.disconnect(websocket)
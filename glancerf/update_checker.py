@@ -18,6 +18,7 @@ from glancerf import __version__
 from glancerf.config import get_config
 from glancerf.logging_config import DETAILED_LEVEL, get_logger
 from glancerf.updater import perform_auto_update
+from glancerf.websocket_manager import TOPIC_UPDATES
 
 _log = get_logger("update_checker")
 
@@ -175,7 +176,7 @@ class UpdateChecker:
             delay_seconds: How long to wait before restarting
         """
         # Send notification about pending restart
-        await self.connection_manager.broadcast_update_notification({
+        self.connection_manager.publish(TOPIC_UPDATES, {
             "type": "update_available",
             "data": {
                 "current_version": __version__,
@@ -189,9 +190,16 @@ class UpdateChecker:
         # Wait before restarting
         await asyncio.sleep(delay_seconds)
         
+        # Write pending config changes first: os._exit below skips atexit (and the write-behind flush),
+        # and the restarted process must read them
+        try:
+            get_config().flush()
+        except Exception as e:
+            _log.error("Failed to write config before restart: %s", e)
+
         # Restart the application
         from glancerf.updater import create_restart_script
-        
+
         restart_script = create_restart_script()
         if restart_script:
             try:
@@ -229,7 +237,7 @@ class UpdateChecker:
         if update_message:
             message["data"]["update_message"] = update_message
         
-        await self.connection_manager.broadcast_update_notification(message)
+        self.connection_manager.publish(TOPIC_UPDATES, message)
     
     async def run_scheduled_checks(self):
         """Background task: check for updates at configured time daily."""
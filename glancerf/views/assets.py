@@ -0,0 +1,20 @@
+"""
+Tags that reference the fingerprinted module CSS/JS bundles from the page templates.
+"""
+
+import html
+from typing import Optional
+
+
+def module_css_tag(url: Optional[str]) -> str:
+    """<link> for the module CSS bundle, or empty if the layout has no module CSS."""
+    if not url:
+        return ""
+    return '    <link rel="stylesheet" href="%s">' % html.escape(url, quote=True)
+
+
+def module_js_tag(url: Optional[str]) -> str:
+    """<script> for the module JS bundle (runs after main.js, like the inline script it replaces)."""
+    if not url:
+        return ""
+    return '    <script src="%s"></script>' % html.escape(url, quote=True)
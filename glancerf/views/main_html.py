@@ -4,6 +4,9 @@ Loads template and assets from glancerf/web/ (templates/main/, static/css/, stat
 """
 
 from pathlib import Path
+from typing import Optional
+
+from glancerf.views.assets import module_css_tag, module_js_tag
 
 _WEB_DIR = Path(__file__).resolve().parent.parent / "web"
 _MAIN_TEMPLATE_PATH = _WEB_DIR / "templates" / "main" / "index.html"
@@ -23,21 +26,19 @@ def render_main_page(
     grid_css: str,
     grid_html: str,
     aspect_ratio: str,
-    module_css: str = "",
-    module_js: str = "",
+    module_css_url: Optional[str] = None,
+    module_js_url: Optional[str] = None,
     module_settings_json: str = "{}",
     setup_callsign_json: str = '""',
     setup_location_json: str = '""',
 ) -> str:
     """Render the main clock page HTML with WebSocket and aspect-ratio support."""
-    module_css = module_css if module_css is not None else ""
-    module_js = module_js if module_js is not None else ""
     return _get_main_template().format(
         aspect_ratio_css=aspect_ratio_css,
         grid_css=grid_css,
         grid_html=grid_html,
-        module_css=module_css,
-        module_js=module_js,
+        module_css_tag=module_css_tag(module_css_url),
+        module_js_tag=module_js_tag(module_js_url),
         module_settings_json=module_settings_json,
         setup_callsign_json=setup_callsign_json,
         setup_location_json=setup_location_json,
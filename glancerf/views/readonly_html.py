@@ -4,6 +4,9 @@ Loads template and assets from glancerf/web/ (templates/readonly/, static/css/,
 """
 
 from pathlib import Path
+from typing import Optional
+
+from glancerf.views.assets import module_css_tag, module_js_tag
 
 _WEB_DIR = Path(__file__).resolve().parent.parent / "web"
 _READONLY_TEMPLATE_PATH = _WEB_DIR / "templates" / "readonly" / "index.html"
@@ -23,22 +26,20 @@ def render_readonly_page(
     grid_css: str,
     grid_html: str,
     aspect_ratio: str,
-    module_css: str = "",
-    module_js: str = "",
+    module_css_url: Optional[str] = None,
+    module_js_url: Optional[str] = None,
     module_settings_json: str = "{}",
     setup_callsign_json: str = '""',
     setup_location_json: str = '""',
     main_port: int = 8080,
 ) -> str:
     """Render the read-only clock page HTML (same structure as main, no interactions)."""
-    module_css = module_css if module_css is not None else ""
-    module_js = module_js if module_js is not None else ""
     return _get_readonly_template().format(
         aspect_ratio_css=aspect_ratio_css,
         grid_css=grid_css,
         grid_html=grid_html,
-        module_css=module_css,
-        module_js=module_js,
+        module_css_tag=module_css_tag(module_css_url),
+        module_js_tag=module_js_tag(module_js_url),
         module_settings_json=module_settings_json,
         setup_callsign_json=setup_callsign_json,
         setup_location_json=setup_location_json,
@@ -0,0 +1,131 @@
+// Module data bus client. Modules call GlanceRFData.watch(id, url, intervalMs, callback) instead of
+// polling url themselves. While a WebSocket is attached the server fetches url once for every display
+// and pushes {type: 'module_data', key: url, status, data} when it changes; without one, url is polled
+// with fetch every intervalMs. callback receives {ok, status, data}.
+var GlanceRFData = (function() {
+    var watches = {};
+    var latest = {};
+    var rejected = {};
+    var ws = null;
+
+    function isOpen() {
+        return ws !== null && ws.readyState === WebSocket.OPEN;
+    }
+
+    function deliver(url, result) {
+        latest[url] = result;
+        Object.keys(watches).forEach(function(id) {
+            var w = watches[id];
+            if (w.url === url) w.callback(result);
+        });
+    }
+
+    function poll(w) {
+        fetch(w.url).then(function(r) {
+            return r.json().then(function(data) {
+                return { ok: r.ok, status: r.status, data: data };
+            });
+        }).then(function(result) {
+            if (watches[w.id] === w) w.callback(result);
+        }).catch(function(err) {
+            if (watches[w.id] === w) {
+                w.callback({ ok: false, status: 0, data: { error: (err && err.message) ? err.message : 'Network error' } });
+            }
+        });
+    }
+
+    function startPolling(w) {
+        stopPolling(w);
+        poll(w);
+        w.timer = setInterval(function() { poll(w); }, w.intervalMs);
+    }
+
+    function stopPolling(w) {
+        if (w.timer) clearInterval(w.timer);
+        w.timer = null;
+    }
+
+    function send(message) {
+        if (isOpen()) ws.send(JSON.stringify(message));
+    }
+
+    function subscribeAll() {
+        var intervals = {};
+        Object.keys(watches).forEach(function(id) {
+            var w = watches[id];
+            if (rejected[w.url]) return;
+            stopPolling(w);
+            if (intervals[w.url] === undefined || w.intervalMs < intervals[w.url]) intervals[w.url] = w.intervalMs;
+        });
+        Object.keys(intervals).forEach(function(url) {
+            send({ type: 'data_subscribe', url: url, interval_ms: intervals[url] });
+        });
+    }
+
+    function pollAll() {
+        Object.keys(watches).forEach(function(id) { startPolling(watches[id]); });
+    }
+
+    function onMessage(event) {
+        // Cheap check first: state frames can be large and are parsed by the page's own handler
+        if (typeof event.data !== 'string') return;
+        if (event.data.indexOf('"module_data"') < 0 && event.data.indexOf('"data_rejected"') < 0) return;
+        var message;
+        try { message = JSON.parse(event.data); } catch (e) { return; }
+        if (!message || typeof message.key !== 'string') return;
+        if (message.type === 'data_rejected') {
+            // Not a pushed data source on this server: poll it instead
+            rejected[message.key] = true;
+            Object.keys(watches).forEach(function(id) {
+                if (watches[id].url === message.key && !watches[id].timer) startPolling(watches[id]);
+            });
+            return;
+        }
+        if (message.type !== 'module_data') return;
+        var status = message.status || 0;
+        deliver(message.key, { ok: status >= 200 && status < 400, status: status, data: message.data });
+    }
+
+    // Use socket for pushes (call right after creating it, and again after every reconnect).
+    function attach(socket) {
+        ws = socket;
+        socket.addEventListener('open', function() {
+            if (ws === socket) subscribeAll();
+        });
+        socket.addEventListener('message', onMessage);
+        socket.addEventListener('close', function() {
+            if (ws === socket) {
+                ws = null;
+                pollAll();
+            }
+        });
+        if (socket.readyState === WebSocket.OPEN) subscribeAll();
+    }
+
+    // Watch url for the caller identified by id (e.g. a cell); a later watch with the same id replaces it.
+    function watch(id, url, intervalMs, callback) {
+        var prev = watches[id];
+        if (prev) {
+            stopPolling(prev);
+            delete watches[id];
+            if (prev.url !== url && !isWatched(prev.url)) send({ type: 'data_unsubscribe', url: prev.url });
+        }
+        var w = { id: id, url: url, intervalMs: intervalMs, callback: callback, timer: null };
+        watches[id] = w;
+        if (isOpen() && !rejected[url]) {
+            send({ type: 'data_subscribe', url: url, interval_ms: intervalMs });
+            if (latest[url]) callback(latest[url]);
+        } else if (rejected[url] || ws === null || ws.readyState !== WebSocket.CONNECTING) {
+            startPolling(w);
+        }
+    }
+
+    function isWatched(url) {
+        return Object.keys(watches).some(function(id) { return watches[id].url === url; });
+    }
+
+    return {
+        attach: attach,
+        watch: watch
+    };
+})();
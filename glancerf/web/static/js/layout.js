@@ -553,7 +553,7 @@ var currentDesktopWidth = 0;
                 const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
                 const wsUrl = `${protocol}//${window.location.host}/ws/desktop`;
                 console.log('Desktop connecting to WebSocket (layout):', wsUrl);
-                ws = new WebSocket(wsUrl);
+                ws = GlanceRFState.connect(wsUrl);
             
                 ws.onerror = function(error) {
                     console.error('Desktop WebSocket error (layout):', error);
@@ -565,17 +565,23 @@ var currentDesktopWidth = 0;
             
                 // Desktop receives updates from browsers
                 ws.onmessage = function(event) {
-                    const message = JSON.parse(event.data);
+                    const message = GlanceRFState.decode(event.data);
+                    if (message.type === 'ping') {
+                        ws.send('{"type":"pong"}');
+                        return;
+                    }
                 
                     if (message.type === 'config_update') {
                         console.log('Config updated, reloading page...');
                         window.location.reload();
                         return;
                     }
-                    if (message.type === 'state') {
-                        if (message.data.desktop_width !== undefined && message.data.desktop_height !== undefined) {
-                            currentDesktopWidth = message.data.desktop_width || 0;
-                            currentDesktopHeight = message.data.desktop_height || 0;
+                    if (message.type === 'state' || message.type === 'state_patch') {
+                        var mirrored = GlanceRFState.handle(message, ws);
+                        if (!mirrored) return;
+                        if (mirrored.desktop_width !== undefined && mirrored.desktop_height !== undefined) {
+                            currentDesktopWidth = mirrored.desktop_width || 0;
+                            currentDesktopHeight = mirrored.desktop_height || 0;
                         } else {
                             currentDesktopWidth = 0;
                             currentDesktopHeight = 0;
@@ -784,7 +790,7 @@ var currentDesktopWidth = 0;
                 const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
                 const wsUrl = `${protocol}//${window.location.host}/ws/browser`;
                 console.log('Browser connecting to WebSocket (layout):', wsUrl);
-                ws = new WebSocket(wsUrl);
+                ws = GlanceRFState.connect(wsUrl);
             
                 ws.onerror = function(error) {
                     console.error('Browser WebSocket error (layout):', error);
@@ -866,17 +872,23 @@ var currentDesktopWidth = 0;
                 }
             
                 ws.onmessage = function(event) {
-                    const message = JSON.parse(event.data);
+                    const message = GlanceRFState.decode(event.data);
+                    if (message.type === 'ping') {
+                        ws.send('{"type":"pong"}');
+                        return;
+                    }
                 
                     if (message.type === 'config_update') {
                         console.log('Config updated, reloading page...');
                         window.location.reload();
                         return;
                     }
-                    if (message.type === 'state') {
-                        if (message.data.desktop_width !== undefined && message.data.desktop_height !== undefined) {
-                            currentDesktopWidth = message.data.desktop_width || 0;
-                            currentDesktopHeight = message.data.desktop_height || 0;
+                    if (message.type === 'state' || message.type === 'state_patch') {
+                        var mirrored = GlanceRFState.handle(message, ws);
+                        if (!mirrored) return;
+                        if (mirrored.desktop_width !== undefined && mirrored.desktop_height !== undefined) {
+                            currentDesktopWidth = mirrored.desktop_width || 0;
+                            currentDesktopHeight = mirrored.desktop_height || 0;
                         } else {
                             currentDesktopWidth = 0;
                             currentDesktopHeight = 0;
@@ -43,6 +43,104 @@
             if (wsLostIntervalId) { clearInterval(wsLostIntervalId); wsLostIntervalId = null; }
             if (wsReconnectIntervalId) { clearInterval(wsReconnectIntervalId); wsReconnectIntervalId = null; }
         }
+
+        // Mirroring: on connect (and when subscriptions change) the server sends a 'hello' listing the
+        // message types it wants from this page. form_state (form values, scroll, focus) is only sent
+        // while another client subscribes to it; dom_summary is a hash of the page, never the page itself.
+        let serverWants = {};
+        let lastSentFormState = '';
+        let lastSentDomSummary = '';
+        let mirrorScheduled = false;
+
+        function handleHello(message) {
+            serverWants = {};
+            (message.wants || []).forEach(function(t) { serverWants[t] = true; });
+            lastSentFormState = '';
+            lastSentDomSummary = '';
+            scheduleMirrorState();
+        }
+
+        function captureFormState() {
+            const formState = {};
+            document.querySelectorAll('input, select, textarea').forEach(function(el) {
+                const id = el.id || el.name;
+                if (id) {
+                    if (el.type === 'checkbox' || el.type === 'radio') {
+                        formState[id] = el.checked;
+                    } else {
+                        formState[id] = el.value;
+                    }
+                }
+            });
+            return formState;
+        }
+
+        function captureActiveElement() {
+            const el = document.activeElement;
+            if (!el || el === document.body) return null;
+            return {
+                tag: el.tagName,
+                id: el.id || null,
+                name: el.name || null,
+                type: el.type || null,
+                value: el.value || null,
+                checked: el.checked || null,
+                // For select elements, capture if dropdown is open
+                size: el.tagName === 'SELECT' ? el.size : null,
+                selectedIndex: el.tagName === 'SELECT' ? el.selectedIndex : null
+            };
+        }
+
+        // FNV-1a 32-bit hash, hex
+        function hashString(str) {
+            let h = 0x811c9dc5;
+            for (let i = 0; i < str.length; i++) {
+                h ^= str.charCodeAt(i);
+                h = Math.imul(h, 0x01000193);
+            }
+            return (h >>> 0).toString(16);
+        }
+
+        function sendMirrorState() {
+            // Only sync on main dashboard page
+            if (!shouldSyncPage()) return;
+            if (!ws || ws.readyState !== WebSocket.OPEN) return;
+            if (serverWants.form_state) {
+                const data = {
+                    url: window.location.href,
+                    formState: captureFormState(),
+                    scrollState: { x: window.scrollX, y: window.scrollY },
+                    activeElement: captureActiveElement()
+                };
+                const serialized = JSON.stringify(data);
+                if (serialized !== lastSentFormState) {
+                    lastSentFormState = serialized;
+                    ws.send(JSON.stringify({ type: 'form_state', data: data }));
+                }
+            }
+            if (serverWants.dom_summary) {
+                const html = document.body ? document.body.innerHTML : '';
+                const summary = { url: window.location.href, length: html.length, hash: hashString(html) };
+                const serialized = JSON.stringify(summary);
+                if (serialized !== lastSentDomSummary) {
+                    lastSentDomSummary = serialized;
+                    ws.send(JSON.stringify({ type: 'dom_summary', data: summary }));
+                }
+            }
+        }
+
+        function scheduleMirrorState() {
+            if (mirrorScheduled || !(serverWants.form_state || serverWants.dom_summary)) return;
+            mirrorScheduled = true;
+            requestAnimationFrame(function() {
+                mirrorScheduled = false;
+                sendMirrorState();
+            });
+        }
+
+        ['input', 'change', 'focus', 'scroll'].forEach(function(eventName) {
+            document.addEventListener(eventName, scheduleMirrorState, true);
+        });
         
         if (isDesktop) {
             const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
@@ -59,7 +157,11 @@
                     showWsLostStartTimer(desktopReconnect);
                 };
                 ws.onmessage = function(event) {
-                    const message = JSON.parse(event.data);
+                    const message = GlanceRFState.decode(event.data);
+                    if (message.type === 'ping') {
+                        ws.send('{"type":"pong"}');
+                        return;
+                    }
                     if (message.type === 'config_update') {
                         console.log('Config updated, reloading page...');
                         window.location.reload();
@@ -69,7 +171,10 @@
                         showUpdateNotification(message.data);
                         return;
                     }
-                    if (message.type === 'dom') return;
+                    if (message.type === 'hello') {
+                        handleHello(message);
+                        return;
+                    }
                 };
                 ws.onopen = function() {
                     console.log('Desktop app connected to mirroring server');
@@ -79,179 +184,20 @@
             function desktopReconnect() {
                 if (ws && ws.readyState === WebSocket.OPEN) return;
                 console.log('Attempting to reconnect desktop WebSocket...');
-                ws = new WebSocket(wsUrl);
+                ws = GlanceRFState.connect(wsUrl);
+                GlanceRFData.attach(ws);
                 attachDesktopHandlers();
             }
             
-            ws = new WebSocket(wsUrl);
+            ws = GlanceRFState.connect(wsUrl);
+            GlanceRFData.attach(ws);
             attachDesktopHandlers();
-            
-            // Cache last sent state to avoid sending duplicates
-            let lastSentHtml = '';
-            let lastSentFormState = '';
-            let lastSentScrollState = '';
-            let lastSentActiveElement = '';
-            
-            function sendDesktopState() {
-                // Only sync on main dashboard page
-                if (!shouldSyncPage()) return;
-                
-                if (ws && ws.readyState === WebSocket.OPEN) {
-                    // Capture all form element values
-                    const formState = {};
-                    document.querySelectorAll('input, select, textarea').forEach(function(el) {
-                        const id = el.id || el.name;
-                        if (id) {
-                            if (el.type === 'checkbox' || el.type === 'radio') {
-                                formState[id] = el.checked;
-                            } else {
-                                formState[id] = el.value;
-                            }
-                        }
-                    });
-                    
-                    // Capture scroll positions
-                    const scrollState = {
-                        x: window.scrollX,
-                        y: window.scrollY
-                    };
-                    
-                    // Capture active element details
-                    let activeElementState = null;
-                    if (document.activeElement) {
-                        const el = document.activeElement;
-                        activeElementState = {
-                            tag: el.tagName,
-                            id: el.id || null,
-                            name: el.name || null,
-                            type: el.type || null,
-                            value: el.value || null,
-                            checked: el.checked || null,
-                            // For select elements, capture if dropdown is open
-                            size: el.tagName === 'SELECT' ? el.size : null,
-                            selectedIndex: el.tagName === 'SELECT' ? el.selectedIndex : null
-                        };
-                    }
-                    
-                    // Serialize for comparison
-                    const currentHtml = document.documentElement.outerHTML;
-                    const currentFormState = JSON.stringify(formState);
-                    const currentScrollState = JSON.stringify(scrollState);
-                    const currentActiveElement = JSON.stringify(activeElementState);
-                    
-                    // Only send if something actually changed
-                    if (currentHtml !== lastSentHtml || 
-                        currentFormState !== lastSentFormState || 
-                        currentScrollState !== lastSentScrollState ||
-                        currentActiveElement !== lastSentActiveElement) {
-                        
-                        // Update cache
-                        lastSentHtml = currentHtml;
-                        lastSentFormState = currentFormState;
-                        lastSentScrollState = currentScrollState;
-                        lastSentActiveElement = currentActiveElement;
-                        
-                        // Send current DOM state with all interactive states
-                        ws.send(JSON.stringify({
-                            type: 'dom',
-                            data: {
-                                html: currentHtml,
-                                url: window.location.href,
-                                formState: formState,
-                                scrollState: scrollState,
-                                activeElement: activeElementState
-                            }
-                        }));
-                    }
-                }
-            }
         } else {
             // Web browser connects to /ws/browser for two-way mirroring
             const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
             const wsUrl = `${protocol}//${window.location.host}/ws/browser`;
             console.log('Browser connecting to WebSocket:', wsUrl);
             
-            // Cache last sent state to avoid sending duplicates
-            let lastSentHtml = '';
-            let lastSentFormState = '';
-            let lastSentScrollState = '';
-            let lastSentActiveElement = '';
-            
-            // Function to send browser state updates
-            function sendBrowserState() {
-                // Only sync on main dashboard page
-                if (!shouldSyncPage()) return;
-                
-                if (ws && ws.readyState === WebSocket.OPEN) {
-                    // Capture all form element values
-                    const formState = {};
-                    document.querySelectorAll('input, select, textarea').forEach(function(el) {
-                        const id = el.id || el.name;
-                        if (id) {
-                            if (el.type === 'checkbox' || el.type === 'radio') {
-                                formState[id] = el.checked;
-                            } else {
-                                formState[id] = el.value;
-                            }
-                        }
-                    });
-                    
-                    // Capture scroll positions
-                    const scrollState = {
-                        x: window.scrollX,
-                        y: window.scrollY
-                    };
-                    
-                    // Capture active element details
-                    let activeElementState = null;
-                    if (document.activeElement) {
-                        const el = document.activeElement;
-                        activeElementState = {
-                            tag: el.tagName,
-                            id: el.id || null,
-                            name: el.name || null,
-                            type: el.type || null,
-                            value: el.value || null,
-                            checked: el.checked || null,
-                            // For select elements, capture if dropdown is open
-                            size: el.tagName === 'SELECT' ? el.size : null,
-                            selectedIndex: el.tagName === 'SELECT' ? el.selectedIndex : null
-                        };
-                    }
-                    
-                    // Serialize for comparison
-                    const currentHtml = document.documentElement.outerHTML;
-                    const currentFormState = JSON.stringify(formState);
-                    const currentScrollState = JSON.stringify(scrollState);
-                    const currentActiveElement = JSON.stringify(activeElementState);
-                    
-                    // Only send if something actually changed
-                    if (currentHtml !== lastSentHtml || 
-                        currentFormState !== lastSentFormState || 
-                        currentScrollState !== lastSentScrollState ||
-                        currentActiveElement !== lastSentActiveElement) {
-                        
-                        // Update cache
-                        lastSentHtml = currentHtml;
-                        lastSentFormState = currentFormState;
-                        lastSentScrollState = currentScrollState;
-                        lastSentActiveElement = currentActiveElement;
-                        
-                        // Send current DOM state with all interactive states
-                        ws.send(JSON.stringify({
-                            type: 'dom',
-                            data: {
-                                html: currentHtml,
-                                url: window.location.href,
-                                formState: formState,
-                                scrollState: scrollState,
-                                activeElement: activeElementState
-                            }
-                        }));
-                    }
-                }
-            }
-            
             function attachBrowserHandlers() {
                 ws.onerror = function(error) {
                     console.error('Browser WebSocket error:', error);
@@ -262,7 +208,11 @@
                     showWsLostStartTimer(browserReconnect);
                 };
                 ws.onmessage = function(event) {
-                    const message = JSON.parse(event.data);
+                    const message = GlanceRFState.decode(event.data);
+                    if (message.type === 'ping') {
+                        ws.send('{"type":"pong"}');
+                        return;
+                    }
                     if (message.type === 'config_update') {
                         console.log('Config updated, reloading page...');
                         window.location.reload();
@@ -272,9 +222,13 @@
                         showUpdateNotification(message.data);
                         return;
                     }
-                    if (message.type === 'dom') return;
-                    if (message.type === 'state') {
-                        if (message.data.grid_columns !== undefined || message.data.grid_rows !== undefined) {
+                    if (message.type === 'hello') {
+                        handleHello(message);
+                        return;
+                    }
+                    if (message.type === 'state' || message.type === 'state_patch') {
+                        var mirrored = GlanceRFState.handle(message, ws);
+                        if (mirrored && (mirrored.grid_columns !== undefined || mirrored.grid_rows !== undefined)) {
                             location.reload();
                         }
                     }
@@ -287,11 +241,13 @@
             function browserReconnect() {
                 if (ws && ws.readyState === WebSocket.OPEN) return;
                 console.log('Attempting to reconnect browser WebSocket...');
-                ws = new WebSocket(wsUrl);
+                ws = GlanceRFState.connect(wsUrl);
+                GlanceRFData.attach(ws);
                 attachBrowserHandlers();
             }
             
-            ws = new WebSocket(wsUrl);
+            ws = GlanceRFState.connect(wsUrl);
+            GlanceRFData.attach(ws);
             attachBrowserHandlers();
         }
         
@@ -1,4 +1,5 @@
-// Read-only view: no desktop/browser sync. Connects to main server WebSocket for config_update (layout/module changes) and reloads.
+// Read-only view: no desktop/browser sync. Connects to main server WebSocket for config_update (layout/module changes)
+// and reloads; module data is pushed over the same socket (the read-only server has no /api routes).
 (function() {
     var mainPort = typeof window.GLANCERF_MAIN_PORT !== 'undefined' ? window.GLANCERF_MAIN_PORT : 8080;
     var wsUrl = 'ws://' + location.hostname + ':' + mainPort + '/ws/readonly';
@@ -6,10 +7,13 @@
     function connect() {
         try {
             ws = new WebSocket(wsUrl);
+            if (typeof GlanceRFData !== 'undefined') GlanceRFData.attach(ws);
             ws.onmessage = function(event) {
                 try {
                     var msg = JSON.parse(event.data);
-                    if (msg && msg.type === 'config_update') {
+                    if (msg && msg.type === 'ping') {
+                        ws.send('{"type":"pong"}');
+                    } else if (msg && msg.type === 'config_update') {
                         window.location.reload();
                     }
                 } catch (e) {}
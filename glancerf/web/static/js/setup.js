@@ -232,8 +232,11 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                 initializeSetup();
             }
         
-            // Connect to WebSocket for mirroring
+            // Connect to WebSocket for mirroring. Both sides subscribe to form_state; the server's
+            // 'hello' says whether anyone else wants ours, so nothing is sent while no one is listening.
             let ws = null;
+            let serverWants = {};
+            let lastSentFormState = '';
             const urlParams = new URLSearchParams(window.location.search);
             const isDesktop = urlParams.get('desktop') === 'true' || window.navigator.userAgent.includes('QtWebEngine');
         
@@ -251,6 +254,10 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
             
                 ws.onmessage = function(event) {
                     const message = JSON.parse(event.data);
+                    if (message.type === 'ping') {
+                        ws.send('{"type":"pong"}');
+                        return;
+                    }
                 
                     if (message.type === 'config_update') {
                         // Navigate to main so we don't reload /setup (redirect may not have completed yet)
@@ -263,8 +270,16 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                         return;
                     }
                 
-                    if (message.type === 'dom') {
-                        if (message.data && message.data.html) {
+                    if (message.type === 'hello') {
+                        serverWants = {};
+                        (message.wants || []).forEach(function(t) { serverWants[t] = true; });
+                        lastSentFormState = '';
+                        sendDesktopState();
+                        return;
+                    }
+                
+                    if (message.type === 'form_state') {
+                        if (message.data) {
                             var incomingUrl = message.data.url || '';
                             var incomingPath = (function() {
                                 try {
@@ -297,6 +312,7 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                 };
             
                 ws.onopen = function() {
+                    ws.send(JSON.stringify({ type: 'subscribe', types: ['form_state'] }));
                     sendDesktopState();
                 
                     // Monitor DOM changes and send updates
@@ -354,10 +370,8 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                     document.addEventListener('mouseup', onMouseUp, true);
                 };
             
-                let lastSentHtml = '';
-                let lastSentFormState = '';
-            
                 function sendDesktopState() {
+                    if (!serverWants.form_state) return;
                     if (ws && ws.readyState === WebSocket.OPEN) {
                         const formState = {};
                         document.querySelectorAll('input, select, textarea').forEach(function(el) {
@@ -371,16 +385,13 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                             }
                         });
                     
-                        const currentHtml = document.documentElement.outerHTML;
                         const currentFormState = JSON.stringify(formState);
                     
-                        if (currentHtml !== lastSentHtml || currentFormState !== lastSentFormState) {
-                            lastSentHtml = currentHtml;
+                        if (currentFormState !== lastSentFormState) {
                             lastSentFormState = currentFormState;
                             ws.send(JSON.stringify({
-                                type: 'dom',
+                                type: 'form_state',
                                 data: {
-                                    html: currentHtml,
                                     url: window.location.href,
                                     formState: formState
                                 }
@@ -402,6 +413,10 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
             
                 ws.onmessage = function(event) {
                     const message = JSON.parse(event.data);
+                    if (message.type === 'ping') {
+                        ws.send('{"type":"pong"}');
+                        return;
+                    }
                 
                     if (message.type === 'config_update') {
                         // Navigate to main so we don't reload /setup (redirect may not have completed yet)
@@ -414,8 +429,16 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                         return;
                     }
                 
-                    if (message.type === 'dom') {
-                        if (message.data && message.data.html) {
+                    if (message.type === 'hello') {
+                        serverWants = {};
+                        (message.wants || []).forEach(function(t) { serverWants[t] = true; });
+                        lastSentFormState = '';
+                        sendBrowserState();
+                        return;
+                    }
+                
+                    if (message.type === 'form_state') {
+                        if (message.data) {
                             var incomingUrl = message.data.url || '';
                             var incomingPath = (function() {
                                 try {
@@ -448,6 +471,7 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                 };
             
                 ws.onopen = function() {
+                    ws.send(JSON.stringify({ type: 'subscribe', types: ['form_state'] }));
                     sendBrowserState();
                 
                     let updateScheduled = false;
@@ -503,10 +527,8 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                     document.addEventListener('mouseup', onBrowserMouseUp, true);
                 };
             
-                let lastSentHtml = '';
-                let lastSentFormState = '';
-            
                 function sendBrowserState() {
+                    if (!serverWants.form_state) return;
                     if (ws && ws.readyState === WebSocket.OPEN) {
                         const formState = {};
                         document.querySelectorAll('input, select, textarea').forEach(function(el) {
@@ -520,16 +542,13 @@ function isSubmitButton(el) { return el && (el.type === 'submit' || (el.tagName
                             }
                         });
                     
-                        const currentHtml = document.documentElement.outerHTML;
                         const currentFormState = JSON.stringify(formState);
                     
-                        if (currentHtml !== lastSentHtml || currentFormState !== lastSentFormState) {
-                            lastSentHtml = currentHtml;
+                        if (currentFormState !== lastSentFormState) {
                             lastSentFormState = currentFormState;
                             ws.send(JSON.stringify({
-                                type: 'dom',
+                                type: 'form_state',
                                 data: {
-                                    html: currentHtml,
                                     url: window.location.href,
                                     formState: formState
                                 }
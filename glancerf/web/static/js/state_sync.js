@@ -0,0 +1,139 @@
+// Mirrored desktop state: the server sends a full 'state' snapshot (with version) on connect or
+// when a client lags, then 'state_patch' deltas (JSON-patch style ops) against the previous version.
+// State frames may arrive as MessagePack binary frames; decode() accepts both.
+var GlanceRFState = (function() {
+    var state = null;
+    var version = null;
+
+    function unescapeToken(token) {
+        return token.replace(/~1/g, '/').replace(/~0/g, '~');
+    }
+
+    function applyOp(op) {
+        if (op.path === '') {
+            state = op.op === 'remove' ? {} : op.value;
+            return;
+        }
+        var tokens = op.path.split('/').slice(1).map(unescapeToken);
+        var target = state;
+        for (var i = 0; i < tokens.length - 1; i++) {
+            if (target[tokens[i]] === null || typeof target[tokens[i]] !== 'object') target[tokens[i]] = {};
+            target = target[tokens[i]];
+        }
+        var last = tokens[tokens.length - 1];
+        if (op.op === 'remove') {
+            delete target[last];
+        } else {
+            target[last] = op.value;
+        }
+    }
+
+    // Apply a 'state' or 'state_patch' message. Returns the full mirrored state, or null if the
+    // message was not a state message or a version gap was found (a resync is then requested on ws).
+    function handle(message, ws) {
+        if (message.type === 'state') {
+            state = message.data || {};
+            version = message.version !== undefined ? message.version : null;
+            return state;
+        }
+        if (message.type !== 'state_patch') return null;
+        if (state === null || version !== message.base) {
+            state = null;
+            version = null;
+            if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'state_resync' }));
+            return null;
+        }
+        (message.patch || []).forEach(applyOp);
+        version = message.version;
+        return state;
+    }
+
+    // Minimal MessagePack decoder for binary frames (server sends them when connected with ?encoding=msgpack)
+    function decodeMsgpack(buffer) {
+        var view = new DataView(buffer);
+        var bytes = new Uint8Array(buffer);
+        var pos = 0;
+        var utf8 = new TextDecoder('utf-8');
+
+        function str(len) {
+            var s = utf8.decode(bytes.subarray(pos, pos + len));
+            pos += len;
+            return s;
+        }
+        function bin(len) {
+            var b = bytes.slice(pos, pos + len);
+            pos += len;
+            return b;
+        }
+        function arr(len) {
+            var out = new Array(len);
+            for (var i = 0; i < len; i++) out[i] = read();
+            return out;
+        }
+        function map(len) {
+            var out = {};
+            for (var i = 0; i < len; i++) {
+                var key = read();
+                out[key] = read();
+            }
+            return out;
+        }
+        function read() {
+            var b = bytes[pos++];
+            var v;
+            if (b <= 0x7f) return b;
+            if (b <= 0x8f) return map(b & 0x0f);
+            if (b <= 0x9f) return arr(b & 0x0f);
+            if (b <= 0xbf) return str(b & 0x1f);
+            if (b >= 0xe0) return b - 0x100;
+            switch (b) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xc4: v = bytes[pos]; pos += 1; return bin(v);
+                case 0xc5: v = view.getUint16(pos); pos += 2; return bin(v);
+                case 0xc6: v = view.getUint32(pos); pos += 4; return bin(v);
+                case 0xca: v = view.getFloat32(pos); pos += 4; return v;
+                case 0xcb: v = view.getFloat64(pos); pos += 8; return v;
+                case 0xcc: v = bytes[pos]; pos += 1; return v;
+                case 0xcd: v = view.getUint16(pos); pos += 2; return v;
+                case 0xce: v = view.getUint32(pos); pos += 4; return v;
+                case 0xcf: v = view.getUint32(pos) * 4294967296 + view.getUint32(pos + 4); pos += 8; return v;
+                case 0xd0: v = view.getInt8(pos); pos += 1; return v;
+                case 0xd1: v = view.getInt16(pos); pos += 2; return v;
+                case 0xd2: v = view.getInt32(pos); pos += 4; return v;
+                case 0xd3: v = view.getInt32(pos) * 4294967296 + view.getUint32(pos + 4); pos += 8; return v;
+                case 0xd9: v = bytes[pos]; pos += 1; return str(v);
+                case 0xda: v = view.getUint16(pos); pos += 2; return str(v);
+                case 0xdb: v = view.getUint32(pos); pos += 4; return str(v);
+                case 0xdc: v = view.getUint16(pos); pos += 2; return arr(v);
+                case 0xdd: v = view.getUint32(pos); pos += 4; return arr(v);
+                case 0xde: v = view.getUint16(pos); pos += 2; return map(v);
+                case 0xdf: v = view.getUint32(pos); pos += 4; return map(v);
+            }
+            throw new Error('Unsupported MessagePack type 0x' + b.toString(16));
+        }
+        return read();
+    }
+
+    // Decode a WebSocket frame: text frames are JSON, binary frames are MessagePack.
+    function decode(data) {
+        if (typeof data === 'string') return JSON.parse(data);
+        return decodeMsgpack(data);
+    }
+
+    // Ask for binary MessagePack state frames; the server falls back to JSON text if it cannot send them.
+    function connect(url) {
+        var ws = new WebSocket(url + (url.indexOf('?') >= 0 ? '&' : '?') + 'encoding=msgpack');
+        ws.binaryType = 'arraybuffer';
+        return ws;
+    }
+
+    return {
+        handle: handle,
+        decode: decode,
+        connect: connect,
+        get: function() { return state; },
+        version: function() { return version; }
+    };
+})();
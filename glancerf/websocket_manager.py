@@ -2,129 +2,713 @@
 WebSocket connection manager for real-time mirroring
 """
 
-from typing import List
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
 
 from fastapi import WebSocket
 
 from glancerf.logging_config import get_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 _log = get_logger("websocket_manager")
 
+# Per-client outbound queue: broadcasts never await a socket, a writer task per client does.
+_SEND_QUEUE_MAX = 64
+_SEND_TIMEOUT_SEC = 10
+_CLOSE_TIMEOUT_SEC = 2
+# Only the latest state matters, so these may be dropped for a client that falls behind.
+_DROPPABLE_TYPES = frozenset({"state", "update", "state_patch", "form_state", "dom_summary"})
+# Client-to-client mirror messages. Desktop/browser pages only produce these while another client
+# subscribes to them; the server tells each client what to send in a "hello" message.
+MIRROR_MESSAGE_TYPES = ("form_state", "dom_summary")
+_BASE_WANTS = ("state", "update", "state_resync", "subscribe")
+# Message types sent as binary MessagePack frames to clients that connect with ?encoding=msgpack
+_BINARY_TYPES = frozenset({"state", "state_patch", "update", "form_state"})
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+# WebSocket close code 1013 = "try again later", 1001 = "going away"
+_CLOSE_CODE_SLOW_CLIENT = 1013
+_CLOSE_CODE_HEARTBEAT = 1001
+# Heartbeat: every client is pinged at this interval and reaped if nothing (pong or any message) arrives within the timeout
+HEARTBEAT_INTERVAL_SEC = 25.0
+HEARTBEAT_TIMEOUT_SEC = 60.0
+# Default max rate at which coalesced state/update messages are relayed per source
+DEFAULT_STATE_MAX_HZ = 20.0
+_DESKTOP_SOURCE = "desktop"
+
+# Pub/sub topics. Every server-to-client broadcast is published on one of these; clients are
+# subscribed by role on connect (see _ROLE_TOPICS) and can add or drop topics later.
+TOPIC_CONFIG = "config"
+TOPIC_STATE = "state"
+TOPIC_UPDATES = "updates"
+TOPIC_MODULE_DATA = "module_data"
+TOPICS = (TOPIC_CONFIG, TOPIC_STATE, TOPIC_UPDATES, TOPIC_MODULE_DATA)
+_ROLE_TOPICS = {
+    "desktop": (TOPIC_CONFIG, TOPIC_STATE, TOPIC_UPDATES),
+    "browser": (TOPIC_CONFIG, TOPIC_STATE, TOPIC_UPDATES),
+    "readonly": (TOPIC_CONFIG,),
+}
+
+# Set once the missing-msgpack fallback has been logged
+_msgpack_missing_logged = False
+
+# Strong references to writer tasks until they finish (the loop only keeps weak ones)
+_writer_tasks: set = set()
+
+
+def encode_message(message: Any) -> str:
+    """Encode a message as a JSON text frame (orjson when installed). Broadcasts call this once for all recipients."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(message).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def _pointer_token(key: Any) -> str:
+    """Escape a dict key for a JSON Pointer path segment (RFC 6901)."""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _same_json(a: Any, b: Any) -> bool:
+    """Equal values of the same JSON types throughout (1 == True == 1.0 in Python, but not to the client)."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same_json(v, b[k]) for k, v in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(_same_json, a, b))
+    return a == b
+
+
+def diff_state(old: Any, new: Any, path: str = "") -> List[dict]:
+    """
+    JSON-patch-style ops (add / replace / remove, RFC 6902 subset) turning old into new.
+    Dicts are diffed key by key; any other changed value is replaced whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[dict] = []
+        for key, old_value in old.items():
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_pointer_token(key)}"})
+        for key, new_value in new.items():
+            child = f"{path}/{_pointer_token(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": new_value})
+            elif old[key] != new_value or not _same_json(old[key], new_value):
+                ops.extend(diff_state(old[key], new_value, child))
+        return ops
+    if old == new and _same_json(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+class StateStore:
+    """Versioned mirrored desktop state. Each change bumps the version and yields the patch from the previous one."""
+
+    def __init__(self):
+        self.version = 0
+        self.state: dict = {}
+
+    def update(self, new_state: dict) -> Optional[List[dict]]:
+        """Replace the state. Returns the patch from the previous version, or None if nothing changed."""
+        patch = diff_state(self.state, new_state)
+        if not patch:
+            return None
+        self.state = new_state
+        self.version += 1
+        return patch
+
+    def snapshot_message(self) -> dict:
+        return {"type": "state", "version": self.version, "data": self.state}
+
+
+def encode_binary_message(message: Any) -> Optional[bytes]:
+    """Encode a message as a MessagePack binary frame, or None if msgpack is not installed or cannot encode it."""
+    if msgpack is None:
+        return None
+    try:
+        return msgpack.packb(message, use_bin_type=True)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def negotiate_encoding(websocket: WebSocket) -> str:
+    """Frame encoding for a client, from its ?encoding= query parameter (msgpack only if installed)."""
+    global _msgpack_missing_logged
+    requested = (websocket.query_params.get("encoding") or "").lower()
+    if requested == ENCODING_MSGPACK:
+        if msgpack is not None:
+            return ENCODING_MSGPACK
+        if not _msgpack_missing_logged:
+            _msgpack_missing_logged = True
+            _log.info("Clients asked for MessagePack frames but msgpack is not installed; sending JSON (pip install msgpack)")
+    return ENCODING_JSON
+
+
+class _ClientQueue:
+    """Bounded outbound queue and writer task for one WebSocket."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_dead: Callable[[WebSocket, str], Awaitable[None]],
+        encoding: str = ENCODING_JSON,
+    ):
+        self.websocket = websocket
+        self.encoding = encoding
+        self.last_seen = time.monotonic()
+        self.dropped = 0
+        self.closed = False
+        # Last mirrored-state version queued for this client (None = needs a full snapshot)
+        self.state_version: Optional[int] = None
+        self.resync_needed = False
+        self._pending: Deque[Tuple[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._on_dead = on_dead
+        self._task = asyncio.create_task(self._run())
+        _writer_tasks.add(self._task)
+        self._task.add_done_callback(_writer_tasks.discard)
+
+    def put(self, msg_type: str, payload: Any) -> bool:
+        """
+        Queue an encoded message (str = text frame, bytes = binary frame) without waiting. A full state snapshot replaces any state
+        or state_patch messages still pending (queued updates and mirror messages are kept). When full, the oldest pending state/update is dropped to make room; dropping a
+        patch also drops the patches queued after it (they no longer apply) and sets resync_needed.
+        Returns False if the queue is full of messages that must not be dropped (client should be disconnected).
+        """
+        if self.closed:
+            return False
+        if msg_type == "state":
+            self._purge(("state", "state_patch"))
+        if self.is_full():
+            for i, pending in enumerate(self._pending):
+                if pending[0] in _DROPPABLE_TYPES:
+                    del self._pending[i]
+                    self.dropped += 1
+                    if pending[0] == "state_patch":
+                        self._purge(("state_patch",))
+                        self.state_version = None
+                        self.resync_needed = True
+                    break
+            else:
+                return False
+        self._pending.append((msg_type, payload))
+        self._wakeup.set()
+        return True
+
+    def _purge(self, msg_types) -> None:
+        before = len(self._pending)
+        self._pending = deque(p for p in self._pending if p[0] not in msg_types)
+        self.dropped += before - len(self._pending)
+
+    def is_full(self) -> bool:
+        return len(self._pending) >= _SEND_QUEUE_MAX
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                while not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                _, payload = self._pending.popleft()
+                await self._send_with_timeout(payload)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self.closed = True
+            await self._on_dead(self.websocket, "send timed out")
+        except Exception as e:
+            self.closed = True
+            await self._on_dead(self.websocket, str(e) or type(e).__name__)
+
+    async def _send_with_timeout(self, payload: Any) -> None:
+        # asyncio.wait rather than wait_for: wait_for can swallow a cancel that races with the send finishing
+        if isinstance(payload, bytes):
+            send = asyncio.ensure_future(self.websocket.send_bytes(payload))
+        else:
+            send = asyncio.ensure_future(self.websocket.send_text(payload))
+        try:
+            done, _ = await asyncio.wait({send}, timeout=_SEND_TIMEOUT_SEC)
+        except asyncio.CancelledError:
+            send.cancel()
+            raise
+        if not done:
+            send.cancel()
+            raise asyncio.TimeoutError()
+        send.result()
+
+    def close(self) -> None:
+        """Stop the writer task and discard anything still queued."""
+        self.closed = True
+        self._pending.clear()
+        if not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+
 
 class ConnectionManager:
     """Manages WebSocket connections for desktop mirroring"""
-    def __init__(self):
+    def __init__(
+        self,
+        state_max_hz: Optional[float] = DEFAULT_STATE_MAX_HZ,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL_SEC,
+        heartbeat_timeout: float = HEARTBEAT_TIMEOUT_SEC,
+    ):
+        """
+        state_max_hz: max rate at which each source's state/update messages are relayed
+        (only the newest pending one is sent). None or 0 relays every message immediately.
+        heartbeat_interval / heartbeat_timeout: ping period and how long a silent client is kept.
+        """
         self.desktop_connection: WebSocket = None
-        self.browser_connections: List[WebSocket] = []
-        self.readonly_connections: List[WebSocket] = []
-        self.desktop_state = {}
+        # Registries: WebSocket -> connection id, insertion ordered, O(1) add/remove/lookup
+        self._browsers: Dict[WebSocket, int] = {}
+        self._readonly: Dict[WebSocket, int] = {}
+        self._conn_ids: Dict[WebSocket, int] = {}
+        self._next_id = itertools.count(1)
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat_timeout = heartbeat_timeout
+        self._reaper_task: Optional[asyncio.Task] = None
+        self.reaped_count = 0
+        self.evicted_count = 0
+        self.dropped_count = 0
+        # Topic -> subscribed clients (ordered set), client -> its topics (for O(1) cleanup)
+        self._topic_subs: Dict[str, Dict[WebSocket, None]] = {topic: {} for topic in TOPICS}
+        self._client_topics: Dict[WebSocket, set] = {}
+        self._disconnect_listeners: List[Callable[[WebSocket], None]] = []
+        self._topic_stats: Dict[str, Dict[str, int]] = {
+            topic: {"messages": 0, "deliveries": 0, "bytes": 0} for topic in TOPICS
+        }
+        self.coalesced_count = 0
+        self._state = StateStore()
+        self._queues: Dict[WebSocket, _ClientQueue] = {}
+        self._state_interval = 1.0 / state_max_hz if state_max_hz and state_max_hz > 0 else 0.0
+        # Coalescing, keyed by source ("desktop" or the sending browser's WebSocket)
+        self._pending_state: Dict[Any, Tuple[dict, Optional[WebSocket]]] = {}
+        self._last_flush: Dict[Any, float] = {}
+        self._flush_handles: Dict[Any, asyncio.TimerHandle] = {}
+        # Mirror negotiation: what each client subscribed to, and the wants list last sent to it
+        self._subscriptions: Dict[WebSocket, frozenset] = {}
+        self._sent_wants: Dict[WebSocket, Tuple[str, ...]] = {}
+
+    @property
+    def desktop_state(self) -> dict:
+        """Current mirrored state (latest relayed version)."""
+        return self._state.state
+
+    @desktop_state.setter
+    def desktop_state(self, value: dict) -> None:
+        self._state.update(value or {})
+
+    @property
+    def state_version(self) -> int:
+        return self._state.version
+
+    @property
+    def browser_connections(self) -> List[WebSocket]:
+        """Connected browsers (a snapshot list, safe to iterate while clients disconnect)."""
+        return list(self._browsers)
+
+    @property
+    def readonly_connections(self) -> List[WebSocket]:
+        """Connected read-only portal clients (a snapshot list)."""
+        return list(self._readonly)
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._conn_ids)
+
+    def _register(self, websocket: WebSocket, role: str) -> int:
+        """Assign a connection id, open the send queue, subscribe the role's topics and start the heartbeat reaper."""
+        conn_id = next(self._next_id)
+        self._conn_ids[websocket] = conn_id
+        self._open_queue(websocket)
+        for topic in _ROLE_TOPICS.get(role, ()):
+            self.subscribe_topic(websocket, topic)
+        if self._heartbeat_interval > 0 and (self._reaper_task is None or self._reaper_task.done()):
+            self._reaper_task = asyncio.create_task(self._reap_loop())
+        return conn_id
+
+    def subscribe_topic(self, websocket: WebSocket, topic: str) -> bool:
+        """Subscribe a connected client to topic. Returns False for an unknown topic."""
+        subs = self._topic_subs.get(topic)
+        if subs is None or websocket not in self._queues:
+            return False
+        subs[websocket] = None
+        self._client_topics.setdefault(websocket, set()).add(topic)
+        return True
+
+    def unsubscribe_topic(self, websocket: WebSocket, topic: str) -> None:
+        subs = self._topic_subs.get(topic)
+        if subs is not None:
+            subs.pop(websocket, None)
+        topics = self._client_topics.get(websocket)
+        if topics is not None:
+            topics.discard(topic)
+
+    def subscribers(self, topic: str) -> List[WebSocket]:
+        return list(self._topic_subs.get(topic) or ())
+
+    def publish(
+        self,
+        topic: str,
+        message: dict,
+        exclude: Optional[Iterable[Optional[WebSocket]]] = None,
+        recipients: Optional[Iterable[WebSocket]] = None,
+    ) -> int:
+        """
+        Queue message for every subscriber of topic (minus exclude; only those in recipients if given).
+        The message is encoded once and each client's writer task sends it, so a slow client never
+        delays the others. Returns the recipient count.
+        """
+        subs = self._topic_subs.get(topic)
+        if subs is None:
+            raise ValueError(f"unknown topic: {topic}")
+        skip = set(exclude or ())
+        if recipients is None:
+            recipients = [ws for ws in subs if ws not in skip]
+        else:
+            recipients = [ws for ws in recipients if ws in subs and ws not in skip]
+        self._fan_out(recipients, message, topic)
+        _log.debug("publish %s type=%s to %s clients", topic, message.get("type"), len(recipients))
+        return len(recipients)
+
+    def metrics(self) -> dict:
+        """Connection, queue and per-topic counters (for /api/ws/metrics)."""
+        return {
+            "connections": {
+                "desktop": 1 if self.desktop_connection is not None else 0,
+                "browsers": len(self._browsers),
+                "readonly": len(self._readonly),
+            },
+            "topics": {
+                topic: dict(stats, subscribers=len(self._topic_subs[topic]))
+                for topic, stats in self._topic_stats.items()
+            },
+            "state_version": self._state.version,
+            "coalesced": self.coalesced_count,
+            "dropped": self.dropped_count + sum(q.dropped for q in self._queues.values()),
+            "queued": sum(len(q._pending) for q in self._queues.values()),
+            "evicted": self.evicted_count,
+            "reaped": self.reaped_count,
+        }
+
+    def send(self, websocket: WebSocket, message: dict) -> None:
+        """Queue a direct reply to one client (not published on a topic)."""
+        self._send_encoded(websocket, message.get("type") or "", encode_message(message))
+
+    def add_disconnect_listener(self, listener: Callable[[WebSocket], None]) -> None:
+        """Call listener(websocket) whenever a client disconnects (e.g. to drop its data subscriptions)."""
+        self._disconnect_listeners.append(listener)
+
+    def touch(self, websocket: WebSocket) -> None:
+        """Record that websocket is alive (call on every received message, including pong)."""
+        queue = self._queues.get(websocket)
+        if queue is not None:
+            queue.last_seen = time.monotonic()
+
+    async def _reap_loop(self) -> None:
+        """Ping every client and evict the ones that stayed silent past the timeout; exits when none are left."""
+        ping = encode_message({"type": "ping"})
+        while self._queues:
+            await asyncio.sleep(self._heartbeat_interval)
+            cutoff = time.monotonic() - self._heartbeat_timeout
+            stale = []
+            for websocket, queue in list(self._queues.items()):
+                if queue.last_seen < cutoff:
+                    stale.append(websocket)
+                else:
+                    self._send_encoded(websocket, "ping", ping)
+            for websocket in stale:
+                self.reaped_count += 1
+                await self._evict(websocket, "heartbeat timeout", _CLOSE_CODE_HEARTBEAT)
+        self._reaper_task = None
+
+    def stop_heartbeat(self) -> None:
+        """Cancel the heartbeat reaper (e.g. on shutdown)."""
+        if self._reaper_task is not None and not self._reaper_task.done():
+            self._reaper_task.cancel()
+        self._reaper_task = None
+
+    def _open_queue(self, websocket: WebSocket) -> None:
+        encoding = negotiate_encoding(websocket)
+        self._queues[websocket] = _ClientQueue(websocket, self._evict, encoding)
+        if encoding != ENCODING_JSON:
+            _log.debug("client uses %s frames for state messages", encoding)
+
+    def _close_queue(self, websocket: WebSocket) -> None:
+        queue = self._queues.pop(websocket, None)
+        if queue is not None:
+            queue.close()
+            self.dropped_count += queue.dropped
+            if queue.dropped:
+                _log.debug("client closed after %s dropped state messages", queue.dropped)
+
+    def _send_encoded(self, websocket: WebSocket, msg_type: str, payload: Any) -> None:
+        """Queue an encoded message for one client; a client whose queue cannot take it is disconnected."""
+        queue = self._queues.get(websocket)
+        if queue is None:
+            return
+        if not queue.put(msg_type, payload):
+            asyncio.ensure_future(self._evict(websocket, "send queue full"))
+        elif queue.resync_needed:
+            queue.resync_needed = False
+            self._send_snapshot([websocket])
+
+    def _fan_out(self, recipients: List[WebSocket], message: dict, topic: Optional[str] = None) -> None:
+        """
+        The single broadcast path: encode message once per frame encoding in use and queue the same
+        frame for every recipient. With topic, the message is counted in that topic's metrics.
+        """
+        if not recipients:
+            return
+        msg_type = message.get("type") or ""
+        text: Optional[str] = None
+        binary: Optional[bytes] = None
+        version = message.get("version") if msg_type == "state_patch" else None
+        for websocket in recipients:
+            queue = self._queues.get(websocket)
+            if queue is None:
+                continue
+            payload: Any = None
+            if queue.encoding == ENCODING_MSGPACK and msg_type in _BINARY_TYPES:
+                if binary is None:
+                    binary = encode_binary_message(message) or b""
+                payload = binary or None
+            if payload is None:
+                if text is None:
+                    text = encode_message(message)
+                payload = text
+            self._send_encoded(websocket, msg_type, payload)
+            if version is not None:
+                queue.state_version = version
+        stats = self._topic_stats.get(topic) if topic else None
+        if stats is not None:
+            stats["messages"] += 1
+            stats["deliveries"] += len(recipients)
+            stats["bytes"] += len(text or binary or b"")
+
+    def _submit_state(self, source: Any, message: dict, sender: Optional[WebSocket]) -> None:
+        """
+        Record the newest state for source and relay it, at most once per state interval.
+        The first message after a quiet period goes out immediately; later ones in the same
+        interval replace each other and only the last is sent when the interval ends.
+        """
+        if self._state_interval <= 0:
+            self._relay_state(message, sender, from_desktop=source == _DESKTOP_SOURCE)
+            return
+        if source in self._pending_state:
+            self.coalesced_count += 1
+        self._pending_state[source] = (message, sender)
+        if source in self._flush_handles:
+            return
+        wait = self._last_flush.get(source, 0.0) + self._state_interval - time.monotonic()
+        if wait <= 0:
+            self._flush_state(source)
+        else:
+            self._flush_handles[source] = asyncio.get_running_loop().call_later(wait, self._flush_state, source)
+
+    def _flush_state(self, source: Any) -> None:
+        self._flush_handles.pop(source, None)
+        pending = self._pending_state.pop(source, None)
+        if pending is None:
+            return
+        if source == _DESKTOP_SOURCE or source in self._queues:
+            self._last_flush[source] = time.monotonic()
+        message, sender = pending
+        self._relay_state(message, sender, from_desktop=source == _DESKTOP_SOURCE)
+
+    def _drop_pending_state(self, source: Any) -> None:
+        """Forget a source's coalesced state and cancel its flush timer (the source disconnected)."""
+        handle = self._flush_handles.pop(source, None)
+        if handle is not None:
+            handle.cancel()
+        self._pending_state.pop(source, None)
+        self._last_flush.pop(source, None)
+
+    def _relay_state(self, message: dict, sender: Optional[WebSocket], from_desktop: bool = False) -> None:
+        """
+        Apply a state/update message from the desktop or a browser (sender) to the store and send
+        everyone else the delta. Clients not at the previous version (new, lagging, or with a full
+        queue) get a full snapshot instead. Unchanged state is not relayed.
+        """
+        patch = self._state.update(message.get("data") or {})
+        if patch is None:
+            return
+        # State topic subscribers except the sender (the desktop for desktop-originated messages)
+        origin = self.desktop_connection if from_desktop else sender
+        recipients = [c for c in self._topic_subs[TOPIC_STATE] if c is not origin]
+        version = self._state.version
+        patch_targets: List[WebSocket] = []
+        snapshot_targets: List[WebSocket] = []
+        for websocket in recipients:
+            queue = self._queues.get(websocket)
+            if queue is None:
+                continue
+            if queue.state_version == version - 1 and not queue.is_full():
+                patch_targets.append(websocket)
+            else:
+                snapshot_targets.append(websocket)
+        # The origin already has this state; the same patch (a no-op for it) moves it to the new
+        # version, so its next relay is a delta rather than a full snapshot
+        origin_queue = self._queues.get(origin) if origin is not None else None
+        if origin_queue is not None and origin_queue.state_version == version - 1 and not origin_queue.is_full():
+            patch_targets.append(origin)
+        _log.debug(
+            "relay state v%s from %s: %s ops to %s clients, snapshot to %s",
+            version, "desktop" if from_desktop else "browser", len(patch), len(patch_targets), len(snapshot_targets),
+        )
+        self._fan_out(
+            patch_targets, {"type": "state_patch", "version": version, "base": version - 1, "patch": patch}, TOPIC_STATE
+        )
+        self._send_snapshot(snapshot_targets)
+
+    def _send_snapshot(self, recipients: List[WebSocket]) -> None:
+        """Queue the full state (with its version) for recipients and mark them as up to date."""
+        self._fan_out(recipients, self._state.snapshot_message(), TOPIC_STATE)
+        for websocket in recipients:
+            queue = self._queues.get(websocket)
+            if queue is not None:
+                queue.state_version = self._state.version
+
+    def send_state_snapshot(self, websocket: WebSocket) -> None:
+        """Resend the full state to one client (e.g. after it reports a version gap)."""
+        self._send_snapshot([websocket])
+
+    def queue_from_desktop(self, message: dict) -> None:
+        """Coalesced broadcast of a desktop state/update message to all browsers."""
+        self._submit_state(_DESKTOP_SOURCE, message, None)
+
+    def queue_from_browser(self, message: dict, sender_websocket: WebSocket) -> None:
+        """Coalesced broadcast of a browser state/update message to desktop and the other browsers."""
+        self._submit_state(sender_websocket, message, sender_websocket)
+
+    def _wants_for(self, websocket: WebSocket) -> Tuple[str, ...]:
+        """Message types the server accepts from websocket: base types plus mirror types another client subscribed to."""
+        wanted = set()
+        for other, types in self._subscriptions.items():
+            if other is not websocket:
+                wanted.update(types)
+        return _BASE_WANTS + tuple(t for t in MIRROR_MESSAGE_TYPES if t in wanted)
+
+    def _announce_wants(self) -> None:
+        """Send {type: hello, wants: [...]} to every desktop/browser client whose wants list changed."""
+        producers = [self.desktop_connection] if self.desktop_connection else []
+        producers.extend(self._browsers)
+        for websocket in producers:
+            wants = self._wants_for(websocket)
+            if self._sent_wants.get(websocket) != wants:
+                self._sent_wants[websocket] = wants
+                queue = self._queues.get(websocket)
+                hello = {
+                    "type": "hello",
+                    "wants": list(wants),
+                    "encoding": queue.encoding if queue is not None else ENCODING_JSON,
+                }
+                self._send_encoded(websocket, "hello", encode_message(hello))
+
+    def subscribe(self, websocket: WebSocket, types: List[str]) -> None:
+        """Set the mirror message types websocket wants to receive (replaces its previous subscription)."""
+        subscribed = frozenset(t for t in types if t in MIRROR_MESSAGE_TYPES)
+        if subscribed:
+            self._subscriptions[websocket] = subscribed
+        else:
+            self._subscriptions.pop(websocket, None)
+        _log.debug("mirror subscription: %s", sorted(subscribed))
+        self._announce_wants()
+
+    def relay_mirror(self, message: dict, sender: WebSocket) -> None:
+        """Forward a form_state / dom_summary message to the other clients subscribed to its type."""
+        msg_type = message.get("type")
+        recipients = [ws for ws, types in self._subscriptions.items() if msg_type in types and ws is not sender]
+        self._fan_out(recipients, message)
+
+    async def _evict(self, websocket: WebSocket, reason: str, code: int = _CLOSE_CODE_SLOW_CLIENT) -> None:
+        """Disconnect a client that failed, fell too far behind or stopped answering pings."""
+        if websocket not in self._queues:
+            return
+        _log.debug("dropping WebSocket client #%s: %s", self._conn_ids.get(websocket), reason)
+        self.evicted_count += 1
+        self._close_queue(websocket)
+        try:
+            await asyncio.wait_for(websocket.close(code=code), _CLOSE_TIMEOUT_SEC)
+        except Exception:
+            pass
+        await self.disconnect(websocket)
 
     async def connect_readonly(self, websocket: WebSocket):
         """Register read-only portal connection (receives config_update only)."""
         await websocket.accept()
-        self.readonly_connections.append(websocket)
-        _log.debug("readonly_connections count=%s", len(self.readonly_connections))
+        self._readonly[websocket] = self._register(websocket, "readonly")
+        _log.debug("readonly_connections count=%s", len(self._readonly))
 
     async def connect_desktop(self, websocket: WebSocket):
         """Register desktop app connection"""
         await websocket.accept()
+        if self.desktop_connection is not None and self.desktop_connection is not websocket:
+            self._close_queue(self.desktop_connection)
+            self._forget(self.desktop_connection)
         self.desktop_connection = websocket
+        self._register(websocket, "desktop")
+        self._announce_wants()
         _log.debug("desktop connected")
 
     async def connect_browser(self, websocket: WebSocket):
         """Register web browser connection"""
         await websocket.accept()
-        self.browser_connections.append(websocket)
-        _log.debug("browser connected, total browsers=%s", len(self.browser_connections))
-        # Send current desktop state if available
+        conn_id = self._register(websocket, "browser")
+        self._browsers[websocket] = conn_id
+        self._announce_wants()
+        _log.debug("browser #%s connected, total browsers=%s", conn_id, len(self._browsers))
+        # Send current desktop state (with its version) if available
         if self.desktop_state:
+            self._send_snapshot([websocket])
+
+    def _forget(self, websocket: WebSocket) -> Optional[int]:
+        """Drop websocket's id, topic subscriptions and sent wants. Returns its connection id."""
+        for listener in self._disconnect_listeners:
             try:
-                await websocket.send_json({
-                    "type": "state",
-                    "data": self.desktop_state
-                })
-            except Exception:
-                pass
-    
+                listener(websocket)
+            except Exception as e:
+                _log.debug("disconnect listener failed: %s", e)
+        for topic in self._client_topics.pop(websocket, ()):
+            self._topic_subs[topic].pop(websocket, None)
+        self._sent_wants.pop(websocket, None)
+        return self._conn_ids.pop(websocket, None)
+
     async def disconnect(self, websocket: WebSocket):
         """Remove connection"""
+        self._close_queue(websocket)
+        conn_id = self._forget(websocket)
+        if self._subscriptions.pop(websocket, None):
+            self._announce_wants()
         if websocket == self.desktop_connection:
             self.desktop_connection = None
             _log.debug("desktop disconnected")
-            for conn in list(self.browser_connections):
-                try:
-                    await conn.send_json({"type": "state", "data": dict(self.desktop_state)})
-                except Exception:
-                    pass
-        elif websocket in self.browser_connections:
-            self.browser_connections.remove(websocket)
-            _log.debug("browser disconnected, remaining=%s", len(self.browser_connections))
-        elif websocket in self.readonly_connections:
-            self.readonly_connections.remove(websocket)
-            _log.debug("readonly disconnected, remaining=%s", len(self.readonly_connections))
-    
+            self._send_snapshot(list(self._browsers))
+        elif self._browsers.pop(websocket, None) is not None:
+            self._drop_pending_state(websocket)
+            _log.debug("browser #%s disconnected, remaining=%s", conn_id, len(self._browsers))
+        elif self._readonly.pop(websocket, None) is not None:
+            _log.debug("readonly #%s disconnected, remaining=%s", conn_id, len(self._readonly))
+
     async def broadcast_from_desktop(self, message: dict):
-        """Broadcast message from desktop to all browsers"""
-        self.desktop_state = message.get("data", {})
-        _log.debug("broadcast_from_desktop to %s browsers", len(self.browser_connections))
-        # Send to all browser connections
-        disconnected = []
-        for connection in self.browser_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
-        
-        # Remove disconnected connections
-        for conn in disconnected:
-            if conn in self.browser_connections:
-                self.browser_connections.remove(conn)
-    
+        """Broadcast message from desktop to all browsers (immediately, not coalesced)"""
+        self._relay_state(message, None, from_desktop=True)
+
     async def broadcast_from_browser(self, message: dict, sender_websocket: WebSocket):
-        """Broadcast message from a browser to desktop and all other browsers"""
-        self.desktop_state = message.get("data", {})
-        _log.debug("broadcast_from_browser to desktop + %s other browsers", len(self.browser_connections) - (1 if sender_websocket and sender_websocket in self.browser_connections else 0))
-        
-        # Send to desktop app if connected
-        if self.desktop_connection:
-            try:
-                await self.desktop_connection.send_json(message)
-            except Exception:
-                self.desktop_connection = None
-        
-        # Send to all browser connections (excluding sender if specified)
-        disconnected = []
-        for connection in self.browser_connections:
-            if sender_websocket is None or connection != sender_websocket:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    disconnected.append(connection)
-        
-        # Remove disconnected connections
-        for conn in disconnected:
-            if conn in self.browser_connections:
-                self.browser_connections.remove(conn)
-    
-    async def broadcast_update_notification(self, message: dict):
-        """Broadcast update notification to all connected clients."""
-        _log.debug("broadcast_update_notification to desktop + %s browsers", len(self.browser_connections))
-        # Send to desktop
-        if self.desktop_connection:
-            try:
-                await self.desktop_connection.send_json(message)
-            except Exception:
-                self.desktop_connection = None
-        
-        # Send to all browsers
-        disconnected = []
-        for connection in self.browser_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
-        
-        # Remove disconnected connections
-        for conn in disconnected:
-            if conn in self.browser_connections:
-                self.browser_connections.remove(conn)
+        """Broadcast message from a browser to desktop and all other browsers (immediately, not coalesced)"""
+        self._relay_state(message, sender_websocket)
@@ -50,7 +50,7 @@ def main():
 
     log = get_logger("run")
 
-    failures = validate_module_dependencies()
+    failures = validate_module_dependencies(config.get("layout"))
     if failures:
         for module_name, err_msg in failures:
             log.error("Module '%s' could not be loaded: %s", module_name, err_msg)
@@ -0,0 +1,35 @@
+"""Precompressed assets and content-coding negotiation."""
+
+import gzip
+import logging
+
+import pytest
+
+from glancerf import compression
+from glancerf.compression import CompressedAsset, PrecompressedStaticFiles
+
+BODY = b"body { color: red; }\n" * 200
+
+
+def test_brotli_preferred_then_gzip_then_identity():
+    brotli = pytest.importorskip("brotli")
+    asset = CompressedAsset(BODY)
+    body, coding = asset.encoded("gzip, deflate, br")
+    assert coding == "br" and brotli.decompress(body) == BODY
+    body, coding = asset.encoded("gzip;q=1, br;q=0")
+    assert coding == "gzip" and gzip.decompress(body) == BODY
+    assert asset.encoded("identity") == (BODY, None)
+
+
+def test_small_bodies_are_not_compressed():
+    assert CompressedAsset(b"x" * 10).encoded("br, gzip") == (b"x" * 10, None)
+
+
+def test_gzip_only_without_brotli(monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(compression, "brotli", None)
+    asset = CompressedAsset(BODY)
+    assert asset.encoded("br, gzip")[1] == "gzip"
+    (tmp_path / "site.css").write_bytes(BODY)
+    with caplog.at_level(logging.INFO):
+        assert PrecompressedStaticFiles(directory=str(tmp_path)).precompress() == 1
+    assert any("Brotli is not installed" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,106 @@
+"""Config transactions, write-behind and change versioning."""
+
+import json
+
+import pytest
+
+from glancerf.config import Config, ConfigValidationError
+
+
+def _on_disk(config: Config) -> dict:
+    return json.loads(config.config_file.read_text(encoding="utf-8"))
+
+
+def test_transaction_writes_once_when_it_exits(tmp_path):
+    config = Config(tmp_path)
+    with config.transaction():
+        config.set("grid_columns", 5)
+        config.set("grid_rows", 4)
+        assert _on_disk(config).get("grid_columns") != 5
+    assert _on_disk(config)["grid_columns"] == 5
+    assert _on_disk(config)["grid_rows"] == 4
+
+
+def test_transaction_rolls_back_when_block_raises(tmp_path):
+    config = Config(tmp_path)
+    config.set("grid_columns", 3)
+    with pytest.raises(RuntimeError):
+        with config.transaction():
+            config.set("grid_columns", 7)
+            config.set("setup_callsign", "N0CALL")
+            raise RuntimeError("boom")
+    assert config.get("grid_columns") == 3
+    assert config.get("setup_callsign") != "N0CALL"
+    assert _on_disk(config)["grid_columns"] == 3
+
+
+def test_transaction_rolls_back_when_validation_fails(tmp_path):
+    config = Config(tmp_path)
+    config.set("port", 8080)
+    version = config.version
+    with pytest.raises(ConfigValidationError):
+        config.update({"grid_columns": 6, "port": 0})
+    assert config.get("port") == 8080
+    assert config.get("grid_columns") != 6
+    assert config.version == version
+    assert _on_disk(config)["port"] == 8080
+
+
+def test_nested_transaction_rolls_back_outermost(tmp_path):
+    config = Config(tmp_path)
+    config.set("grid_columns", 3)
+    with pytest.raises(RuntimeError):
+        with config.transaction():
+            config.set("grid_columns", 4)
+            with config.transaction():
+                config.set("grid_rows", 9)
+            raise RuntimeError("boom")
+    assert config.get("grid_columns") == 3
+    assert config.get("grid_rows") != 9
+
+
+def test_version_bumps_once_per_commit_and_notifies(tmp_path):
+    config = Config(tmp_path)
+    seen = []
+    config.add_change_listener(lambda version, changed: seen.append((version, changed)))
+    version = config.version
+    config.update({"grid_columns": 5, "grid_rows": 5})
+    config.set("grid_columns", 5)  # unchanged value: no commit
+    assert config.version == version + 1
+    assert seen == [(version + 1, frozenset({"grid_columns", "grid_rows"}))]
+
+
+def test_window_geometry_is_saved_without_a_version(tmp_path):
+    config = Config(tmp_path)
+    seen = []
+    config.add_change_listener(lambda version, changed: seen.append(changed))
+    version = config.version
+    config.set("desktop_window_width", 1234)
+    assert config.version == version
+    assert seen == []
+    assert _on_disk(config)["desktop_window_width"] == 1234
+
+
+def test_write_behind_defers_and_coalesces_writes(tmp_path):
+    config = Config(tmp_path)
+    config.enable_write_behind(60)
+    try:
+        for columns in range(2, 8):
+            config.set("grid_columns", columns)
+        assert config.get("grid_columns") == 7
+        assert _on_disk(config).get("grid_columns") != 7
+        config.flush()
+        assert _on_disk(config)["grid_columns"] == 7
+    finally:
+        config.enable_write_behind(0)
+
+
+def test_reload_picks_up_external_edit(tmp_path):
+    config = Config(tmp_path)
+    data = _on_disk(config)
+    data["grid_columns"] = 11
+    config.config_file.write_text(json.dumps(data), encoding="utf-8")
+    # Make the signature differ even on filesystems with coarse mtimes
+    config._file_sig = None
+    assert config.reload() == frozenset({"grid_columns"})
+    assert config.get("grid_columns") == 11
@@ -0,0 +1,129 @@
+"""Data bus subscription checks and caps."""
+
+import asyncio
+
+import pytest
+
+from glancerf import config as config_module
+from glancerf import data_bus
+from glancerf.config import Config
+from glancerf.data_bus import DataBus, layout_cell_settings, register_data_source
+
+
+class _FakeManager:
+    def __init__(self):
+        self.topics = {}
+        self.published = []
+
+    def add_disconnect_listener(self, listener):
+        pass
+
+    def subscribe_topic(self, websocket, topic):
+        self.topics.setdefault(topic, set()).add(websocket)
+        return True
+
+    def unsubscribe_topic(self, websocket, topic):
+        self.topics.get(topic, set()).discard(websocket)
+
+    def publish(self, topic, message, recipients=None):
+        self.published.append((topic, message, recipients))
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    """A DataBus with its own source registry; refresh loops are not started."""
+    monkeypatch.setattr(data_bus, "_sources", {})
+
+    async def no_refresh(self, feed):
+        pass
+
+    monkeypatch.setattr(DataBus, "_run", no_refresh)
+    return DataBus(app=None, connection_manager=_FakeManager())
+
+
+def _in_loop(check):
+    async def run():
+        check()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+
+def test_only_registered_paths_can_be_subscribed(bus):
+    register_data_source("/api/a")
+
+    def check():
+        assert bus.subscribe("ws", "/api/a?x=1")
+        assert not bus.subscribe("ws", "/api/b")
+        assert not bus.subscribe("ws", "http://example.com/api/a")
+        assert not bus.subscribe("ws", "/api/a?" + "x" * 5000)
+
+    _in_loop(check)
+
+
+def test_allow_query_decides_and_errors_reject(bus):
+    register_data_source("/api/feed", allow_query=lambda q: q.get("url") == ["https://ok.example/rss"])
+    register_data_source("/api/broken", allow_query=lambda q: q["missing"])
+
+    def check():
+        assert bus.subscribe("ws", "/api/feed?url=https://ok.example/rss")
+        assert not bus.subscribe("ws", "/api/feed?url=https://other.example/rss")
+        assert not bus.subscribe("ws", "/api/feed?url=https://ok.example/rss&url=https://other.example/rss")
+        assert not bus.subscribe("ws", "/api/broken?x=1")
+        assert bus.metrics()["feeds"] == 1
+
+    _in_loop(check)
+
+
+def test_clients_share_one_feed_per_url(bus):
+    register_data_source("/api/a", min_interval_sec=30)
+
+    def check():
+        assert bus.subscribe("ws1", "/api/a?x=1", 5)
+        assert bus.subscribe("ws2", "/api/a?x=1", 120)
+        assert bus.metrics()["feeds"] == 1
+        assert bus.metrics()["subscriptions"] == 2
+        # The feed refreshes for the most frequent subscriber, but never below the source minimum
+        assert bus._feeds["/api/a?x=1"].interval() == 30
+        assert bus.is_subscribed("ws1", "/api/a?x=1")
+        bus.drop_client("ws1")
+        bus.drop_client("ws2")
+        assert bus.metrics()["feeds"] == 0
+        assert not bus.is_subscribed("ws1", "/api/a?x=1")
+
+    _in_loop(check)
+
+
+def test_per_client_and_global_feed_caps(bus, monkeypatch):
+    monkeypatch.setattr(data_bus, "_MAX_KEYS_PER_CLIENT", 2)
+    monkeypatch.setattr(data_bus, "_MAX_FEEDS", 3)
+    register_data_source("/api/a")
+
+    def check():
+        assert bus.subscribe("ws1", "/api/a?n=1")
+        assert bus.subscribe("ws1", "/api/a?n=2")
+        assert not bus.subscribe("ws1", "/api/a?n=3")
+        assert bus.subscribe("ws1", "/api/a?n=2")  # already subscribed: not counted again
+        assert bus.subscribe("ws2", "/api/a?n=3")
+        assert not bus.subscribe("ws2", "/api/a?n=4")  # global cap
+        assert bus.subscribe("ws2", "/api/a?n=1")  # existing feed: still allowed
+        bus.unsubscribe("ws2", "/api/a?n=3")
+        assert bus.subscribe("ws2", "/api/a?n=4")
+
+    _in_loop(check)
+
+
+def test_layout_cell_settings_and_rss_check(tmp_path, monkeypatch):
+    config = Config(tmp_path)
+    config.update({
+        "layout": [["rss", "clock"], ["", "rss"]],
+        "module_settings": {"0_0": {"rss_url": "https://a.example/feed"}, "0_1": {"rss_url": "https://b.example/feed"}},
+    })
+    monkeypatch.setattr(config_module, "_config_instance", config)
+    assert layout_cell_settings("rss") == [{"rss_url": "https://a.example/feed"}, {}]
+
+    from glancerf.modules.rss.api_routes import _is_layout_feed
+
+    assert _is_layout_feed({"url": ["https://a.example/feed"]})
+    assert not _is_layout_feed({"url": ["https://b.example/feed"]})
+    assert not _is_layout_feed({})
@@ -0,0 +1,156 @@
+"""EventMergeIndex must give the same list as the full merge it replaced (contest_service before the index)."""
+
+import random
+from typing import Any
+
+from glancerf.event_index import EventMergeIndex, query_events
+from glancerf.modules.contests.contest_service import _merge_contest_fields, _normalize_title
+
+SOURCES = ["WA7BNM", "WA7BNM iCal", "SSA (SE)", "SSA (SE) iCal", "RSGB (UK)"]
+CUTOFF = "2026-03-10T00:00:00Z"
+
+
+def _deduplicate_and_merge(sourced_lists: list[tuple[str, list[dict[str, Any]]]]) -> list[dict[str, Any]]:
+    """The merge as it was before EventMergeIndex (copied unchanged)."""
+    by_key: dict[tuple[str, str], dict[str, Any]] = {}
+    for source_label, items in sourced_lists:
+        for d in items:
+            title_n = _normalize_title(d.get("title") or "")
+            start = (d.get("start_utc") or "")[:10]
+            if not title_n or not start:
+                continue
+            key = (title_n, start)
+            if key in by_key:
+                existing = by_key[key]
+                existing_sources = (existing.get("source") or "").split("; ")
+                if source_label not in existing_sources:
+                    existing_sources.append(source_label)
+                existing["source"] = "; ".join(existing_sources)
+                if d.get("url") and not existing.get("url"):
+                    existing["url"] = d["url"]
+                if d.get("info") and len(d.get("info") or "") > len(existing.get("info") or ""):
+                    existing["info"] = d["info"]
+            else:
+                rec = dict(d)
+                rec["source"] = source_label
+                by_key[key] = rec
+    return list(by_key.values())
+
+
+def _expected(sourced_lists):
+    merged = _deduplicate_and_merge(sourced_lists)
+    result = [d for d in merged if (d.get("end_utc") or "") >= CUTOFF]
+    result.sort(key=lambda d: (d.get("start_utc") or "", d.get("title") or ""))
+    return result
+
+
+def _random_items(rng: random.Random, n: int) -> list[dict[str, Any]]:
+    titles = ["CQ WW", "cq ww ", "ARRL DX", "SAC", "NRAU", "IARU HF", "Field Day", ""]
+    items = []
+    for _ in range(n):
+        day = rng.randint(1, 20)
+        hour = rng.choice([0, 12])
+        items.append({
+            "title": rng.choice(titles),
+            "start_utc": "2026-03-%02dT%02d:00:00Z" % (day, hour),
+            "end_utc": "2026-03-%02dT%02d:00:00Z" % (day + rng.randint(0, 2), hour),
+            "url": rng.choice(["", "https://example.com/%d" % rng.randint(1, 5)]),
+            "info": "x" * rng.randint(0, 6),
+        })
+    return items
+
+
+def _new_index() -> EventMergeIndex:
+    return EventMergeIndex(
+        lambda d: _normalize_title(d.get("title") or ""),
+        _merge_contest_fields,
+        "title",
+        source_order=SOURCES,
+    )
+
+
+def test_matches_full_merge_whatever_order_sources_arrive():
+    for seed in range(50):
+        rng = random.Random(seed)
+        sourced = [(label, _random_items(rng, rng.randint(0, 25))) for label in SOURCES]
+        index = _new_index()
+        for label, items in rng.sample(sourced, len(sourced)):
+            index.apply_source(label, items)
+        index.expire(CUTOFF)
+        assert list(index.entries()) == _expected(sourced), seed
+
+
+def test_refreshes_match_full_merge_of_latest_lists():
+    rng = random.Random(1234)
+    latest = {label: _random_items(rng, 20) for label in SOURCES}
+    index = _new_index()
+    for label in SOURCES:
+        index.apply_source(label, latest[label])
+    for _ in range(200):
+        label = rng.choice(SOURCES)
+        items = list(latest[label])
+        if items and rng.random() < 0.5:
+            items.pop(rng.randrange(len(items)))
+        items.extend(_random_items(rng, rng.randint(0, 2)))
+        latest[label] = items
+        index.apply_source(label, items)
+    index.expire(CUTOFF)
+    assert list(index.entries()) == _expected([(label, latest[label]) for label in SOURCES])
+
+
+def test_unchanged_refresh_remerges_nothing():
+    rng = random.Random(7)
+    items = _random_items(rng, 30)
+    index = _new_index()
+    assert index.apply_source("WA7BNM", items) > 0
+    assert index.apply_source("WA7BNM", [dict(d) for d in items]) == 0
+
+
+def test_expiry_heap_stays_bounded():
+    index = _new_index()
+    item = {"title": "CQ WW", "start_utc": "2026-03-01T00:00:00Z", "end_utc": "2026-03-02T00:00:00Z"}
+    for i in range(100):
+        index.apply_source("WA7BNM", [dict(item, info="x" * (i % 7))])
+    assert len(index._expiry) <= 2 * len(index._merged)
+
+
+def test_entries_is_immutable_snapshot():
+    index = _new_index()
+    index.apply_source("WA7BNM", [{"title": "SAC", "start_utc": "2026-03-15T00:00:00Z", "end_utc": "2026-03-16T00:00:00Z"}])
+    entries = index.entries()
+    assert isinstance(entries, tuple)
+    index.apply_source("RSGB (UK)", [{"title": "NRAU", "start_utc": "2026-03-14T00:00:00Z", "end_utc": "2026-03-15T00:00:00Z"}])
+    assert len(entries) == 1
+    assert [d["title"] for d in index.entries()] == ["NRAU", "SAC"]
+
+
+def test_overlay_matches_full_merge():
+    rng = random.Random(99)
+    builtin = [(label, _random_items(rng, 15)) for label in SOURCES]
+    custom = [("My feed", _random_items(rng, 10))]
+    index = _new_index()
+    for label, items in builtin:
+        index.apply_source(label, items)
+    index.expire(CUTOFF)
+    before = [dict(d) for d in index.entries()]
+    result = index.overlay(index.entries(), custom, CUTOFF)
+    # As the old code did: merged built-in records as one-item sources, then the custom feeds
+    assert result == _expected([(d["source"], [d]) for d in before] + custom)
+    assert [dict(d) for d in index.entries()] == before
+
+
+def test_query_events_pages_and_projects():
+    entries = [
+        {"title": "T%d" % i, "start_utc": "2020-01-%02dT00:00:00Z" % (i + 1), "info": "abcdef"}
+        for i in range(10)
+    ]
+    items, total = query_events(entries, offset=2, limit=3, fields=["title", "info"], info_chars=3)
+    assert total == 10
+    assert items == [{"title": "T%d" % i, "info": "abc..."} for i in (2, 3, 4)]
+    assert entries[2]["info"] == "abcdef"
+
+
+def test_query_events_strips_field_names():
+    entries = [{"title": "SAC", "url": "https://example.com", "info": "x", "start_utc": "2020-01-01T00:00:00Z"}]
+    items, _ = query_events(entries, fields="title, url ,".split(","))
+    assert items == [{"title": "SAC", "url": "https://example.com"}]
@@ -0,0 +1,118 @@
+"""Token-bucket limiter, Retry-After and client address resolution."""
+
+import types
+
+import pytest
+from starlette.requests import HTTPConnection
+
+from glancerf import rate_limit
+from glancerf.rate_limit import (
+    INTERNAL_CLIENT_HOST,
+    RateLimiter,
+    RateLimitExceeded,
+    _get_client_ip,
+    charge,
+    parse_rate_limits,
+    parse_trusted_proxies,
+    rate_limit_exceeded_handler,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _connection(host, forwarded=None):
+    headers = [] if forwarded is None else [(b"x-forwarded-for", forwarded.encode())]
+    return HTTPConnection({"type": "http", "client": (host, 50000), "headers": headers})
+
+
+def test_bucket_refills_at_window_rate(clock):
+    limiter = RateLimiter({"api": (3, 3.0)})
+    assert [limiter.acquire("api", "a") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("api", "a") == pytest.approx(1.0)
+    clock[0] += 0.5
+    assert limiter.acquire("api", "a") == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert limiter.acquire("api", "a") == 0
+    clock[0] += 100  # refill stops at capacity
+    assert [limiter.acquire("api", "a") > 0 for _ in range(4)] == [False, False, False, True]
+
+
+def test_buckets_are_per_group_and_client(clock):
+    limiter = RateLimiter({"api": (1, 60.0), "settings": (1, 60.0)})
+    assert limiter.acquire("api", "a") == 0
+    assert limiter.acquire("api", "a") > 0
+    assert limiter.acquire("api", "b") == 0
+    assert limiter.acquire("settings", "a") == 0
+
+
+def test_unknown_group_uses_settings_limit(clock):
+    limiter = RateLimiter({"settings": (2, 60.0)})
+    assert limiter.acquire("other", "a") == 0
+    assert limiter.acquire("other", "a") == 0
+    assert limiter.acquire("other", "a") == pytest.approx(30.0)
+
+
+def test_bucket_count_is_bounded(clock):
+    limiter = RateLimiter({"api": (5, 60.0)}, max_buckets=3)
+    for client in "abcde":
+        limiter.acquire("api", client)
+    assert limiter.metrics() == {"buckets": 3, "evicted": 2}
+    # Recently used buckets survive; a returning evicted client starts full again
+    assert limiter.acquire("api", "e") == 0
+    assert ("api", "a") not in limiter._buckets
+
+
+def test_idle_buckets_are_forgotten(clock):
+    limiter = RateLimiter({"api": (5, 60.0)})
+    limiter.acquire("api", "a")
+    clock[0] += 61
+    limiter.acquire("api", "b")
+    assert list(limiter._buckets) == [("api", "b")]
+
+
+def test_retry_after_is_whole_seconds_at_least_one():
+    assert rate_limit_exceeded_handler(None, RateLimitExceeded(0.2)).headers["retry-after"] == "1"
+    response = rate_limit_exceeded_handler(None, RateLimitExceeded(2.1))
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
+
+
+def test_parse_rate_limits_merges_over_defaults():
+    limits = parse_rate_limits({"api": {"requests": 5}, "custom": {"window_sec": 10}})
+    assert limits["api"] == (5, 60.0)
+    assert limits["settings"] == rate_limit.DEFAULT_RATE_LIMITS["settings"]
+    assert limits["custom"] == (rate_limit.DEFAULT_RATE_LIMITS["settings"][0], 10.0)
+
+
+@pytest.fixture
+def proxies(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_trusted_proxies", parse_trusted_proxies(["10.0.0.0/8", "::1"]))
+
+
+@pytest.mark.parametrize(
+    "peer, forwarded, expected",
+    [
+        ("203.0.113.5", "198.51.100.7", "203.0.113.5"),  # untrusted peer: header ignored
+        ("10.0.0.1", None, "10.0.0.1"),
+        ("10.0.0.1", "198.51.100.7", "198.51.100.7"),
+        ("10.0.0.1", "1.2.3.4, 198.51.100.7, 10.0.0.2", "198.51.100.7"),  # client-prepended entry ignored
+        ("::1", " 198.51.100.7 ,", "198.51.100.7"),
+        ("10.0.0.1", "10.0.0.3, 10.0.0.2", "10.0.0.1"),  # all hops trusted: the peer
+    ],
+)
+def test_client_ip_from_forwarded_for(proxies, peer, forwarded, expected):
+    assert _get_client_ip(_connection(peer, forwarded)) == expected
+
+
+def test_charge_limits_client_but_not_internal_fetches(monkeypatch, clock):
+    monkeypatch.setattr(rate_limit, "_refresh_settings", lambda: None)
+    monkeypatch.setattr(rate_limit, "_limiter", RateLimiter({"api": (1, 60.0)}))
+    assert charge(_connection("198.51.100.7"), "api") == 0
+    assert charge(_connection("198.51.100.7"), "api") > 0
+    for _ in range(5):
+        assert charge(_connection(INTERNAL_CLIENT_HOST), "api") == 0
@@ -0,0 +1,57 @@
+"""Streamed RSS reads stop early and log what they saved."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from glancerf.logging_config import DETAILED_LEVEL
+from glancerf.modules.rss import rss_service
+
+ITEM = b"<item><title>News</title><link>https://example.com/n</link></item>"
+FEED = b'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>' + ITEM * 400 + b"</channel></rss>"
+CHUNK = 1024
+
+
+async def _chunks():
+    for i in range(0, len(FEED), CHUNK):
+        yield FEED[i:i + CHUNK]
+
+
+def _read(headers):
+    async def run():
+        def handler(request):
+            return httpx.Response(200, headers=headers, content=_chunks())
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            async with client.stream("GET", "https://example.com/rss") as resp:
+                body = await rss_service._read_feed_body(resp, "https://example.com/rss")
+                return body, resp.num_bytes_downloaded
+
+    return asyncio.run(run())
+
+
+def _stop_message(caplog):
+    messages = [r.getMessage() for r in caplog.records if r.levelno == DETAILED_LEVEL]
+    assert len(messages) == 1
+    return messages[0]
+
+
+@pytest.fixture
+def detailed(caplog):
+    caplog.set_level(DETAILED_LEVEL)
+    return caplog
+
+
+def test_saving_is_logged_from_content_length(detailed):
+    body, transferred = _read({"Content-Length": str(len(FEED))})
+    assert transferred < len(FEED)
+    items = rss_service._parse_feed(body)["items"]
+    assert len(items) == rss_service._RSS_MAX_ITEMS and items[-1]["title"] == "News"
+    message = _stop_message(detailed)
+    assert "stopped at item limit, saved %d bytes" % (len(FEED) - transferred) in message
+
+
+def test_saving_unknown_without_content_length(detailed):
+    _, transferred = _read({})
+    assert "saved unknown (stopped after %d bytes)" % transferred in _stop_message(detailed)
@@ -0,0 +1,39 @@
+"""Auto-update restart."""
+
+import asyncio
+import json
+
+from glancerf import update_checker, updater
+from glancerf.config import Config
+from glancerf.update_checker import UpdateChecker
+
+
+class _Exited(Exception):
+    pass
+
+
+class _FakeManager:
+    def publish(self, topic, message, recipients=None):
+        pass
+
+
+def test_restart_writes_pending_config_before_exiting(tmp_path, monkeypatch):
+    config = Config(tmp_path)
+    config.enable_write_behind(60)
+    config.set("grid_columns", 9)
+    monkeypatch.setattr(update_checker, "get_config", lambda: config)
+    monkeypatch.setattr(updater, "create_restart_script", lambda: None)
+    on_disk_at_exit = []
+
+    def fake_exit(code):
+        on_disk_at_exit.append(json.loads(config.config_file.read_text(encoding="utf-8"))["grid_columns"])
+        raise _Exited()
+
+    monkeypatch.setattr(update_checker.os, "_exit", fake_exit)
+    try:
+        asyncio.run(UpdateChecker(_FakeManager()).schedule_restart(delay_seconds=0))
+    except _Exited:
+        pass
+    finally:
+        config.enable_write_behind(0)
+    assert on_disk_at_exit == [9]
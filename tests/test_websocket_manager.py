@@ -0,0 +1,187 @@
+"""Send queue drop rules and mirrored-state patches."""
+
+import asyncio
+import copy
+import logging
+import types
+
+import pytest
+
+from glancerf import websocket_manager
+from glancerf.websocket_manager import (
+    ENCODING_JSON,
+    ENCODING_MSGPACK,
+    StateStore,
+    _ClientQueue,
+    diff_state,
+    encode_binary_message,
+    negotiate_encoding,
+)
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+async def _on_dead(websocket, reason):
+    pass
+
+
+def _with_queue(check):
+    """Run check(queue) on a fresh queue inside an event loop (the writer task only runs when check awaits)."""
+
+    async def run():
+        queue = _ClientQueue(_FakeWebSocket(), _on_dead)
+        try:
+            result = check(queue)
+            if asyncio.iscoroutine(result):
+                await result
+        finally:
+            queue.close()
+
+    asyncio.run(run())
+
+
+def _types(queue):
+    return [msg_type for msg_type, _ in queue._pending]
+
+
+@pytest.fixture
+def small_queue(monkeypatch):
+    monkeypatch.setattr(websocket_manager, "_SEND_QUEUE_MAX", 4)
+
+
+def test_snapshot_replaces_only_pending_state_and_patches():
+    def check(queue):
+        for msg_type in ("state", "update", "state_patch", "form_state", "dom_summary", "state_patch"):
+            queue.put(msg_type, msg_type)
+        queue.put("state", "snapshot")
+        assert _types(queue) == ["update", "form_state", "dom_summary", "state"]
+        assert queue._pending[-1][1] == "snapshot"
+        assert queue.dropped == 3
+
+    _with_queue(check)
+
+
+def test_full_queue_drops_oldest_droppable(small_queue):
+    def check(queue):
+        for msg_type in ("config", "update", "form_state", "config"):
+            queue.put(msg_type, msg_type)
+        assert queue.put("config", "new")
+        assert _types(queue) == ["config", "form_state", "config", "config"]
+        assert queue.dropped == 1
+        assert not queue.resync_needed
+
+    _with_queue(check)
+
+
+def test_dropping_a_patch_drops_later_patches_and_needs_resync(small_queue):
+    def check(queue):
+        queue.state_version = 5
+        for msg_type in ("state_patch", "config", "state_patch", "update"):
+            queue.put(msg_type, msg_type)
+        assert queue.put("config", "new")
+        assert _types(queue) == ["config", "update", "config"]
+        assert queue.resync_needed
+        assert queue.state_version is None
+
+    _with_queue(check)
+
+
+def test_full_of_undroppable_messages_refuses(small_queue):
+    def check(queue):
+        for _ in range(4):
+            assert queue.put("config", "c")
+        assert not queue.put("update", "u")
+        assert len(queue._pending) == 4
+
+    _with_queue(check)
+
+
+def test_writer_sends_in_order_text_and_binary():
+    async def check(queue):
+        queue.put("update", "a")
+        queue.put("state", b"b")
+        queue.put("config", "c")
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert queue.websocket.sent == ["a", b"b", "c"]
+
+    _with_queue(check)
+
+
+def _apply(state, patch):
+    """Apply add/replace/remove ops the way the browser client does."""
+    if patch and patch[0]["path"] == "":
+        return copy.deepcopy(patch[0]["value"])
+    state = copy.deepcopy(state)
+    for op in patch:
+        tokens = [t.replace("~1", "/").replace("~0", "~") for t in op["path"].split("/")[1:]]
+        target = state
+        for token in tokens[:-1]:
+            target = target[token]
+        if op["op"] == "remove":
+            del target[tokens[-1]]
+        else:
+            target[tokens[-1]] = op["value"]
+    return state
+
+
+def test_diff_state_ops_rebuild_new_state():
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x", "e/f": 1}, "gone": True, "t~": 0}
+    new = {"a": 2, "b": {"c": [1, 2, 3], "e/f": 2, "n": None}, "t~": 0, "new": {"k": 1}}
+    patch = diff_state(old, new)
+    assert {"op": "remove", "path": "/gone"} in patch
+    assert {"op": "remove", "path": "/b/d"} in patch
+    assert {"op": "replace", "path": "/b/e~1f", "value": 2} in patch
+    assert {"op": "replace", "path": "/b/c", "value": [1, 2, 3]} in patch
+    assert {"op": "add", "path": "/new", "value": {"k": 1}} in patch
+    assert not any(op["path"] == "/t~0" for op in patch)
+    assert _apply(old, patch) == new
+
+
+def test_diff_state_treats_type_change_as_replace():
+    assert diff_state({"a": 1}, {"a": True}) == [{"op": "replace", "path": "/a", "value": True}]
+    assert diff_state({"a": {"b": 0}}, {"a": {"b": False}}) == [{"op": "replace", "path": "/a/b", "value": False}]
+    assert diff_state({"a": [1, 2]}, {"a": [1.0, 2]}) == [{"op": "replace", "path": "/a", "value": [1.0, 2]}]
+    assert diff_state({"a": 1}, {"a": 1}) == []
+    assert diff_state({"a": 1}, [1]) == [{"op": "replace", "path": "", "value": [1]}]
+
+
+def test_state_store_versions_only_changes():
+    store = StateStore()
+    assert store.update({"a": 1}) == [{"op": "add", "path": "/a", "value": 1}]
+    assert store.version == 1
+    assert store.update({"a": 1}) is None
+    assert store.version == 1
+    assert store.update({"a": 2}) == [{"op": "replace", "path": "/a", "value": 2}]
+    assert store.snapshot_message() == {"type": "state", "version": 2, "data": {"a": 2}}
+
+
+def _asking(encoding):
+    return types.SimpleNamespace(query_params={"encoding": encoding})
+
+
+def test_msgpack_frames_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+    message = {"type": "state", "version": 3, "data": {"a": [1, 2.5, None, True], "b": "\u00e9"}}
+    assert negotiate_encoding(_asking("msgpack")) == ENCODING_MSGPACK
+    assert msgpack.unpackb(encode_binary_message(message), raw=False) == message
+
+
+def test_missing_msgpack_falls_back_to_json_and_logs_once(monkeypatch, caplog):
+    monkeypatch.setattr(websocket_manager, "msgpack", None)
+    monkeypatch.setattr(websocket_manager, "_msgpack_missing_logged", False)
+    with caplog.at_level(logging.INFO):
+        for _ in range(3):
+            assert negotiate_encoding(_asking("msgpack")) == ENCODING_JSON
+    assert sum("msgpack is not installed" in r.getMessage() for r in caplog.records) == 1
+    assert negotiate_encoding(_asking("")) == ENCODING_JSON
+    assert encode_binary_message({"a": 1}) is None